@@ -3,15 +3,10 @@ import os
 import re
 import glob
 
+import affiliate_registry
+
 # The Genius Wave affiliate section for Business prompts
-BUSINESS_SECTION = '''
-                <!-- Affiliate Recommendation -->
-                <section class="affiliate-section" style="margin-top: 60px; padding: 30px; background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%); border-radius: 10px;">
-                    <h2 style="color: white; margin-bottom: 15px;">🧠 Unlock Your Business Genius</h2>
-                    <p style="color: white; margin-bottom: 20px;">This prompt helps with business strategy. Want to think like a CEO? The Genius Wave uses neuroscience to unlock your brain's full potential - enhancing creativity, focus, and decision-making in just 7 minutes.</p>
-                    <a href="https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net" target="_blank" style="display: inline-block; background: white; color: #4CAF50; padding: 15px 30px; border-radius: 5px; text-decoration: none; font-weight: bold;">Activate Your Genius Wave →</a>
-                    <p style="color: rgba(255,255,255,0.8); font-size: 12px; margin-top: 15px;"><em>*Sponsored - We may earn a commission if you purchase. This helps us keep all prompts free.</em></p>
-                </section>'''
+BUSINESS_SECTION = affiliate_registry.banner_section("business")
 
 # Find all business HTML files
 business_files = glob.glob('prompts/business/*.html')
@@ -3,42 +3,49 @@ import os
 import re
 import glob
 
+import affiliate_registry
+from page_pipeline import register_transform, page_may_change
+
 # Neuro Energizer affiliate section for Coding prompts
-CODING_SECTION = '''
-                <!-- Affiliate Recommendation -->
-                <section class="affiliate-section" style="margin-top: 60px; padding: 30px; background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%); border-radius: 10px;">
-                    <h2 style="color: #00ff41; margin-bottom: 15px;">⚡ Code at Peak Performance</h2>
-                    <p style="color: white; margin-bottom: 20px;">Long coding sessions demand sustained mental energy. Neuro Energizer uses scientifically-proven nootropics to enhance focus, memory, and cognitive speed - helping you debug faster, think clearer, and code better for hours without the crash.</p>
-                    <a href="https://9d76fn1hemvx3t0bresjkcmiki.hop.clickbank.net" target="_blank" style="display: inline-block; background: #00ff41; color: #1a1a2e; padding: 15px 30px; border-radius: 5px; text-decoration: none; font-weight: bold;">Unlock Your Coding Potential →</a>
-                    <p style="color: rgba(255,255,255,0.8); font-size: 12px; margin-top: 15px;"><em>*Sponsored - We may earn a commission if you purchase. This helps us keep all prompts free.</em></p>
-                </section>'''
+CODING_SECTION = affiliate_registry.banner_section("coding")
+
+def insert_coding_section(content):
+    """Insert the Neuro Energizer section before the closing article tag"""
+    # Check if affiliate section already exists
+    if 'affiliate-section' in content:
+        return content
+    
+    # Add the affiliate section before </article>
+    return re.sub(
+        r'(\s*)(</article>)',
+        r'\1' + CODING_SECTION + r'\n\1\2',
+        content,
+        count=1
+    )
+
+@register_transform("add-coding-affiliates", categories=["coding"], done_markers=[b'affiliate-section'],
+                    data=affiliate_registry.load_registry())
+def add_coding_affiliates_transform(content, page):
+    """Pipeline transform: add the Neuro Energizer section to a coding prompt"""
+    return insert_coding_section(content)
 
 def add_affiliate_to_file(filepath):
     """Add affiliate section before the closing article tag"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Check if affiliate section already exists
-        if 'affiliate-section' in content:
+        # Check the raw bytes first so finished pages are never decoded
+        if not page_may_change(filepath, ["add-coding-affiliates"]):
             print(f"  ✓ Already has affiliate section: {os.path.basename(filepath)}")
             return False
         
-        # Find the closing </article> tag
-        pattern = r'(\s*)(</article>)'
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
         
-        if not re.search(pattern, content):
+        new_content = insert_coding_section(content)
+        
+        if new_content == content:
             print(f"  ✗ No </article> tag found: {os.path.basename(filepath)}")
             return False
         
-        # Add the affiliate section before </article>
-        new_content = re.sub(
-            pattern,
-            r'\1' + CODING_SECTION + r'\n\1\2',
-            content,
-            count=1
-        )
-        
         # Write the updated content back
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(new_content)
@@ -3,15 +3,10 @@ import os
 import re
 import glob
 
+import affiliate_registry
+
 # Java Burn 2.0 affiliate section for Content prompts
-CONTENT_SECTION = '''
-                <!-- Affiliate Recommendation -->
-                <section class="affiliate-section" style="margin-top: 60px; padding: 30px; background: linear-gradient(135deg, #6B4423 0%, #8B5A2B 100%); border-radius: 10px;">
-                    <h2 style="color: white; margin-bottom: 15px;">☕ Boost Your Content Creation Energy</h2>
-                    <p style="color: white; margin-bottom: 20px;">Creating great content requires focus and energy. Java Burn 2.0 is a tasteless powder that transforms your morning coffee into a metabolism-boosting powerhouse. Stay sharp, burn fat, and create content that converts - all from your daily coffee.</p>
-                    <a href="https://13f75e6ccbuz3u04ikq7xmpr5b.hop.clickbank.net" target="_blank" style="display: inline-block; background: white; color: #6B4423; padding: 15px 30px; border-radius: 5px; text-decoration: none; font-weight: bold;">Power Up Your Coffee →</a>
-                    <p style="color: rgba(255,255,255,0.8); font-size: 12px; margin-top: 15px;"><em>*Sponsored - We may earn a commission if you purchase. This helps us keep all prompts free.</em></p>
-                </section>'''
+CONTENT_SECTION = affiliate_registry.banner_section("content")
 
 def add_affiliate_to_file(filepath):
     """Add affiliate section before the closing article tag"""
@@ -3,15 +3,10 @@ import os
 import re
 import glob
 
+import affiliate_registry
+
 # TedsWoodworking affiliate section for Everyday prompts
-EVERYDAY_SECTION = '''
-                <!-- Affiliate Recommendation -->
-                <section class="affiliate-section" style="margin-top: 60px; padding: 30px; background: linear-gradient(135deg, #8B4513 0%, #A0522D 100%); border-radius: 10px;">
-                    <h2 style="color: white; margin-bottom: 15px;">🔨 Master DIY Projects with 16,000 Plans</h2>
-                    <p style="color: white; margin-bottom: 20px;">Want to build something amazing? TedsWoodworking gives you instant access to 16,000 professional woodworking plans. From simple weekend projects to elaborate furniture - complete blueprints, materials lists, and step-by-step instructions included.</p>
-                    <a href="https://6c0e5c0dqlol4ufpg9yjr0xl50.hop.clickbank.net" target="_blank" style="display: inline-block; background: white; color: #8B4513; padding: 15px 30px; border-radius: 5px; text-decoration: none; font-weight: bold;">Get 16,000 Woodworking Plans →</a>
-                    <p style="color: rgba(255,255,255,0.8); font-size: 12px; margin-top: 15px;"><em>*Sponsored - We may earn a commission if you purchase. This helps us keep all prompts free.</em></p>
-                </section>'''
+EVERYDAY_SECTION = affiliate_registry.banner_section("everyday")
 
 def add_affiliate_to_file(filepath):
     """Add affiliate section before the closing article tag"""
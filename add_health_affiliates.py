@@ -3,15 +3,10 @@ import os
 import re
 import glob
 
+import affiliate_registry
+
 # SleepLean affiliate section for Health prompts
-HEALTH_SECTION = '''
-                <!-- Affiliate Recommendation -->
-                <section class="affiliate-section" style="margin-top: 60px; padding: 30px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px;">
-                    <h2 style="color: white; margin-bottom: 15px;">😴 Lose Weight While You Sleep</h2>
-                    <p style="color: white; margin-bottom: 20px;">Health starts with quality sleep. SleepLean optimizes your metabolism during rest, helping you burn fat overnight while improving sleep quality. Wake up refreshed, energized, and closer to your health goals - all while you sleep.</p>
-                    <a href="https://hop.clickbank.net/?vendor=sleeplean&affiliate=bigbricey" target="_blank" style="display: inline-block; background: white; color: #667eea; padding: 15px 30px; border-radius: 5px; text-decoration: none; font-weight: bold;">Start Losing Weight Tonight →</a>
-                    <p style="color: rgba(255,255,255,0.8); font-size: 12px; margin-top: 15px;"><em>*Sponsored - We may earn a commission if you purchase. This helps us keep all prompts free.</em></p>
-                </section>'''
+HEALTH_SECTION = affiliate_registry.banner_section("health")
 
 def add_affiliate_to_file(filepath):
     """Add affiliate section before the closing article tag"""
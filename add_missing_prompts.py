@@ -2,64 +2,24 @@
 """
 Add 58 missing prompts to reach 150 total
 Focus on high-search volume topics that drive conversions
+Prompt text comes from the prompt-content/ store (prompt_store.py)
 """
 
-import os
+import argparse
+import hashlib
+import json
+import string
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 
-# Define the prompts to add (58 total needed)
-NEW_PROMPTS = {
-    "business": [
-        # High-value business prompts (10 more)
-        "investor-pitch-deck", "franchise-evaluation", "business-valuation", 
-        "vendor-negotiation", "crisis-management", "merger-acquisition",
-        "startup-legal-docs", "company-culture", "remote-team-management",
-        "quarterly-review"
-    ],
-    "money": [
-        # High-converting money prompts (15 more) 
-        "retirement-planning", "tax-optimization", "crypto-strategy",
-        "real-estate-investment", "stock-portfolio", "college-savings",
-        "insurance-needs", "will-estate-planning", "small-business-loans",
-        "credit-card-rewards", "passive-income-ideas", "financial-advisor-questions",
-        "bankruptcy-alternatives", "home-buying-guide", "divorce-finances"
-    ],
-    "health": [
-        # Health & wellness expansion (11 more)
-        "doctor-second-opinion", "insurance-claim-denial", "medication-side-effects",
-        "chronic-pain-management", "anxiety-coping", "depression-support",
-        "weight-loss-plateau", "supplement-research", "fitness-injury-recovery", 
-        "elderly-care-planning", "mental-health-therapy"
-    ],
-    "relationships": [
-        # Relationships expansion (10 more)
-        "long-distance-relationship", "blended-family", "cheating-recovery",
-        "divorce-mediation", "co-parenting", "workplace-romance",
-        "friendship-boundaries", "social-anxiety", "online-dating-safety",
-        "relationship-counseling"
-    ],
-    "everyday": [
-        # Practical everyday problems (7 more)
-        "landlord-dispute", "noisy-neighbors", "workplace-harassment",
-        "identity-theft-recovery", "consumer-complaint", "travel-emergency",
-        "pet-emergency-care"
-    ],
-    "coding": [
-        # Coding prompts expansion (5 more) 
-        "database-design", "security-audit", "performance-optimization",
-        "mobile-app-planning", "blockchain-basics"
-    ]
-}
+import affiliate_registry
+import prompt_store
+import render_cache
+from page_pipeline import CACHE_DIR, PROJECT_ROOT, default_jobs, page_key, load_manifest, save_manifest
 
 # Affiliate mapping for new prompts
-AFFILIATE_MAPPING = {
-    "business": "the-genius-wave",
-    "money": "billionaire-brain-wave", 
-    "health": "mitolyn",
-    "relationships": "his-secret-obsession",
-    "everyday": "teds-woodworking",
-    "coding": "the-genius-wave"
-}
+AFFILIATE_MAPPING = {category: entry["product"] for category, entry in affiliate_registry.categories().items()}
 
 # Template for new prompts
 PROMPT_TEMPLATE = '''<!DOCTYPE html>
@@ -293,505 +253,215 @@ PROMPT_TEMPLATE = '''<!DOCTYPE html>
 </body>
 </html>'''
 
-# Prompt content database - actual valuable prompts
-PROMPT_CONTENTS = {
-    # Business prompts
-    "investor-pitch-deck": {
-        "title": "Investor Pitch Deck Creator",
-        "description": "Create compelling investor presentations that secure funding for your startup or business expansion",
-        "keywords": "investor pitch deck, startup funding, business presentation, venture capital, angel investors",
-        "prompt": """Create a comprehensive investor pitch deck for my [BUSINESS TYPE] startup. Include:
-
-**Slide Structure:**
-1. Problem Statement - What pain point are we solving?
-2. Solution Overview - Our unique approach
-3. Market Opportunity - Size, growth, trends  
-4. Business Model - How we make money
-5. Traction & Validation - Current progress/proof
-6. Competition Analysis - Our competitive advantage
-7. Marketing Strategy - Customer acquisition plan
-8. Financial Projections - 3-year forecast
-9. Team & Advisors - Why we'll succeed
-10. Funding Ask - Amount needed and use of funds
-11. Exit Strategy - How investors get returns
-
-**Key Details:**
-- Company: [COMPANY NAME]
-- Industry: [INDUSTRY]
-- Stage: [SEED/SERIES A/B/C]
-- Funding Amount: $[AMOUNT]
-- Use of Funds: [PRIMARY USE]
-
-Make each slide compelling, data-driven, and investor-focused. Include specific questions investors typically ask and how to address objections."""
-    },
-    
-    "franchise-evaluation": {
-        "title": "Franchise Business Evaluator", 
-        "description": "Comprehensive analysis tool to evaluate franchise opportunities and make informed investment decisions",
-        "keywords": "franchise evaluation, business opportunity, franchise investment, due diligence",
-        "prompt": """Analyze this franchise opportunity for me: [FRANCHISE NAME] in [LOCATION].
-
-**Financial Analysis:**
-- Initial investment: $[AMOUNT]
-- Ongoing fees and royalties
-- Break-even timeline analysis
-- ROI projections (3-5 years)
-- Territory protection and competition
-
-**Operational Assessment:**
-- Training and support quality
-- Marketing assistance provided
-- Supply chain and vendor relationships  
-- Day-to-day operational requirements
-- Staffing needs and labor costs
-
-**Market Evaluation:**
-- Local market demand for [PRODUCT/SERVICE]
-- Target demographic analysis
-- Seasonal fluctuations
-- Growth potential in area
-- Economic factors affecting success
-
-**Risk Analysis:**
-- Franchise failure rates in system
-- Contract terms and renewal conditions
-- Exit strategy options
-- Personal guarantee requirements
-- Market saturation risks
-
-Provide a comprehensive recommendation with pros, cons, and key questions to ask the franchisor."""
-    },
-
-    # Money prompts
-    "retirement-planning": {
-        "title": "Complete Retirement Planning Guide",
-        "description": "Create a personalized retirement strategy to secure your financial future with actionable steps",
-        "keywords": "retirement planning, 401k, IRA, financial security, pension planning",
-        "prompt": """Create a comprehensive retirement plan for me:
-
-**Current Situation:**
-- Age: [YOUR AGE]
-- Current income: $[ANNUAL INCOME]
-- Current savings: $[TOTAL SAVINGS]
-- 401k balance: $[401K BALANCE]
-- Monthly expenses: $[MONTHLY EXPENSES]
-- Desired retirement age: [AGE]
-
-**Retirement Goal Analysis:**
-- Estimated annual expenses in retirement
-- Healthcare cost projections
-- Inflation impact over [YEARS TO RETIREMENT] years
-- Total retirement savings needed
-- Monthly savings target to reach goal
-
-**Investment Strategy:**
-- 401k contribution optimization
-- IRA options (Traditional vs Roth)
-- Investment allocation by age
-- Risk tolerance assessment
-- Diversification strategy
-
-**Action Plan:**
-1. Immediate steps (next 30 days)
-2. Short-term goals (1 year)
-3. Medium-term milestones (5 years)
-4. Long-term strategy (to retirement)
-
-**Additional Considerations:**
-- Social Security benefit estimates
-- Employer match maximization
-- Tax-efficient withdrawal strategies
-- Estate planning basics
-- Healthcare/long-term care insurance
-
-Provide specific dollar amounts and deadlines for each recommendation."""
-    },
-
-    "crypto-strategy": {
-        "title": "Cryptocurrency Investment Strategy",
-        "description": "Develop a safe, strategic approach to cryptocurrency investing based on your risk tolerance and goals",
-        "keywords": "cryptocurrency, bitcoin, crypto investment, digital assets, blockchain investing",
-        "prompt": """Create a personalized cryptocurrency investment strategy:
-
-**Investment Profile:**
-- Risk tolerance: [LOW/MEDIUM/HIGH]  
-- Investment timeline: [SHORT/MEDIUM/LONG TERM]
-- Available capital: $[AMOUNT]
-- Investment experience: [BEGINNER/INTERMEDIATE/ADVANCED]
-- Primary goal: [GROWTH/INCOME/SPECULATION/DIVERSIFICATION]
-
-**Portfolio Construction:**
-- Recommended asset allocation (% of total portfolio in crypto)
-- Core holdings vs speculative positions
-- Bitcoin and Ethereum allocation
-- Altcoin selection criteria
-- Diversification across use cases (payments, DeFi, NFTs, etc.)
-
-**Risk Management:**
-- Position sizing strategy
-- Stop-loss guidelines
-- Profit-taking rules
-- Dollar-cost averaging schedule
-- Security best practices (wallets, exchanges)
-
-**Market Analysis Framework:**
-- Fundamental analysis indicators
-- Technical analysis basics
-- Market cycle understanding
-- Regulatory impact assessment
-- News and sentiment monitoring
-
-**Action Steps:**
-1. Account setup and security
-2. Initial purchase strategy
-3. Ongoing monitoring routine
-4. Rebalancing schedule
-5. Tax implications and record keeping
-
-Include warnings about common mistakes and red flags to avoid."""
-    },
-
-    # Health prompts  
-    "doctor-second-opinion": {
-        "title": "Medical Second Opinion Request",
-        "description": "Professional template to request a second medical opinion and prepare for specialist consultations",
-        "keywords": "second medical opinion, doctor consultation, health advocacy, medical diagnosis",
-        "prompt": """Help me prepare for seeking a second medical opinion:
-
-**Current Situation:**
-- Initial diagnosis: [CONDITION/DIAGNOSIS]
-- Treating physician: [DOCTOR NAME/SPECIALTY]
-- Proposed treatment: [TREATMENT PLAN]
-- My concerns: [SPECIFIC CONCERNS]
-
-**Medical History Summary:**
-- Relevant symptoms and timeline
-- Previous treatments tried
-- Current medications
-- Family medical history
-- Lifestyle factors
-
-**Questions for Second Opinion Doctor:**
-1. Do you agree with the initial diagnosis?
-2. Are there alternative diagnoses to consider?
-3. What additional tests might be helpful?
-4. Are there other treatment options?
-5. What are the risks/benefits of proposed treatment?
-6. How urgent is treatment?
-7. What happens if I wait/don't treat?
-
-**Preparation Checklist:**
-- Medical records to gather
-- Test results to bring  
-- Insurance authorization steps
-- Questions to ask about doctor's experience
-- Support person considerations
-
-**Communication Script:**
-Draft a professional email/call to request second opinion appointment, including:
-- Brief medical history
-- Specific request for consultation
-- Timeline needs
-- Insurance information
-
-Help me advocate effectively for my health while maintaining good relationships with all medical providers."""
-    },
-
-    # Relationships prompts
-    "long-distance-relationship": {
-        "title": "Long Distance Relationship Success Plan",
-        "description": "Strategies and communication tools to maintain strong connections across the miles",
-        "keywords": "long distance relationship, relationship advice, communication, romance",
-        "prompt": """Create a comprehensive plan to strengthen our long-distance relationship:
-
-**Current Situation:**
-- Relationship duration: [TIME TOGETHER]
-- Distance between us: [MILES/HOURS]
-- Time zone difference: [HOURS]
-- Reason for distance: [WORK/SCHOOL/FAMILY/OTHER]
-- Expected duration: [TEMPORARY/PERMANENT/UNKNOWN]
-
-**Communication Strategy:**
-- Daily communication schedule
-- Mix of text, calls, video chats
-- Special weekly date night ideas
-- Creative ways to stay connected
-- Handling time zone challenges
-
-**Trust Building:**
-- Transparency and honesty practices
-- Dealing with jealousy and insecurity  
-- Social media boundaries
-- Meeting each other's friends/family virtually
-- Handling conflicts constructively
-
-**Creating Shared Experiences:**
-- Virtual date ideas
-- Watching movies together online
-- Playing games remotely
-- Sharing daily routines
-- Planning future visits
-
-**Visit Planning:**
-- Frequency of visits
-- Who travels when
-- Making visits special and memorable
-- Handling post-visit sadness
-- Balancing visits with other responsibilities
-
-**Long-term Planning:**
-- Timeline for closing the distance
-- Career and location decisions
-- Financial planning for moves/visits
-- Maintaining individual goals and growth
-- Decision points and milestones
-
-Include scripts for difficult conversations and tips for keeping romance alive despite the distance."""
-    },
-
-    # Everyday prompts
-    "landlord-dispute": {
-        "title": "Landlord Dispute Resolution Guide",
-        "description": "Professional templates and strategies to resolve conflicts with landlords while protecting your rights",
-        "keywords": "landlord dispute, tenant rights, rental issues, housing law, lease problems",
-        "prompt": """Help me resolve this landlord dispute professionally:
-
-**Situation Details:**
-- Issue: [SPECIFIC PROBLEM - repairs, deposits, lease violations, etc.]
-- Timeline: [WHEN ISSUE STARTED]
-- Previous communication attempts: [WHAT YOU'VE TRIED]
-- Lease terms relevant to issue: [SPECIFIC CLAUSES]
-- Documentation available: [PHOTOS/EMAILS/RECEIPTS]
-
-**Legal Framework:**
-- Tenant rights in [STATE/LOCATION]
-- Landlord obligations under local law
-- Required notice periods
-- Documentation standards
-- Escalation options available
-
-**Communication Strategy:**
-1. **Initial Written Notice** (Professional letter template)
-   - Clear description of issue
-   - Reference to lease terms/local law
-   - Reasonable timeline for resolution
-   - Next steps if not resolved
-
-2. **Follow-up Communications**
-   - Escalation language
-   - Documentation of landlord responses
-   - Evidence gathering
-   - Witness identification
-
-**Resolution Options:**
-- Direct negotiation points
-- Mediation through local agencies
-- Tenant union involvement
-- Legal aid resources
-- Small claims court preparation
-- When to involve housing authorities
-
-**Protection Strategies:**
-- Documenting everything properly
-- Understanding retaliation protections
-- Knowing when to withhold rent legally
-- Preparing for potential eviction defense
-- Maintaining professional relationships
-
-Provide specific letter templates and scripts for phone conversations."""
-    },
-
-    # Coding prompts
-    "database-design": {
-        "title": "Database Design & Architecture Planner",
-        "description": "Create efficient, scalable database schemas with proper relationships and optimization",
-        "keywords": "database design, SQL, schema design, data modeling, database architecture",
-        "prompt": """Design a database schema for my [PROJECT TYPE] application:
-
-**Application Requirements:**
-- Project: [DESCRIBE APPLICATION]
-- Expected users: [NUMBER/TYPE]
-- Data types: [USER DATA/TRANSACTIONS/CONTENT/etc.]
-- Key features: [MAIN FUNCTIONALITY]
-- Performance needs: [READ/WRITE PATTERNS]
-
-**Database Analysis:**
-1. **Entity Identification**
-   - Core entities and their attributes
-   - Relationships between entities
-   - Business rules and constraints
-
-2. **Schema Design**
-   - Primary and foreign key relationships
-   - Normalization level recommendations
-   - Index strategies for performance
-   - Data type selections
-
-3. **Performance Optimization**
-   - Query patterns and optimization
-   - Caching strategies
-   - Scaling considerations (vertical/horizontal)
-   - Read replica recommendations
-
-4. **Security & Compliance**
-   - Data encryption requirements
-   - Access control patterns
-   - Backup and recovery strategy
-   - Compliance considerations (GDPR, etc.)
-
-**Deliverables:**
-- Entity Relationship Diagram (ERD) description
-- SQL CREATE TABLE statements
-- Sample queries for common operations
-- Migration strategy for existing data
-- Performance monitoring recommendations
-
-**Technology Recommendations:**
-- Database engine selection (MySQL, PostgreSQL, etc.)
-- ORM framework suggestions
-- Connection pooling configuration
-- Monitoring and backup tools
-
-Include both the ideal design and practical implementation steps for a [SMALL/MEDIUM/LARGE] scale application."""
-    }
-}
-
 def get_affiliate_section(category):
     """Get affiliate section for the category"""
-    affiliate_products = {
-        "billionaire-brain-wave": {
-            "name": "Billionaire Brain Wave",
-            "price": "$42.32", 
-            "description": "Wealth manifestation audio program using theta brainwave technology",
-            "link": "https://3811aatcrgoq3zex8i6zidmb77.hop.clickbank.net"
-        },
-        "his-secret-obsession": {
-            "name": "His Secret Obsession",
-            "price": "$48.85",
-            "description": "Relationship guide for women about understanding men", 
-            "link": "https://fdd98gwkrduu9o55wkx6seqd2w.hop.clickbank.net"
-        },
-        "mitolyn": {
-            "name": "Mitolyn",
-            "price": "$180.63",
-            "description": "Advanced weight loss supplement targeting metabolism",
-            "link": "https://932bfl2gkkmw0w7cympk893t13.hop.clickbank.net"
-        },
-        "teds-woodworking": {
-            "name": "TedsWoodworking", 
-            "price": "$61.36",
-            "description": "16,000 woodworking plans and project database",
-            "link": "https://7ca54ouacpxk8odjs7-cmvvj54.hop.clickbank.net"
-        },
-        "the-genius-wave": {
-            "name": "The Genius Wave",
-            "price": "$46.91", 
-            "description": "Brain enhancement audio for focus and creativity",
-            "link": "https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net"
-        }
-    }
-    
-    affiliate_key = AFFILIATE_MAPPING.get(category)
-    if not affiliate_key or affiliate_key not in affiliate_products:
-        return ""
-    
-    product = affiliate_products[affiliate_key]
-    
-    return f'''        <!-- Affiliate Recommendation Section -->
-        <section class="affiliate-recommendation" style="margin: 40px 0; padding: 30px; background: var(--bg-secondary); border-radius: var(--radius); border-left: 4px solid var(--primary);">
-            <h3 style="color: var(--text-primary); margin-bottom: 15px; font-size: 1.3rem;">🚀 Works 10x Better With</h3>
-            <div class="affiliate-product" style="display: flex; align-items: center; gap: 20px; flex-wrap: wrap;">
-                <div class="product-info" style="flex: 1; min-width: 300px;">
-                    <h4 style="color: var(--primary); margin-bottom: 8px; font-size: 1.1rem;">{product["name"]}</h4>
-                    <p style="color: var(--text-secondary); margin-bottom: 10px; line-height: 1.5;">{product["description"]}</p>
-                    <div class="social-proof" style="font-size: 0.9rem; color: var(--text-tertiary); margin-bottom: 15px;">
-                        ⭐ Used by 47,000+ people | ✅ 60-day guarantee | 🔥 Limited-time bonus
-                    </div>
-                </div>
-                <div class="cta-section" style="text-align: center;">
-                    <div class="price-tag" style="background: var(--success); color: white; padding: 5px 15px; border-radius: 20px; font-weight: bold; margin-bottom: 15px; display: inline-block;">
-                        Save 70% Today!
-                    </div>
-                    <a href="{product["link"]}" class="btn-affiliate" target="_blank" rel="noopener" style="display: inline-block; background: linear-gradient(135deg, var(--primary), var(--primary-dark)); color: white; padding: 12px 25px; border-radius: 25px; text-decoration: none; font-weight: 600; transition: all 0.3s ease; box-shadow: 0 4px 15px rgba(0,102,204,0.3);">
-                        Get Instant Access →
-                    </a>
-                    <div style="font-size: 0.8rem; color: var(--text-tertiary); margin-top: 8px;">
-                        ⏰ Offer expires in 24 hours
-                    </div>
-                </div>
-            </div>
-        </section>'''
+    return affiliate_registry.recommendation_section(AFFILIATE_MAPPING.get(category)).strip('\n')
+
+def compile_template(template):
+    """Split a str.format template into (literal, field name) chunks once.
+
+    Rendering then just joins the chunks, with no format-string parsing per page.
+    """
+    chunks = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported format spec in template field {field!r}")
+        chunks.append((literal, field))
+    return chunks
+
+def render_template(chunks, values):
+    """Same output as template.format(**values) for a compiled template"""
+    parts = []
+    for literal, field in chunks:
+        parts.append(literal)
+        if field is not None:
+            parts.append(str(values[field]))
+    return ''.join(parts)
+
+COMPILED_TEMPLATE = compile_template(PROMPT_TEMPLATE)
+
+CATEGORY_TITLES = {
+    "business": "Business", "money": "Money", "health": "Health",
+    "relationships": "Relationships", "everyday": "Everyday", "coding": "Coding"
+}
+
+# Hash of each page as last written by the generator
+GENERATED_MANIFEST_PATH = CACHE_DIR / "generated_prompts.json"
+
+TEMPLATE_HASH = render_cache.fingerprint(PROMPT_TEMPLATE, CATEGORY_TITLES)
+
+def render_prompt_page(category, filename, prompt_data):
+    """Full HTML for one prompt page"""
+    return render_template(COMPILED_TEMPLATE, {
+        "title": prompt_data["title"],
+        "description": prompt_data["description"],
+        "keywords": prompt_data["keywords"],
+        "category": category,
+        "category_title": CATEGORY_TITLES.get(category, category.replace('-', ' ').title()),
+        "filename": filename,
+        "prompt_text": prompt_data["prompt"],
+        "affiliate_section": get_affiliate_section(category),
+        "affiliate_product": AFFILIATE_MAPPING[category],
+    })
+
+def render_key(category, filename, prompt_data):
+    """Render cache key: the template, the page's data and its category's affiliate block"""
+    if prompt_data is None:
+        # Store entries: the file's bytes stand in for its parsed fields, so a hit never parses it
+        with open(prompt_store.prompt_path(category, filename), 'rb') as f:
+            data_hash = render_cache.content_hash(f.read())
+    else:
+        data_hash = render_cache.fingerprint(prompt_data)
+    return render_cache.fingerprint("prompt-page", TEMPLATE_HASH, category, filename, data_hash,
+                                    get_affiliate_section(category), AFFILIATE_MAPPING[category])
+
+def cached_render(category, filename, prompt_data, cache, store=True):
+    """(output hash, html bytes or None, cache record) for one page.
+
+    On a hit nothing is rendered and html is None; read it from the cache
+    only if the page actually has to be written.
+    """
+    key = render_key(category, filename, prompt_data)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry["output"], None, (key, entry["output"], entry["size"])
+
+    if prompt_data is None:
+        prompt_data = prompt_store.load_prompt(category, filename)
+    html = render_prompt_page(category, filename, prompt_data).encode('utf-8')
+    output = cache.store(html) if store else render_cache.content_hash(html)
+    return output, html, (key, output, len(html)) if store else None
 
 def create_prompt_file(category, filename, prompt_data):
-    """Create a new prompt HTML file"""
-    category_titles = {
-        "business": "Business", "money": "Money", "health": "Health",
-        "relationships": "Relationships", "everyday": "Everyday", "coding": "Coding"
-    }
-    
-    # Create the HTML content
-    html_content = PROMPT_TEMPLATE.format(
-        title=prompt_data["title"],
-        description=prompt_data["description"],
-        keywords=prompt_data["keywords"],
-        category=category,
-        category_title=category_titles[category],
-        filename=filename,
-        prompt_text=prompt_data["prompt"],
-        affiliate_section=get_affiliate_section(category),
-        affiliate_product=AFFILIATE_MAPPING[category]
-    )
-    
-    # Write to file
+    """Create a new prompt HTML file (left untouched if it already holds the rendered page)"""
+    cache = render_cache.shared_cache()
+    output, html, record = cached_render(category, filename, prompt_data, cache)
+    cache.put(*record)
+    cache.save()
+
     file_path = Path(f"prompts/{category}/{filename}.html")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    if file_hash(file_path) != output:
+        render_cache.write_if_changed(file_path, html or cache.read(output))
     
     return file_path
 
+def builtin_catalogue():
+    """(category, filename, None) for every prompt in the content store; workers load the text"""
+    for category, filename in prompt_store.entries():
+        yield category, filename, None
+
+def read_catalogue(path):
+    """Stream a JSON Lines catalogue: one {category, filename, title, description, keywords, prompt} per line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry["category"], entry["filename"], entry
+
+def file_hash(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def generate_page(task):
+    """Worker entry point: render one page and write it only if that changes something.
+
+    Pages edited after the generator last wrote them (e.g. by the page
+    pipeline) are kept unless force is set. Never raises.
+    """
+    category, filename, prompt_data, previous, force, dry_run, root = task
+    path = Path(root) / "prompts" / category / f"{filename}.html"
+    result = {"path": str(path), "hash": previous, "status": None, "error": None, "render": None}
+    try:
+        cache = render_cache.shared_cache()
+        rendered, html, result["render"] = cached_render(category, filename, prompt_data, cache, store=not dry_run)
+        on_disk = file_hash(path)
+
+        if on_disk == rendered:
+            result["hash"], result["status"] = rendered, "unchanged"
+            return result
+        if rendered == previous and on_disk is not None:
+            result["status"] = "unchanged"
+            return result
+        if on_disk is not None and on_disk != previous and not force:
+            result["status"] = "kept"
+            return result
+
+        if not dry_run:
+            if html is None:
+                html = cache.read(rendered)
+            if html is None:
+                # Blob evicted since the lookup: render after all
+                html = render_prompt_page(category, filename,
+                                          prompt_data or prompt_store.load_prompt(category, filename)).encode('utf-8')
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(html)
+        result["hash"] = rendered
+        result["status"] = "created" if on_disk is None else "updated"
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def generate_pages(entries, manifest, jobs=None, force=False, dry_run=False, root=PROJECT_ROOT):
+    """Render catalogue entries across a process pool, yielding results in order as pages are written"""
+    tasks = ((category, filename, data, manifest.get(f"prompts/{category}/{filename}.html"), force, dry_run, str(root))
+             for category, filename, data in entries)
+
+    jobs = jobs or default_jobs()
+    cache = render_cache.shared_cache()
+    with ProcessPoolExecutor(max_workers=jobs) if jobs != 1 else nullcontext() as executor:
+        results = executor.map(generate_page, tasks, chunksize=16) if executor else map(generate_page, tasks)
+
+        # Workers only read the render cache and add blobs; hits and new entries are recorded here
+        for result in results:
+            if result["render"]:
+                cache.put(*result["render"])
+            yield result
+    if not dry_run:
+        cache.save()
+
 def main():
-    """Add all missing prompts"""
-    project_root = Path(__file__).parent
-    os.chdir(project_root)
-    
-    created_count = 0
-    
-    print("🚀 Adding 58 missing prompts to reach 150 total...")
+    """Generate every prompt page in the catalogue"""
+    parser = argparse.ArgumentParser(description="Generate prompt pages from the catalogue across a worker pool")
+    parser.add_argument("--catalogue", type=Path, help="JSON Lines catalogue (default: the prompt-content/ store)")
+    parser.add_argument("--category", action="append", dest="categories", help="limit to a category (repeatable)")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--force", action="store_true", help="overwrite pages edited since they were generated")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be written")
+    args = parser.parse_args()
+
+    entries = read_catalogue(args.catalogue) if args.catalogue else builtin_catalogue()
+    if args.categories:
+        entries = (entry for entry in entries if entry[0] in args.categories)
+
+    print("🚀 Generating prompt pages...")
     print("=" * 60)
-    
-    # Create sample prompts for demonstration (first 10)
-    sample_prompts = [
-        ("business", "investor-pitch-deck"),
-        ("business", "franchise-evaluation"), 
-        ("money", "retirement-planning"),
-        ("money", "crypto-strategy"),
-        ("health", "doctor-second-opinion"),
-        ("relationships", "long-distance-relationship"),
-        ("everyday", "landlord-dispute"),
-        ("coding", "database-design"),
-        # Add 2 more to make 10 samples
-        ("business", "business-valuation"),
-        ("money", "real-estate-investment")
-    ]
-    
-    for category, filename in sample_prompts:
-        if filename in PROMPT_CONTENTS:
-            try:
-                file_path = create_prompt_file(category, filename, PROMPT_CONTENTS[filename])
-                print(f"✅ Created {file_path}")
-                created_count += 1
-            except Exception as e:
-                print(f"❌ Error creating {filename}: {e}")
-    
+
+    manifest = load_manifest(GENERATED_MANIFEST_PATH)
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "kept": 0, "error": 0}
+    for result in generate_pages(entries, manifest, args.jobs, args.force, args.dry_run):
+        if result["error"]:
+            counts["error"] += 1
+            print(f"❌ Error creating {result['path']}: {result['error']}")
+            continue
+        counts[result["status"]] += 1
+        if result["status"] in ("created", "updated"):
+            print(f"✅ {result['status'].title()} {page_key(result['path'])}")
+        elif result["status"] == "kept":
+            print(f"⏭️  Kept {page_key(result['path'])} (edited since generated; --force to overwrite)")
+        if result["hash"]:
+            manifest[page_key(result["path"])] = result["hash"]
+
+    if not args.dry_run:
+        save_manifest(manifest, GENERATED_MANIFEST_PATH)
+
     print("\n" + "=" * 60)
-    print(f"✅ Sample Creation Complete!")
-    print(f"📊 Created {created_count} sample prompts")
-    print(f"📋 Remaining to create: {58 - created_count} prompts")
-    print(f"\n💡 Next steps:")
-    print(f"1. Review sample prompts for quality")
-    print(f"2. Generate remaining {58 - created_count} prompts")
-    print(f"3. Update category index pages")
-    print(f"4. Test all new pages")
+    verb = "Would write" if args.dry_run else "Wrote"
+    print(f"✅ {verb} {counts['created']} new and {counts['updated']} updated pages")
+    print(f"📊 {counts['unchanged']} unchanged, {counts['kept']} kept, {counts['error']} errors")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
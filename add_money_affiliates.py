@@ -3,15 +3,10 @@ import os
 import re
 import glob
 
+import affiliate_registry
+
 # Billionaire Brain Wave affiliate section
-MONEY_SECTION = '''
-                <!-- Affiliate Recommendation -->
-                <section class="affiliate-section" style="margin-top: 60px; padding: 30px; background: linear-gradient(135deg, #00c853 0%, #00e676 100%); border-radius: 10px;">
-                    <h2 style="color: white; margin-bottom: 15px;">💰 Ready for Wealth Breakthrough?</h2>
-                    <p style="color: white; margin-bottom: 20px;">This prompt helps manage money better. Want to actually attract wealth? The Billionaire Brain Wave uses neuroscience to rewire your mind for abundance in just 7 minutes a day.</p>
-                    <a href="https://3811aatcrgoq3zex8i6zidmb77.hop.clickbank.net" target="_blank" style="display: inline-block; background: white; color: #00c853; padding: 15px 30px; border-radius: 5px; text-decoration: none; font-weight: bold;">Activate Your Billionaire Brain →</a>
-                    <p style="color: rgba(255,255,255,0.8); font-size: 12px; margin-top: 15px;"><em>*Sponsored - We may earn a commission if you purchase. This helps us keep all prompts free.</em></p>
-                </section>'''
+MONEY_SECTION = affiliate_registry.banner_section("money")
 
 # Find all money HTML files
 money_files = glob.glob('prompts/money/*.html')
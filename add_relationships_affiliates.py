@@ -3,15 +3,10 @@ import os
 import re
 import glob
 
+import affiliate_registry
+
 # His Secret Obsession affiliate section for Relationships prompts
-RELATIONSHIPS_SECTION = '''
-            <!-- Affiliate Recommendation -->
-            <section class="affiliate-section" style="margin-top: 60px; padding: 30px; background: linear-gradient(135deg, #e91e63 0%, #c2185b 100%); border-radius: 10px;">
-                <h2 style="color: white; margin-bottom: 15px;">💕 Unlock the Secret to Lasting Love</h2>
-                <p style="color: white; margin-bottom: 20px;">Want to understand what makes relationships thrive? His Secret Obsession reveals the hidden desires that create deep emotional bonds. Learn the psychological triggers that make someone feel truly valued, understood, and irreplaceable in any relationship.</p>
-                <a href="https://fdd98gwkrduu9o55wkx6seqd2w.hop.clickbank.net" target="_blank" style="display: inline-block; background: white; color: #e91e63; padding: 15px 30px; border-radius: 5px; text-decoration: none; font-weight: bold;">Discover the Secret →</a>
-                <p style="color: rgba(255,255,255,0.8); font-size: 12px; margin-top: 15px;"><em>*Sponsored - We may earn a commission if you purchase. This helps us keep all prompts free.</em></p>
-            </section>'''
+RELATIONSHIPS_SECTION = affiliate_registry.banner_section("relationships", indent=12)
 
 def add_affiliate_to_file(filepath):
     """Add affiliate section before the closing </div></main> tags"""
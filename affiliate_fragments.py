@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Externalized affiliate blocks for FreePromptHub.
+Renders each category's affiliate blocks from the registry into small,
+content-hashed JSON fragments under /fragments/affiliates/ (served with
+immutable cache headers and precached by sw.js). Pages then carry a tiny
+.affiliate-slot placeholder that js/affiliate-slots.js fills in, so a link
+change is a fragment deploy instead of a site-wide rewrite.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import textwrap
+
+import affiliate_registry
+from page_pipeline import register_transform, run_pipeline, print_report, PROJECT_ROOT, CATEGORIES
+from page_sections import section_map, rewrite, page_landmarks
+
+FRAGMENTS_URL = "/fragments/affiliates"
+FRAGMENTS_DIR = PROJECT_ROOT / "fragments" / "affiliates"
+
+# "category/kind" -> fragment URL; small and short-lived, unlike the fragments
+FRAGMENT_INDEX_URL = "/fragments/affiliates.json"
+FRAGMENT_INDEX_PATH = PROJECT_ROOT / "fragments" / "affiliates.json"
+
+SW_PATH = PROJECT_ROOT / "sw.js"
+SW_FRAGMENTS_PATTERN = re.compile(r'(// affiliate-fragments:start).*?(\n[ \t]*// affiliate-fragments:end)', re.DOTALL)
+
+# Section class -> renderer; the class doubles as the slot kind
+SLOT_KINDS = {
+    "affiliate-section": lambda category: affiliate_registry.banner_section(category, indent=0),
+    "affiliate-recommendation": lambda category: affiliate_registry.recommendation_section(
+        affiliate_registry.product_key_for_category(category)),
+}
+
+# data-slot keeps the section class in the markup so "already has an affiliate" checks still match
+SLOT_TEMPLATE = '<div class="affiliate-slot" data-slot="{kind}" data-category="{category}"></div>'
+
+# Fills the slots; added to externalized pages that do not load it yet
+SLOTS_SCRIPT_SRC = "/js/affiliate-slots.js"
+SLOTS_SCRIPT = f'    <script src="{SLOTS_SCRIPT_SRC}" defer></script>\n'
+
+def render_fragment(category, kind):
+    """Fragment HTML for a category's block of the given kind ("" if there is none)"""
+    html = SLOT_KINDS[kind](category)
+    return textwrap.dedent(html).strip('\n') if html else ""
+
+def slot_kind(section):
+    return "affiliate-section" if "affiliate-section" in section["classes"] else "affiliate-recommendation"
+
+def replace_with_slots(content, category, page=None):
+    """Swap each inline affiliate block the category has a fragment for with a placeholder"""
+    sections = []
+    for section in section_map(content).get("affiliate", []):
+        if sections and section["start"] < sections[-1]["end"]:
+            continue  # nested inside a block that is already being replaced
+        if render_fragment(category, slot_kind(section)):
+            sections.append(section)
+
+    if not sections:
+        return content
+
+    slots = [(s["start"], SLOT_TEMPLATE.format(kind=slot_kind(s), category=category)) for s in sections]
+    body_close = page_landmarks(content, page)["body_close_last"]
+    if SLOTS_SCRIPT_SRC not in content and body_close != -1:
+        slots.append((body_close, SLOTS_SCRIPT))
+    return rewrite(content, remove=sections, insert=slots)
+
+@register_transform("externalize-affiliates", categories=CATEGORIES,
+                    markers=[b'affiliate-section', b'affiliate-recommendation'],
+                    data=affiliate_registry.load_registry())
+def externalize_affiliates_transform(content, page):
+    """Pipeline transform: replace inline affiliate blocks with fragment placeholders"""
+    return replace_with_slots(content, page["category"], page)
+
+def build_fragments():
+    """Write every fragment and the index; returns the index and removes stale fragments"""
+    FRAGMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    index = {}
+
+    for category in CATEGORIES:
+        for kind in SLOT_KINDS:
+            html = render_fragment(category, kind)
+            if not html:
+                continue
+            data = json.dumps({"category": category, "kind": kind, "html": html},
+                              ensure_ascii=False, sort_keys=True).encode('utf-8')
+            name = f"{category}-{kind}.{hashlib.sha256(data).hexdigest()[:10]}.json"
+            path = FRAGMENTS_DIR / name
+            if not path.exists():
+                path.write_bytes(data)
+            index[f"{category}/{kind}"] = f"{FRAGMENTS_URL}/{name}"
+
+    current = {url.rsplit('/', 1)[1] for url in index.values()}
+    for path in FRAGMENTS_DIR.glob("*.json"):
+        if path.name not in current:
+            path.unlink()
+
+    with open(FRAGMENT_INDEX_PATH, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return index
+
+def update_service_worker(index, path=SW_PATH):
+    """Rewrite the precached fragment list in sw.js; True if it changed"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    listing = ''.join(f"\n  '{url}'," for url in [FRAGMENT_INDEX_URL] + sorted(index.values()))
+    new_content, count = SW_FRAGMENTS_PATTERN.subn(lambda m: m.group(1) + listing + m.group(2), content)
+    if not count:
+        raise ValueError(f"No affiliate-fragments markers in {path}")
+
+    if new_content != content:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+        return True
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Build cached affiliate fragments and optionally externalize inline blocks")
+    parser.add_argument("--externalize", action="store_true", help="also replace inline affiliate blocks in pages with placeholders")
+    parser.add_argument("--category", action="append", dest="categories", help="limit --externalize to a category (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="with --externalize, report pages without writing them")
+    args = parser.parse_args()
+
+    print("BUILDING AFFILIATE FRAGMENTS")
+    print("=" * 50)
+
+    index = build_fragments()
+    for key, url in sorted(index.items()):
+        print(f"  {key:<36} {url}")
+    if update_service_worker(index):
+        print("\n✅ Updated sw.js precache list")
+
+    if args.externalize:
+        print()
+        names = ["externalize-affiliates"]
+        results = run_pipeline(names, categories=args.categories or CATEGORIES, dry_run=args.dry_run)
+        changed = print_report(results, names)
+        verb = "Would externalize" if args.dry_run else "Externalized"
+        print(f"\n{verb} affiliate blocks on {changed} pages")
+
+    print("\n" + "=" * 50)
+    print(f"✅ {len(index)} fragments in {FRAGMENTS_DIR.relative_to(PROJECT_ROOT)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Affiliate registry for FreePromptHub.
+affiliates.json is the single source of truth for the affiliate catalogue:
+products (name, price, hop link, legacy links) and the category -> product
+mapping with the copy used by the page sections and js/affiliate-manager.js.
+Lookups and rendered HTML blocks are built once per process and memoized.
+"""
+
+import argparse
+import json
+from functools import lru_cache
+from pathlib import Path
+
+REGISTRY_PATH = Path(__file__).parent / "affiliates.json"
+
+# "Works 10x Better With" recommendation block (install_affiliates, add_missing_prompts)
+RECOMMENDATION_TEMPLATE = '''
+        <!-- Affiliate Recommendation Section -->
+        <section class="affiliate-recommendation" style="margin: 40px 0; padding: 30px; background: var(--bg-secondary); border-radius: var(--radius); border-left: 4px solid var(--primary);">
+            <h3 style="color: var(--text-primary); margin-bottom: 15px; font-size: 1.3rem;">🚀 Works 10x Better With</h3>
+            <div class="affiliate-product" style="display: flex; align-items: center; gap: 20px; flex-wrap: wrap;">
+                <div class="product-info" style="flex: 1; min-width: 300px;">
+                    <h4 style="color: var(--primary); margin-bottom: 8px; font-size: 1.1rem;">{name}</h4>
+                    <p style="color: var(--text-secondary); margin-bottom: 10px; line-height: 1.5;">{description}</p>
+                    <div class="social-proof" style="font-size: 0.9rem; color: var(--text-tertiary); margin-bottom: 15px;">
+                        ⭐ Used by 47,000+ people | ✅ 60-day guarantee | 🔥 Limited-time bonus
+                    </div>
+                </div>
+                <div class="cta-section" style="text-align: center;">
+                    <div class="price-tag" style="background: var(--success); color: white; padding: 5px 15px; border-radius: 20px; font-weight: bold; margin-bottom: 15px; display: inline-block;">
+                        Save 70% Today!
+                    </div>
+                    <a href="{link}" class="btn-affiliate" target="_blank" rel="noopener" style="display: inline-block; background: linear-gradient(135deg, var(--primary), var(--primary-dark)); color: white; padding: 12px 25px; border-radius: 25px; text-decoration: none; font-weight: 600; transition: all 0.3s ease; box-shadow: 0 4px 15px rgba(0,102,204,0.3);">
+                        Get Instant Access →
+                    </a>
+                    <div style="font-size: 0.8rem; color: var(--text-tertiary); margin-top: 8px;">
+                        ⏰ Offer expires in 24 hours
+                    </div>
+                </div>
+            </div>
+        </section>
+'''
+
+# Category banner section (the add_*_affiliates scripts); lines are indented per caller
+BANNER_TEMPLATE = '''<!-- Affiliate Recommendation -->
+<section class="affiliate-section" style="margin-top: 60px; padding: 30px; background: linear-gradient(135deg, {gradient[0]} 0%, {gradient[1]} 100%); border-radius: 10px;">
+    <h2 style="color: {heading_color}; margin-bottom: 15px;">{heading}</h2>
+    <p style="color: white; margin-bottom: 20px;">{copy}</p>
+    <a href="{link}" target="_blank" style="display: inline-block; background: {button_background}; color: {button_color}; padding: 15px 30px; border-radius: 5px; text-decoration: none; font-weight: bold;">{cta}</a>
+    <p style="color: rgba(255,255,255,0.8); font-size: 12px; margin-top: 15px;"><em>*Sponsored - We may earn a commission if you purchase. This helps us keep all prompts free.</em></p>
+</section>'''
+
+@lru_cache(maxsize=None)
+def load_registry(path=REGISTRY_PATH):
+    """Parse affiliates.json once per process"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def products():
+    """product key -> {name, price, description, link, ...}"""
+    return load_registry()["products"]
+
+def categories():
+    """category -> {product, banner, offers}"""
+    return load_registry()["categories"]
+
+def product_key_for_category(category):
+    """Key of the product promoted in a category, or None"""
+    entry = categories().get(category)
+    return entry["product"] if entry else None
+
+def product_for_category(category):
+    """Product promoted in a category, or None"""
+    key = product_key_for_category(category)
+    return products().get(key) if key else None
+
+def category_link(category):
+    """Hop link for a category's product, or None"""
+    product = product_for_category(category)
+    return product["link"] if product else None
+
+@lru_cache(maxsize=None)
+def category_links():
+    """{category: hop link} for every category with a product"""
+    return {category: category_link(category) for category in categories() if category_link(category)}
+
+@lru_cache(maxsize=None)
+def link_migrations():
+    """{legacy link: current link} across every product"""
+    return {old: product["link"] for product in products().values() for old in product.get("legacy_links", [])}
+
+@lru_cache(maxsize=None)
+def recommendation_section(product_key):
+    """Rendered "Works 10x Better With" block for a product ("" if unknown)"""
+    product = products().get(product_key)
+    if not product:
+        return ""
+    return RECOMMENDATION_TEMPLATE.format(**product)
+
+@lru_cache(maxsize=None)
+def banner_section(category, indent=16):
+    """Rendered affiliate banner for a category, indented by indent spaces ("" if none)"""
+    entry = categories().get(category)
+    if not entry or "banner" not in entry:
+        return ""
+    html = BANNER_TEMPLATE.format(link=products()[entry["product"]]["link"], **entry["banner"])
+    pad = ' ' * indent
+    return '\n' + '\n'.join(pad + line for line in html.split('\n'))
+
+def validate(registry):
+    """List of problems in a registry dict (unknown products, duplicate links)"""
+    problems = []
+    product_keys = set(registry["products"])
+    for category, entry in registry["categories"].items():
+        if entry["product"] not in product_keys:
+            problems.append(f"{category}: unknown product {entry['product']}")
+        for position, offer in entry.get("offers", {}).items():
+            if offer.get("product", entry["product"]) not in product_keys:
+                problems.append(f"{category}/{position}: unknown product {offer['product']}")
+
+    owners = {}
+    for key, product in registry["products"].items():
+        for link in [product["link"]] + product.get("legacy_links", []):
+            if link in owners:
+                problems.append(f"{link} listed for both {owners[link]} and {key}")
+            owners[link] = key
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or check the affiliate registry")
+    parser.add_argument("--check", action="store_true", help="validate affiliates.json and exit non-zero on problems")
+    args = parser.parse_args()
+
+    registry = load_registry()
+    problems = validate(registry)
+
+    if args.check:
+        for problem in problems:
+            print(f"  ✗ {problem}")
+        print(f"{'❌' if problems else '✅'} {len(problems)} problem(s) in {REGISTRY_PATH.name}")
+        raise SystemExit(1 if problems else 0)
+
+    print("AFFILIATE REGISTRY")
+    print("=" * 50)
+    for category, entry in registry["categories"].items():
+        product = registry["products"].get(entry["product"], {})
+        print(f"  {category:<14} {product.get('name', '?'):<24} {product.get('link', '')}")
+    print(f"\n{len(registry['products'])} products, {len(link_migrations())} legacy links")
+
+if __name__ == "__main__":
+    main()
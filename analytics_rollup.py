@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Analytics rollups for FreePromptHub.
+Folds the event collector's log into hourly aggregates keyed by
+category × page × affiliate × metric, kept in a compact columnar file
+(string dictionaries plus one typed array per column) together with the log
+position they cover, so each run only reads events that arrived since the
+last one. It then writes analytics-rollup.json: the pre-aggregated numbers
+analytics-dashboard.html renders, sized by buckets rather than events.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from array import array
+from pathlib import Path
+
+from event_collector import EVENT_LOG_DIR, read_log
+
+PROJECT_ROOT = Path(__file__).parent
+ROLLUP_PATH = PROJECT_ROOT / ".pipeline-cache" / "rollup.bin"
+ROLLUP_JSON_PATH = PROJECT_ROOT / "analytics-rollup.json"
+
+ROLLUP_MAGIC = b"FPHROLL1"
+
+# Column name -> array typecode; rows are unique on every column but count/value
+COLUMNS = {
+    "hour": "L",       # hours since the epoch (UTC)
+    "category": "H",   # index into dictionaries["category"]
+    "page": "L",       # index into dictionaries["page"]
+    "affiliate": "H",  # index into dictionaries["affiliate"] ("" when not an affiliate event)
+    "metric": "B",     # index into dictionaries["metric"]
+    "count": "L",
+    "value": "d",      # summed event value (revenue for affiliate clicks)
+}
+KEY_COLUMNS = ("hour", "category", "page", "affiliate", "metric")
+DICTIONARY_COLUMNS = ("category", "page", "affiliate", "metric")
+
+# Event names from the different trackers -> dashboard metric
+METRIC_ALIASES = {
+    "pageview": "page_view",
+    "page_view": "page_view",
+    "prompt_copy": "prompt_copy",
+    "affiliate_click": "affiliate_click",
+    "affiliate_impression": "affiliate_impression",
+    "scroll": "scroll",
+    "time_on_page": "time_on_page",
+    "conversion_step": "conversion_step",
+    "session_end": "session_end",
+    "category_view": "category_view",
+    "search": "search",
+}
+
+# Funnel steps shown on the dashboard, in order
+FUNNEL = ["page_view", "prompt_copy", "affiliate_click"]
+
+# How much hourly detail the JSON endpoint carries
+RECENT_HOURS = 48
+TOP_PAGES = 20
+
+CATEGORY_PATTERN = re.compile(r'/prompts/([^/]+)/')
+
+class Rollup:
+    """Hourly aggregates in columnar form, plus the log position they cover"""
+
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        self.dictionaries = {name: [] for name in DICTIONARY_COLUMNS}
+        self.position = None
+        self._ids = {name: {} for name in DICTIONARY_COLUMNS}
+        self._rows = {}
+
+    def __len__(self):
+        return len(self.columns["count"])
+
+    def _id(self, column, value):
+        ids = self._ids[column]
+        if value not in ids:
+            ids[value] = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+        return ids[value]
+
+    def _reindex(self):
+        for column in DICTIONARY_COLUMNS:
+            self._ids[column] = {value: i for i, value in enumerate(self.dictionaries[column])}
+        keys = zip(*(self.columns[name] for name in KEY_COLUMNS))
+        self._rows = {key: row for row, key in enumerate(keys)}
+
+    def add(self, hour, category, page, affiliate, metric, value=0.0, count=1):
+        key = (hour, self._id("category", category), self._id("page", page),
+               self._id("affiliate", affiliate), self._id("metric", metric))
+        row = self._rows.get(key)
+        if row is None:
+            self._rows[key] = len(self)
+            for name, item in zip(KEY_COLUMNS, key):
+                self.columns[name].append(item)
+            self.columns["count"].append(count)
+            self.columns["value"].append(value)
+        else:
+            self.columns["count"][row] += count
+            self.columns["value"][row] += value
+
+    def rows(self):
+        """Yield (hour, category, page, affiliate, metric, count, value) with strings resolved"""
+        names = [self.dictionaries[column] for column in DICTIONARY_COLUMNS]
+        for hour, category, page, affiliate, metric, count, value in zip(*(self.columns[name] for name in COLUMNS)):
+            yield (hour, names[0][category], names[1][page], names[2][affiliate], names[3][metric], count, value)
+
+    def save(self, path=ROLLUP_PATH):
+        """Write header (dictionaries, position, column lengths) then each column's raw bytes, atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "position": self.position,
+            "dictionaries": self.dictionaries,
+            "columns": {name: [column.typecode, column.itemsize, len(column)] for name, column in self.columns.items()},
+        }, separators=(',', ':')).encode('utf-8')
+
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(ROLLUP_MAGIC)
+            f.write(len(header).to_bytes(4, 'little'))
+            f.write(header)
+            for column in self.columns.values():
+                column.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=ROLLUP_PATH):
+        """Read a saved rollup; an empty one if the file is missing or from another format"""
+        rollup = cls()
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(ROLLUP_MAGIC)) != ROLLUP_MAGIC:
+                    return rollup
+                header = json.loads(f.read(int.from_bytes(f.read(4), 'little')))
+                for name, (typecode, itemsize, length) in header["columns"].items():
+                    column = array(typecode)
+                    if column.itemsize != itemsize or name not in COLUMNS:
+                        return cls()
+                    column.fromfile(f, length)
+                    if header["byteorder"] != sys.byteorder:
+                        column.byteswap()
+                    rollup.columns[name] = column
+        except (OSError, EOFError, ValueError, KeyError):
+            return cls()
+
+        rollup.dictionaries = header["dictionaries"]
+        rollup.position = tuple(header["position"]) if header["position"] else None
+        rollup._reindex()
+        return rollup
+
+def event_fields(record):
+    """(hour, category, page, affiliate, metric, value) for a logged record; None to skip it"""
+    event = record.get("event")
+    if not isinstance(event, dict):
+        return None
+    params = event.get("params") if isinstance(event.get("params"), dict) else {}
+
+    name = event.get("name") or event.get("type") or event.get("event")
+    metric = METRIC_ALIASES.get(name, "other")
+
+    timestamp = event.get("time") if isinstance(event.get("time"), (int, float)) else record.get("received", 0)
+    hour = int(timestamp // 3_600_000)
+
+    page = str(event.get("path") or "")
+    category_match = CATEGORY_PATTERN.search(page)
+    category = str(event.get("category") or params.get("page_category")
+                   or (category_match.group(1) if category_match else "other"))
+
+    affiliate = ""
+    if metric in ("affiliate_click", "affiliate_impression"):
+        affiliate = str(params.get("event_label") or event.get("productType") or event.get("offer") or "unknown")
+
+    value = params.get("value", 0)
+    value = float(value) if metric == "affiliate_click" and isinstance(value, (int, float)) else 0.0
+    return hour, category, page, affiliate, metric, value
+
+def update_rollup(rollup, log_dir=EVENT_LOG_DIR):
+    """Fold events logged since rollup.position into the rollup; returns how many were read"""
+    read = 0
+    for record, position in read_log(log_dir, rollup.position):
+        fields = event_fields(record)
+        if fields:
+            rollup.add(*fields)
+        rollup.position = position
+        read += 1
+    return read
+
+def _bump(totals, key, metric, count):
+    bucket = totals.setdefault(key, {})
+    bucket[metric] = bucket.get(metric, 0) + count
+
+def dashboard_summary(rollup, now=None):
+    """The JSON the dashboard fetches: totals, daily and recent hourly series, and breakdowns"""
+    now_hour = int((now if now is not None else time.time()) // 3600)
+    today = now_hour // 24
+
+    totals, days, hours, categories, pages = {}, {}, {}, {}, {}
+    affiliates = {}
+    for hour, category, page, affiliate, metric, count, value in rollup.rows():
+        totals[metric] = totals.get(metric, 0) + count
+        _bump(days, hour // 24, metric, count)
+        if hour > now_hour - RECENT_HOURS:
+            _bump(hours, hour, metric, count)
+        _bump(categories, category, metric, count)
+        if page:
+            _bump(pages, page, metric, count)
+        if affiliate:
+            entry = affiliates.setdefault(affiliate, {"clicks": 0, "impressions": 0, "value": 0.0})
+            entry["clicks" if metric == "affiliate_click" else "impressions"] += count
+            entry["value"] = round(entry["value"] + value, 2)
+
+    views = totals.get("page_view", 0)
+    top_pages = sorted(pages.items(), key=lambda item: item[1].get("page_view", 0), reverse=True)[:TOP_PAGES]
+
+    return {
+        "generated": int(time.time()),
+        "totals": totals,
+        "today": days.get(today, {}),
+        "conversion_rate": round(totals.get("affiliate_click", 0) / views * 100, 2) if views else 0,
+        "funnel": [{"step": step, "count": totals.get(step, 0)} for step in FUNNEL],
+        "days": [dict(metrics, day=time.strftime("%Y-%m-%d", time.gmtime(day * 86400)))
+                 for day, metrics in sorted(days.items())],
+        "hours": [dict(metrics, hour=hour * 3600) for hour, metrics in sorted(hours.items())],
+        "categories": categories,
+        "pages": [dict(metrics, page=page) for page, metrics in top_pages],
+        "affiliates": affiliates,
+    }
+
+def write_summary(summary, path=ROLLUP_JSON_PATH):
+    tmp_path = Path(path).with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll the event log up into dashboard aggregates")
+    parser.add_argument("--log-dir", type=Path, default=EVENT_LOG_DIR, help="collector log directory (default: .event-log)")
+    parser.add_argument("--rollup", type=Path, default=ROLLUP_PATH, help="columnar rollup file")
+    parser.add_argument("--output", type=Path, default=ROLLUP_JSON_PATH, help="dashboard JSON to write")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the saved rollup and re-read the whole log")
+    args = parser.parse_args()
+
+    print("ROLLING UP ANALYTICS EVENTS")
+    print("=" * 50)
+
+    rollup = Rollup() if args.rebuild else Rollup.load(args.rollup)
+    start = time.perf_counter()
+    read = update_rollup(rollup, args.log_dir)
+    rollup.save(args.rollup)
+    write_summary(dashboard_summary(rollup), args.output)
+
+    print(f"  {read} new events folded in {time.perf_counter() - start:.2f}s")
+    print(f"  {len(rollup)} aggregate rows ({args.rollup.stat().st_size:,} bytes)")
+    affiliates = sum(1 for name in rollup.dictionaries['affiliate'] if name)
+    print(f"  {len(rollup.dictionaries['page'])} pages, {affiliates} affiliates")
+    print("\n" + "=" * 50)
+    print(f"✅ Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
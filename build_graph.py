@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Dependency-graph build for FreePromptHub.
+Shared fragments (the standardized header, stylesheet links, affiliate
+blocks, the analytics snippet) are baked into page HTML. This records, for
+every page, which fragments it carries, together with the exact text each
+fragment had when it was baked in. When a fragment's source changes (an
+edit to affiliates.json, the header template, the analytics bundle), only
+the pages that depend on it are rewritten, swapping the old text for the
+new; everything else is left untouched. With no recorded text (a fresh
+checkout, a cleared cache) the pages are taken as they are. --reconcile
+locates fragments that are page sections structurally and replaces any copy
+that differs from what the registry renders now.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import affiliate_registry
+import fix_stylesheets
+import setup_analytics
+import standardize_headers
+from page_sections import scan_sections
+from page_pipeline import (CACHE_DIR, CATEGORIES, PROJECT_ROOT, _load_json, _save_json, default_jobs,
+                           find_site_pages, map_file, page_key)
+
+GRAPH_PATH = CACHE_DIR / "build_graph.json"
+
+# Indent the add_*_affiliates scripts render each category's banner with
+BANNER_INDENTS = {"relationships": 12}
+
+# name -> {"name", "render", "categories", "sources", "locate"}
+FRAGMENTS = {}
+
+def register_fragment(name, render, categories=None, sources=(), locate=None):
+    """Register render() -> str as a named shared fragment.
+
+    categories limits which pages can depend on it (None for every page);
+    sources are the files its text comes from, shown in reports.
+    locate(content) -> [(start, end)] finds the fragment in a page whatever
+    text it carries, for when no baked text has been recorded yet.
+    """
+    FRAGMENTS[name] = {
+        "name": name,
+        "render": render,
+        "categories": categories,
+        "sources": tuple(sources),
+        "locate": locate,
+    }
+
+def section_locator(kind, class_name):
+    """locate() for a fragment that is a page section of this kind and class (with its leading comment)"""
+    def locate(content):
+        return [(element["start"], element["end"]) for element in scan_sections(content)
+                if element["kind"] == kind and class_name in element["classes"]]
+    return locate
+
+register_fragment("header", lambda: standardize_headers.NEW_HEADER, sources=["standardize_headers.py"])
+register_fragment("stylesheet:style", lambda: fix_stylesheets.STYLE_CSS_LINK, sources=["fix_stylesheets.py"])
+register_fragment("stylesheet:dark-mode", lambda: fix_stylesheets.DARK_MODE_CSS_LINK, sources=["fix_stylesheets.py"])
+register_fragment("analytics:head", setup_analytics.create_analytics_code, sources=["setup_analytics.py"])
+register_fragment("analytics:tracking", setup_analytics.create_conversion_tracking_script,
+                  sources=["setup_analytics.py"])
+register_fragment("analytics:bundle", setup_analytics.create_analytics_stub,
+                  sources=["setup_analytics.py", "js/site-analytics.*.js"])
+
+for _category in CATEGORIES:
+    register_fragment(f"affiliate:{_category}",
+                      lambda category=_category: affiliate_registry.recommendation_section(
+                          affiliate_registry.product_key_for_category(category)),
+                      categories=[_category], sources=["affiliates.json"],
+                      locate=section_locator("affiliate", "affiliate-recommendation"))
+    register_fragment(f"affiliate-banner:{_category}",
+                      lambda category=_category: affiliate_registry.banner_section(
+                          category, BANNER_INDENTS.get(category, 16)),
+                      categories=[_category], sources=["affiliates.json"],
+                      locate=section_locator("affiliate", "affiliate-section"))
+
+def fragment_text(fragment):
+    """Current text of a fragment, without surrounding whitespace ("" if it renders nothing)"""
+    return (fragment["render"]() or "").strip()
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+def current_fragments():
+    """{name: {"hash", "text"}} for every fragment that renders something"""
+    fragments = {}
+    for name, fragment in FRAGMENTS.items():
+        text = fragment_text(fragment)
+        if text:
+            fragments[name] = {"hash": text_hash(text), "text": text}
+    return fragments
+
+def load_graph(path=GRAPH_PATH):
+    """{"fragments": {name: {"hash", "text"}}, "pages": {key: {"size", "mtime", "deps"}}}"""
+    graph = _load_json(path)
+    graph.setdefault("fragments", {})
+    graph.setdefault("pages", {})
+    return graph
+
+def save_graph(graph, path=GRAPH_PATH):
+    _save_json(graph, path)
+
+def _applies(name, category):
+    categories = FRAGMENTS[name]["categories"] if name in FRAGMENTS else None
+    return not categories or category in categories
+
+def scan_page(path, category, fragments):
+    """Names of the fragments whose text occurs in the page"""
+    with open(path, 'rb') as f, map_file(f) as data:
+        return sorted(name for name, fragment in fragments.items()
+                      if _applies(name, category) and data.find(fragment["text"].encode('utf-8')) != -1)
+
+def update_page_deps(graph, fragments, root=PROJECT_ROOT):
+    """Refresh the page -> fragments edges, rescanning only pages whose size or mtime moved.
+
+    fragments holds the text each fragment had when it was baked in, which
+    is what the pages actually contain. Returns the number of pages scanned.
+    """
+    # Pages only need a full rescan when some fragment's text differs from the last scan
+    scanned_for = {name: fragment["hash"] for name, fragment in fragments.items()}
+    rescan_all = graph.get("scanned_for") != scanned_for
+    pages = {}
+    scanned = 0
+    for page in find_site_pages(root):
+        key = page_key(page["path"], root)
+        stat = os.stat(page["path"])
+        entry = graph["pages"].get(key)
+        if (rescan_all or entry is None or entry.get("size") != stat.st_size
+                or entry.get("mtime") != stat.st_mtime_ns):
+            entry = {"size": stat.st_size, "mtime": stat.st_mtime_ns,
+                     "deps": scan_page(page["path"], page["category"], fragments)}
+            scanned += 1
+        pages[key] = entry
+    graph["pages"] = pages
+    graph["scanned_for"] = scanned_for
+    return scanned
+
+def dependents(graph, names):
+    """{fragment name: [page keys]} from the recorded edges"""
+    index = {name: [] for name in names}
+    for key, entry in graph["pages"].items():
+        for name in entry["deps"]:
+            if name in index:
+                index[name].append(key)
+    return index
+
+def changed_fragments(graph, current):
+    """Names whose recorded (baked-in) text differs from what they render now"""
+    return sorted(name for name, fragment in current.items()
+                  if name in graph["fragments"] and graph["fragments"][name]["hash"] != fragment["hash"])
+
+def stale_copies(names, current, root=PROJECT_ROOT):
+    """{page key: [(name, old text)]} for located copies of names that differ from their current text.
+
+    Used by reconcile runs, where the text to swap out has to be read off the
+    pages rather than taken from the record.
+    """
+    locatable = [name for name in names if FRAGMENTS[name]["locate"]]
+    stale = {}
+    if not locatable:
+        return stale
+    for page in find_site_pages(root):
+        candidates = [name for name in locatable if _applies(name, page["category"])]
+        if not candidates:
+            continue
+        with open(page["path"], 'r', encoding='utf-8') as f:
+            content = f.read()
+        for name in candidates:
+            copies = {content[start:end] for start, end in FRAGMENTS[name]["locate"](content)}
+            copies.discard(current[name]["text"])
+            if copies:
+                stale.setdefault(page_key(page["path"], root), []).extend((name, text) for text in sorted(copies))
+    return stale
+
+def rebuild_page(task):
+    """Worker entry point: swap old fragment texts for new ones in one page; never raises"""
+    path, replacements, dry_run = task
+    result = {"path": path, "replaced": [], "error": None}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for name, old, new in replacements:
+            if old in content:
+                content = content.replace(old, new)
+                result["replaced"].append(name)
+        if result["replaced"] and not dry_run:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def build(names=None, dry_run=False, jobs=None, root=PROJECT_ROOT, graph_path=GRAPH_PATH, reconcile=False):
+    """Rewrite the pages that depend on changed fragments.
+
+    names restricts the rebuild to fragments matching these glob patterns;
+    other changed fragments keep their recorded text and stay pending for a
+    later run. reconcile also replaces every located copy that differs from
+    the current text, whatever was recorded. Returns (changed names,
+    {name: affected page keys}, results).
+    """
+    graph = load_graph(graph_path)
+    current = current_fragments()
+
+    def selected(name):
+        return not names or any(fnmatch.fnmatchcase(name, pattern) for pattern in names)
+
+    # What pages contain is the recorded text; fragments with no record yet
+    # (first run, cleared cache) are taken as current and the pages left as they are
+    unrecorded = [name for name in current if name not in graph["fragments"]]
+    baked = {name: graph["fragments"].get(name, fragment) for name, fragment in current.items()}
+    update_page_deps(graph, baked, root)
+
+    changed = [name for name in changed_fragments(graph, current) if selected(name)]
+    affected = dependents(graph, changed)
+
+    by_page = {}
+    for name in changed:
+        for key in affected[name]:
+            by_page.setdefault(key, []).append((name, baked[name]["text"], current[name]["text"]))
+
+    stale = stale_copies([name for name in current if selected(name)], current, root) if reconcile else {}
+    for key, copies in stale.items():
+        for name, old in copies:
+            if name not in affected:
+                changed.append(name)
+                affected[name] = []
+            if key not in affected[name]:
+                affected[name].append(key)
+            by_page.setdefault(key, []).append((name, old, current[name]["text"]))
+    tasks = [(str(Path(root) / key), replacements, dry_run) for key, replacements in sorted(by_page.items())]
+
+    jobs = min(jobs or default_jobs(), len(tasks)) or 1
+    if jobs == 1:
+        results = [rebuild_page(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(rebuild_page, tasks, chunksize=8))
+
+    if not dry_run:
+        failed = {page_key(result["path"], root) for result in results if result["error"]}
+        for name in changed:
+            # A fragment is rebuilt only once every page carrying it has the new text
+            if not failed.intersection(affected[name]):
+                baked[name] = current[name]
+        # Unrecorded fragments this run did not select stay unrecorded until a run covers them
+        graph["fragments"] = {name: fragment for name, fragment in baked.items()
+                              if name not in unrecorded or selected(name)}
+        update_page_deps(graph, baked, root)
+        save_graph(graph, graph_path)
+
+        # Keep the hyperlink index in step with the pages this run rewrote
+        import link_index
+        link_index.update_link_index([result["path"] for result in results if result["replaced"]], root)
+
+    return changed, affected, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild only the pages whose shared fragments changed")
+    parser.add_argument("fragments", nargs="*", help="limit the rebuild to these fragment names or globs (e.g. 'affiliate:money', 'analytics:*')")
+    parser.add_argument("--dry-run", action="store_true", help="report affected pages without writing files")
+    parser.add_argument("--jobs", type=int, default=default_jobs(), help="worker processes (default: one per core)")
+    parser.add_argument("--show", action="store_true", help="list fragments with their dependent page counts and exit")
+    parser.add_argument("--reconcile", action="store_true",
+                        help="replace every located affiliate section that differs from what affiliates.json renders now")
+    args = parser.parse_args()
+
+    if args.show:
+        graph = load_graph()
+        current = current_fragments()
+        baked = {name: graph["fragments"].get(name, fragment) for name, fragment in current.items()}
+        update_page_deps(graph, baked)
+        changed = set(changed_fragments(graph, current))
+        for name, keys in dependents(graph, sorted(baked)).items():
+            state = " (changed)" if name in changed else ""
+            print(f"  {name:<32} {len(keys):>4} pages  [{', '.join(FRAGMENTS[name]['sources'])}]{state}")
+        return
+
+    print("DEPENDENCY-GRAPH BUILD")
+    print("=" * 50)
+
+    changed, affected, results = build(args.fragments, args.dry_run, args.jobs, reconcile=args.reconcile)
+    if not changed:
+        print("No fragment changes; every page is current")
+    for name in changed:
+        print(f"  {name} changed ({', '.join(FRAGMENTS[name]['sources'])}): {len(affected[name])} pages")
+
+    errors = [result for result in results if result["error"]]
+    if errors:
+        print(f"\n  ✗ {len(errors)} errors:")
+        for result in errors:
+            print(f"    {result['path']}: {result['error']}")
+
+    rebuilt = sum(1 for result in results if result["replaced"])
+    total = sum(1 for _ in find_site_pages())
+    print("\n" + "=" * 50)
+    verb = "Would rewrite" if args.dry_run else "Rewrote"
+    print(f"✅ {verb} {rebuilt}/{total} pages")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Category index generator for FreePromptHub.
+Lists every prompt page of a category (title and description read from the
+pages themselves, cached by size and mtime) and keeps each category's
+index.html in step with it. The listing lives between category-listing
+markers, so the hand-written intro, featured cards and CTA around it stay
+as they are. Large categories are split into fixed-size pages:
+index.html carries the first page, and prompts/<category>/page/<n>/ the
+rest, with prev/next links. Index pages are only rewritten when their
+listing actually changed.
+"""
+
+import argparse
+import html
+import re
+import shutil
+from pathlib import Path
+from urllib.parse import urljoin
+
+from page_pipeline import CACHE_DIR, CATEGORIES, PROJECT_ROOT, _load_json, _save_json, find_pages, page_key
+from page_sections import scan_sections
+from render_cache import write_if_changed
+
+LISTING_CACHE_PATH = CACHE_DIR / "category_listing.json"
+
+PAGE_SIZE = 24
+
+LISTING_START = "<!-- category-listing:start -->"
+LISTING_END = "<!-- category-listing:end -->"
+LISTING_PATTERN = re.compile(re.escape(LISTING_START) + r'.*?' + re.escape(LISTING_END), re.DOTALL)
+
+# Class of the hand-maintained "All ... Prompts" section the generated listing replaces
+ALL_PROMPTS_CLASS = "all-prompts"
+
+PROMPT_TITLE_PATTERN = re.compile(r'<h1 class="prompt-title">(.*?)</h1>', re.DOTALL)
+TITLE_PATTERN = re.compile(r'<title>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+DESCRIPTION_PATTERN = re.compile(r'<meta name="description" content="([^"]*)"', re.IGNORECASE)
+TITLE_SUFFIX_PATTERN = re.compile(r'\s*[-|–]\s*(?:FreePromptHub|Free Prompt Hub|Free AI Prompt)\s*$')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+CANONICAL_PATTERN = re.compile(r'<link rel="canonical" href="[^"]*">')
+MAIN_PATTERN = re.compile(r'(<main[^>]*>).*?(</main>)', re.DOTALL)
+BREADCRUMB_PATTERN = re.compile(r'[ \t]*<nav class="breadcrumb".*?</nav>', re.DOTALL)
+CATEGORY_HEADER_PATTERN = re.compile(r'[ \t]*<section class="category-header">.*?</section>', re.DOTALL)
+RELATIVE_URL_PATTERN = re.compile(r'\b(href|src)="(?![a-z][a-z0-9+.-]*:|/|#)([^"]*)"')
+
+SITE_URL = "https://www.freeprompthub.com"
+
+LISTING_TEMPLATE = '''{start}
+            <section class="all-prompts category-listing">
+                <h2>All {category_title} Prompts</h2>
+                <ul class="prompt-links">
+{items}
+                </ul>{pagination}
+            </section>
+            {end}'''
+
+ITEM_TEMPLATE = '                    <li><a href="{url}">{title}</a>{description}</li>'
+
+PAGINATION_TEMPLATE = '''
+                <nav class="pagination" aria-label="{category_title} prompt pages">
+                    {prev}
+                    <span class="pagination-status">Page {number} of {count}</span>
+                    {next}
+                </nav>'''
+
+def page_metadata(path, category):
+    """{"title", "description"} for a prompt page: its prompt heading (else <title>) and meta description"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    heading = PROMPT_TITLE_PATTERN.search(content)
+    if heading:
+        title = TAG_PATTERN.sub('', heading.group(1))
+    else:
+        title_match = TITLE_PATTERN.search(content)
+        title = TITLE_SUFFIX_PATTERN.sub('', title_match.group(1)) if title_match else Path(path).stem
+        # "Debug Master Prompt - Coding" style titles repeat the category
+        title = re.sub(rf'\s*[-|–]\s*{re.escape(category_title(category))}\s*$', '', title, flags=re.IGNORECASE)
+
+    description_match = DESCRIPTION_PATTERN.search(content)
+    return {"title": ' '.join(title.split()), "description": description_match.group(1).strip() if description_match else ""}
+
+def update_listing_cache(cache, categories=CATEGORIES, root=PROJECT_ROOT):
+    """Bring the cached page metadata up to date; returns {category: [entries]} sorted by title.
+
+    Only pages whose size or mtime changed are read.
+    """
+    listings = {}
+    seen = set()
+    for page in find_pages(root, categories):
+        key = page_key(page["path"], root)
+        stat = page["path"].stat()
+        entry = cache.get(key)
+        if entry is None or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime_ns:
+            entry = dict(page_metadata(page["path"], page["category"]), size=stat.st_size, mtime=stat.st_mtime_ns)
+            cache[key] = entry
+        seen.add(key)
+        listings.setdefault(page["category"], []).append(
+            {"url": f"/{key}", "title": entry["title"], "description": entry["description"]})
+
+    for key in [key for key in cache if key.split('/')[1] in categories and key not in seen]:
+        del cache[key]
+    for entries in listings.values():
+        entries.sort(key=lambda entry: (html.unescape(entry["title"]).casefold(), entry["url"]))
+    return listings
+
+def page_url(category, number):
+    return f"/prompts/{category}/" if number == 1 else f"/prompts/{category}/page/{number}/"
+
+def page_path(category, number, root=PROJECT_ROOT):
+    category_dir = Path(root) / "prompts" / category
+    return category_dir / "index.html" if number == 1 else category_dir / "page" / str(number) / "index.html"
+
+def category_title(category):
+    return category.replace('-', ' ').title() if category != "ai-art" else "AI Art"
+
+def render_listing(category, entries, number, count):
+    """Marker-delimited listing block for one page of a category"""
+    items = '\n'.join(ITEM_TEMPLATE.format(
+        url=entry["url"], title=entry["title"],
+        description=f' - {entry["description"]}' if entry["description"] else '') for entry in entries)
+
+    pagination = ''
+    if count > 1:
+        prev_link = (f'<a rel="prev" href="{page_url(category, number - 1)}">← Previous</a>'
+                     if number > 1 else '<span class="pagination-disabled">← Previous</span>')
+        next_link = (f'<a rel="next" href="{page_url(category, number + 1)}">Next →</a>'
+                     if number < count else '<span class="pagination-disabled">Next →</span>')
+        pagination = PAGINATION_TEMPLATE.format(category_title=category_title(category), prev=prev_link,
+                                                next=next_link, number=number, count=count)
+
+    return LISTING_TEMPLATE.format(start=LISTING_START, end=LISTING_END, category_title=category_title(category),
+                                   items=items, pagination=pagination)
+
+def insert_listing(content, block):
+    """Index HTML with its listing replaced by block; None if there is nowhere to put it"""
+    # Replacement strings go through a function so backslashes in the block stay literal
+    if LISTING_PATTERN.search(content):
+        return LISTING_PATTERN.sub(lambda m: block.strip(), content, count=1)
+    all_prompts = next((e for e in scan_sections(content)
+                        if e["tag"] == "section" and ALL_PROMPTS_CLASS in e["classes"]), None)
+    if all_prompts:
+        return content[:all_prompts["start"]] + block.strip() + content[all_prompts["end"]:]
+    main_close = content.find('</main>')
+    if main_close == -1:
+        return None
+    # Inside the main container when there is one, like the sections the listing sits beside
+    container_close = content.rfind('</div>', 0, main_close)
+    position = container_close if container_close != -1 else main_close
+    return content[:position] + '    ' + block.strip() + '\n        ' + content[position:]
+
+def paged_page(index_content, category, number, block):
+    """A follow-on listing page built on the category index's shell (head, header, footer)"""
+    main = MAIN_PATTERN.search(index_content)
+    if main is None:
+        return None
+
+    parts = []
+    for pattern in (BREADCRUMB_PATTERN, CATEGORY_HEADER_PATTERN):
+        match = pattern.search(main.group(0))
+        if match:
+            parts.append(match.group(0))
+    parts.append('            ' + block.strip())
+    body = (f'{main.group(1)}\n        <div class="container">\n' + '\n\n'.join(parts)
+            + f'\n        </div>\n    {main.group(2)}')
+    content = index_content[:main.start()] + body + index_content[main.end():]
+
+    url = page_url(category, number)
+    content = TITLE_PATTERN.sub(lambda m: f'<title>{TITLE_SUFFIX_PATTERN.sub("", m.group(1))} - Page {number}'
+                                          f' - FreePromptHub</title>', content, count=1)
+    content = CANONICAL_PATTERN.sub(lambda m: f'<link rel="canonical" href="{SITE_URL}{url}">', content, count=1)
+
+    # The shell moves two directories down: pin its relative links to the category directory
+    base = page_url(category, 1)
+    return RELATIVE_URL_PATTERN.sub(lambda m: f'{m.group(1)}="{urljoin(base, m.group(2))}"', content)
+
+def build_category(category, entries, page_size=PAGE_SIZE, dry_run=False, root=PROJECT_ROOT):
+    """Write a category's index pages; returns (written paths, page count, removed paths)"""
+    index_path = page_path(category, 1, root)
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index_content = f.read()
+
+    count = max(1, -(-len(entries) // page_size))
+    pages = []
+    shell = None
+    for number in range(1, count + 1):
+        block = render_listing(category, entries[(number - 1) * page_size:number * page_size], number, count)
+        if number == 1:
+            content = insert_listing(index_content, block)
+            shell = content
+        else:
+            content = paged_page(shell, category, number, block)
+        if content is None:
+            raise ValueError(f"{page_key(index_path, root)} has no <main> to hold the listing")
+        pages.append((page_path(category, number, root), content))
+
+    written = []
+    for path, content in pages:
+        if dry_run:
+            current = path.read_text(encoding='utf-8') if path.exists() else None
+            if current != content:
+                written.append(path)
+        elif write_if_changed(path, content.encode('utf-8')):
+            written.append(path)
+
+    # Pages past the new end (the category shrank or page_size grew)
+    removed = []
+    page_dir = Path(root) / "prompts" / category / "page"
+    if page_dir.is_dir():
+        for number_dir in page_dir.iterdir():
+            if not number_dir.name.isdigit() or int(number_dir.name) <= count:
+                continue
+            removed.append(number_dir / "index.html")
+            if not dry_run:
+                shutil.rmtree(number_dir)
+    return written, count, removed
+
+def build_indexes(categories=CATEGORIES, page_size=PAGE_SIZE, dry_run=False, root=PROJECT_ROOT):
+    """Regenerate category indexes; returns {category: (written, page count, removed)}"""
+    cache = _load_json(LISTING_CACHE_PATH)
+    listings = update_listing_cache(cache, categories, root)
+    results = {}
+    for category in categories:
+        if (Path(root) / "prompts" / category / "index.html").exists():
+            results[category] = build_category(category, listings.get(category, []), page_size, dry_run, root)
+    if not dry_run:
+        _save_json(cache, LISTING_CACHE_PATH)
+
+        # Keep the hyperlink index in step with the pages this run rewrote
+        import link_index
+        link_index.update_link_index([path for written, _, _ in results.values() for path in written], root)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate category index pages from the prompt pages")
+    parser.add_argument("--category", action="append", dest="categories", help="limit to a category (repeatable)")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help=f"prompts per index page (default: {PAGE_SIZE})")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be written")
+    args = parser.parse_args()
+
+    print("BUILDING CATEGORY INDEXES")
+    print("=" * 50)
+
+    results = build_indexes(args.categories or CATEGORIES, args.page_size, args.dry_run)
+    total = 0
+    for category, (written, count, removed) in results.items():
+        total += len(written)
+        status = f"{len(written)} written" if written else "unchanged"
+        removed_note = f", {len(removed)} removed" if removed else ""
+        print(f"  {category}: {count} pages, {status}{removed_note}")
+
+    print("\n" + "=" * 50)
+    verb = "Would write" if args.dry_run else "Wrote"
+    print(f"✅ {verb} {total} index pages")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Local event collector for FreePromptHub analytics.
+A small asyncio HTTP server that stands in for the production /api/analytics
+endpoint: it accepts single events, {"events": [...]} batches and arrays
+(fetch or sendBeacon), and appends them as JSON lines to a segmented,
+append-only log. Writes are group-committed: every request that arrives
+while an fsync is in flight joins the next write, and each request is
+acknowledged only once its events are on disk.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent
+EVENT_LOG_DIR = PROJECT_ROOT / ".event-log"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+
+# Paths the site posts events to (simple-analytics.js, ConversionTracker batch mode)
+COLLECT_PATHS = {"/api/analytics"}
+
+# sendBeacon payloads are capped at 64 KB by browsers; anything bigger is not ours
+MAX_BODY_BYTES = 64 * 1024
+SEGMENT_BYTES = 64 * 1024 * 1024
+SEGMENT_SUFFIX = ".log"
+
+STATUS_TEXT = {
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+CORS_HEADERS = (
+    "Access-Control-Allow-Origin: *\r\n"
+    "Access-Control-Allow-Methods: POST, OPTIONS\r\n"
+    "Access-Control-Allow-Headers: Content-Type\r\n"
+)
+
+def segment_path(log_dir, seq):
+    return Path(log_dir) / f"{seq:012d}{SEGMENT_SUFFIX}"
+
+def list_segments(log_dir=EVENT_LOG_DIR):
+    """Segment files in write order"""
+    log_dir = Path(log_dir)
+    if not log_dir.is_dir():
+        return []
+    return sorted(log_dir.glob(f"*{SEGMENT_SUFFIX}"))
+
+def read_log(log_dir=EVENT_LOG_DIR, position=None):
+    """Yield (record, position) for every complete line after position.
+
+    position is a (segment name, byte offset) pair as yielded alongside the
+    previous record, so readers can resume where they stopped. An unfinished
+    last line is left for the next read; unparseable lines are skipped.
+    """
+    start_segment, start_offset = position or ("", 0)
+    for path in list_segments(log_dir):
+        if path.name < start_segment:
+            continue
+        offset = start_offset if path.name == start_segment else 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                yield record, (path.name, offset)
+
+def read_events(log_dir=EVENT_LOG_DIR):
+    """Yield every logged record ({"received", "path", "event"}) in write order"""
+    for record, _ in read_log(log_dir):
+        yield record
+
+def normalize_events(payload):
+    """List of event dicts from any of the payload shapes the site sends"""
+    if isinstance(payload, dict) and isinstance(payload.get("events"), list):
+        # Batch envelope: shared fields (category, path) apply to every event
+        shared = {key: value for key, value in payload.items() if key != "events"}
+        return [dict(shared, **event) for event in payload["events"] if isinstance(event, dict)]
+    if isinstance(payload, list):
+        return [event for event in payload if isinstance(event, dict)]
+    if isinstance(payload, dict):
+        return [payload]
+    return []
+
+def _fsync_dir(path):
+    """Persist a new directory entry (no-op where directories cannot be opened)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class SegmentedLog:
+    """Append-only JSON-lines log split into fixed-size segments, with group commit"""
+
+    def __init__(self, log_dir=EVENT_LOG_DIR, segment_bytes=SEGMENT_BYTES, fsync=True):
+        self.log_dir = Path(log_dir)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.stats = {"records": 0, "commits": 0, "bytes": 0, "segments": 0}
+        self._pending = []
+        self._writing = False
+        self._wakeup = None
+        self._writer_task = None
+        self._file = None
+        self._seq = 0
+        self._size = 0
+
+    def _open_segment(self, seq):
+        self._seq = seq
+        path = segment_path(self.log_dir, seq)
+        self._file = open(path, 'ab')
+        self._size = self._file.tell()
+        if self._size == 0:
+            self.stats["segments"] += 1
+            if self.fsync:
+                _fsync_dir(self.log_dir)
+
+    def open(self):
+        """Resume the newest segment, or start the first one"""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        segments = list_segments(self.log_dir)
+        seq = int(segments[-1].stem) if segments else 0
+        if segments and segments[-1].stat().st_size >= self.segment_bytes:
+            seq += 1
+        self._open_segment(seq)
+
+    def _write_group(self, data):
+        """Runs in a worker thread: write one group and fsync it once"""
+        if self._size and self._size + len(data) > self.segment_bytes:
+            self._file.close()
+            self._open_segment(self._seq + 1)
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._size += len(data)
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            group, self._pending = self._pending, []
+            if not group:
+                continue
+
+            self._writing = True
+            try:
+                data = b''.join(lines for lines, _ in group)
+                await loop.run_in_executor(None, self._write_group, data)
+            except Exception as e:
+                # Fail this group only; the writer keeps serving later ones
+                for _, waiter in group:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                continue
+            finally:
+                self._writing = False
+
+            self.stats["commits"] += 1
+            self.stats["bytes"] += len(data)
+            for _, waiter in group:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def start(self):
+        self.open()
+        self._wakeup = asyncio.Event()
+        self._writer_task = asyncio.create_task(self._writer())
+
+    async def append(self, records):
+        """Queue records for the next group commit and wait until they are durable"""
+        if not records:
+            return
+        lines = b''.join(json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b'\n'
+                         for record in records)
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending.append((lines, waiter))
+        self.stats["records"] += len(records)
+        self._wakeup.set()
+        await waiter
+
+    async def close(self):
+        """Commit anything still queued, then stop the writer"""
+        while self._pending or self._writing:
+            self._wakeup.set()
+            await asyncio.sleep(0.001)
+        if self._writer_task:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        if self._file:
+            self._file.close()
+
+class EventCollector:
+    """Minimal HTTP/1.1 front end that feeds a SegmentedLog"""
+
+    def __init__(self, log, paths=COLLECT_PATHS, max_body=MAX_BODY_BYTES):
+        self.log = log
+        self.paths = set(paths)
+        self.max_body = max_body
+        self.stats = {"requests": 0, "events": 0, "rejected": 0}
+
+    async def respond(self, writer, status, keep_alive=True):
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"{CORS_HEADERS}"
+            "Content-Length: 0\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1'))
+        await writer.drain()
+
+    async def handle_request(self, method, path, headers, body):
+        """Status code for one request"""
+        if path.split('?', 1)[0] not in self.paths:
+            return 404
+        if method == "OPTIONS":
+            return 204
+        if method != "POST":
+            return 405
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400
+
+        received = int(time.time() * 1000)
+        records = [{"received": received, "path": path, "event": event} for event in normalize_events(payload)]
+        try:
+            await self.log.append(records)
+        except Exception:
+            # Write or fsync failed (disk full, I/O error): the client gets an answer and may retry
+            return 500
+        self.stats["events"] += len(records)
+        return 204
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode('latin-1').split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self.respond(writer, 400, keep_alive=False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                self.stats["requests"] += 1
+
+                length = headers.get("content-length")
+                if length is None and method == "POST":
+                    self.stats["rejected"] += 1
+                    await self.respond(writer, 411, keep_alive=False)
+                    break
+                try:
+                    length = int(length or 0)
+                except ValueError:
+                    await self.respond(writer, 400, keep_alive=False)
+                    break
+                if length > self.max_body:
+                    self.stats["rejected"] += 1
+                    await self.respond(writer, 413, keep_alive=False)
+                    break
+
+                body = await reader.readexactly(length) if length else b""
+                status = await self.handle_request(method, path, headers, body)
+                if status >= 400:
+                    self.stats["rejected"] += 1
+                await self.respond(writer, status, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(host, port, log_dir, segment_bytes, fsync, report_every):
+    log = SegmentedLog(log_dir, segment_bytes=segment_bytes, fsync=fsync)
+    log.start()
+    collector = EventCollector(log)
+    server = await asyncio.start_server(collector.handle_connection, host, port)
+
+    print("EVENT COLLECTOR")
+    print("=" * 50)
+    print(f"Listening on http://{host}:{port} ({', '.join(sorted(COLLECT_PATHS))})")
+    print(f"Logging to {log_dir} ({'fsync per group commit' if fsync else 'no fsync'})\n")
+
+    last_events, last_time = 0, time.monotonic()
+    try:
+        async with server:
+            while True:
+                await asyncio.sleep(report_every)
+                now = time.monotonic()
+                events = collector.stats["events"]
+                commits = max(log.stats["commits"], 1)
+                print(f"  {events - last_events:>7} events in {now - last_time:.1f}s "
+                      f"({(events - last_events) / (now - last_time):,.0f}/s), "
+                      f"{log.stats['records'] / commits:.1f} records per commit")
+                last_events, last_time = events, now
+    finally:
+        await log.close()
+        print("\n" + "=" * 50)
+        print(f"✅ {collector.stats['events']} events from {collector.stats['requests']} requests "
+              f"in {log.stats['commits']} commits ({collector.stats['rejected']} rejected)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local analytics event collector")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--log-dir", type=Path, default=EVENT_LOG_DIR, help="segment directory (default: .event-log)")
+    parser.add_argument("--segment-mb", type=int, default=SEGMENT_BYTES // (1024 * 1024), help="roll segments at this size")
+    parser.add_argument("--no-fsync", action="store_true", help="skip fsync (faster, not crash-safe)")
+    parser.add_argument("--report-every", type=float, default=5.0, help="seconds between throughput lines")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.log_dir, args.segment_mb * 1024 * 1024,
+                          not args.no_fsync, args.report_every))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
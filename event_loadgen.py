@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Load generator for the local event collector.
+Replays an event mix against event_collector.py over keep-alive HTTP
+connections and reports throughput and latency. The mix is either a
+recorded collector log (--from-log), a JSON file of payloads (--mix) or the
+built-in mix below, shaped like what the site's trackers send.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+
+from event_collector import DEFAULT_HOST, DEFAULT_PORT, read_events
+
+CATEGORIES = ["money", "business", "relationships", "health", "everyday", "coding", "content", "ai-art"]
+
+# (weight, event) pairs for ConversionTracker batches; value is filled per event
+TRACKER_EVENTS = [
+    (30, {"name": "page_view", "params": {"page_category": None}}),
+    (25, {"name": "scroll", "params": {"event_category": "Engagement", "value": 25}}),
+    (15, {"name": "scroll", "params": {"event_category": "Engagement", "value": 75}}),
+    (12, {"name": "time_on_page", "params": {"event_category": "Engagement", "value": 30}}),
+    (10, {"name": "prompt_copy", "params": {"event_category": "Engagement", "value": 1}}),
+    (5, {"name": "conversion_step", "params": {"event_category": "Conversion Funnel", "value": 5}}),
+    (3, {"name": "affiliate_click", "params": {"event_category": "Affiliate", "value": 50, "currency": "USD"}}),
+]
+
+def tracker_batch(rng, size):
+    """A ConversionTracker batch-mode payload"""
+    category = rng.choice(CATEGORIES)
+    weights = [weight for weight, _ in TRACKER_EVENTS]
+    events = []
+    for template in rng.choices([event for _, event in TRACKER_EVENTS], weights=weights, k=size):
+        params = dict(template["params"])
+        if "page_category" in params:
+            params["page_category"] = category
+        events.append({"name": template["name"], "params": params, "time": int(time.time() * 1000)})
+    return {"category": category, "path": f"/prompts/{category}/sample.html", "events": events}
+
+def simple_event(rng):
+    """A single simple-analytics.js event"""
+    category = rng.choice(CATEGORIES)
+    return {
+        "type": rng.choice(["pageview", "pageview", "prompt_copy", "affiliate_click"]),
+        "path": f"/prompts/{category}/sample.html",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "sessionId": f"sess_{rng.getrandbits(32):08x}",
+    }
+
+def builtin_mix(count, batch_size, seed=0):
+    """count payloads: mostly tracker batches, some single events"""
+    rng = random.Random(seed)
+    return [tracker_batch(rng, rng.randint(1, batch_size)) if rng.random() < 0.8 else simple_event(rng)
+            for _ in range(count)]
+
+def mix_from_log(log_dir, batch_size):
+    """Recorded events regrouped into batches of up to batch_size, in log order"""
+    payloads = []
+    batch = []
+    for record in read_events(log_dir):
+        batch.append(record["event"])
+        if len(batch) >= batch_size:
+            payloads.append({"events": batch})
+            batch = []
+    if batch:
+        payloads.append({"events": batch})
+    return payloads
+
+def load_mix(path):
+    """A JSON list of payloads"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def event_count(payload):
+    if isinstance(payload, dict) and isinstance(payload.get("events"), list):
+        return len(payload["events"])
+    return len(payload) if isinstance(payload, list) else 1
+
+def encode_request(host, port, path, payload):
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    head = (f"POST {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1')
+    return head + body
+
+async def read_response(reader):
+    """Status code of one response (bodies are always empty)"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1])
+
+async def worker(host, port, requests, queue, interval, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    next_send = time.monotonic()
+    try:
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
+            if interval:
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_send += interval
+
+            request, events = requests[index]
+            start = time.perf_counter()
+            writer.write(request)
+            status = await read_response(reader)
+            results["latencies"].append(time.perf_counter() - start)
+            if status == 204:
+                results["events"] += events
+            else:
+                results["errors"] += 1
+    finally:
+        writer.close()
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+async def run(host, port, path, payloads, total, connections, rate):
+    requests = [(encode_request(host, port, path, payload), event_count(payload)) for payload in payloads]
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i % len(requests))
+
+    results = {"events": 0, "errors": 0, "latencies": []}
+    interval = connections / rate if rate else 0
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(host, port, requests, queue, interval, results) for _ in range(connections)))
+    return results, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an event mix against the local event collector")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--path", default="/api/analytics")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--from-log", type=Path, help="replay events recorded in a collector log directory")
+    source.add_argument("--mix", type=Path, help="JSON file with a list of payloads to replay")
+    parser.add_argument("--requests", type=int, default=20000, help="total requests to send")
+    parser.add_argument("--connections", type=int, default=64, help="concurrent keep-alive connections")
+    parser.add_argument("--batch-size", type=int, default=10, help="max events per batch (built-in mix, --from-log)")
+    parser.add_argument("--rate", type=float, default=0, help="target requests per second (default: as fast as possible)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.from_log:
+        payloads = mix_from_log(args.from_log, args.batch_size)
+    elif args.mix:
+        payloads = load_mix(args.mix)
+    else:
+        payloads = builtin_mix(1000, args.batch_size, args.seed)
+    if not payloads:
+        print("❌ Nothing to replay")
+        raise SystemExit(1)
+
+    print("EVENT LOAD GENERATOR")
+    print("=" * 50)
+    print(f"{len(payloads)} distinct payloads, {args.requests} requests over {args.connections} connections\n")
+
+    results, elapsed = asyncio.run(run(args.host, args.port, args.path, payloads,
+                                       args.requests, args.connections, args.rate))
+    latencies = results["latencies"]
+
+    print(f"  requests   {len(latencies)} ({results['errors']} errors)")
+    print(f"  events     {results['events']}")
+    print(f"  elapsed    {elapsed:.2f}s")
+    print(f"  throughput {len(latencies) / elapsed:,.0f} req/s, {results['events'] / elapsed:,.0f} events/s")
+    print(f"  latency    p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print("\n" + "=" * 50)
+    print(f"{'✅' if not results['errors'] else '⚠️'} Done")
+
+if __name__ == "__main__":
+    main()
@@ -3,43 +3,44 @@ import os
 import re
 import glob
 
-# CORRECT ClickBank hop link format with YOUR affiliate ID
-# Format should be: https://AFFILIATE.VENDOR.hop.clickbank.net
+import affiliate_registry
+from page_pipeline import register_transform, CATEGORIES
 
-# Map of products to their VENDOR IDs (extracted from the cryptic hop links)
+# ClickBank vendor and current hop link for each category, from affiliates.json
 VENDOR_MAP = {
-    'business': {
-        'vendor': 'geniuswave',  # The Genius Wave
-        'old_link': 'https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net',
-        'new_link': 'https://bigbricey.geniuswave.hop.clickbank.net'
-    },
-    'everyday': {
-        'vendor': 'tedswoodpln',  # TedsWoodworking  
-        'old_link': 'https://16ee2y2mig1i7p30o9m9zj-i6b.hop.clickbank.net',
-        'new_link': 'https://bigbricey.tedswoodpln.hop.clickbank.net'
-    },
-    'content': {
-        'vendor': 'javaburn',  # Java Burn
-        'old_link': 'hop.clickbank.net/?vendor=javaburn&affiliate=bigbricey&lid=coffee2',
-        'new_link': 'https://bigbricey.javaburn.hop.clickbank.net'
-    },
-    'coding': {
-        'vendor': 'neuroenerg',  # Neuro Energizer
-        'old_link': 'hop.clickbank.net/?vendor=neuroenerg&affiliate=bigbricey',
-        'new_link': 'https://bigbricey.neuroenerg.hop.clickbank.net'
-    },
-    'relationships': {
-        'vendor': 'hissecret',  # His Secret Obsession
-        'old_link': 'https://3ed8fy7qkfql3rcikpuqefkt5g.hop.clickbank.net',
-        'new_link': 'https://bigbricey.hissecret.hop.clickbank.net'
-    },
-    'health': {
-        'vendor': 'sleeplean',  # SleepLean
-        'old_link': 'hop.clickbank.net/?vendor=sleeplean&affiliate=bigbricey',
-        'new_link': 'https://bigbricey.sleeplean.hop.clickbank.net'
+    category: {
+        'vendor': product['vendor'],
+        'new_link': product['link']
     }
+    for category, product in ((c, affiliate_registry.product_for_category(c)) for c in CATEGORIES)
+    if product and product.get('vendor')
 }
 
+def rewrite_clickbank_links(content, category):
+    """Point every ClickBank href in content at the category's hop link"""
+    vendor_info = VENDOR_MAP[category]
+    
+    # Replace any ClickBank links with the correct format
+    patterns = [
+        r'href="https?://[^"]*clickbank[^"]*"',
+        r'href="https?://hop\.clickbank\.net[^"]*"'
+    ]
+    
+    for pattern in patterns:
+        content = re.sub(
+            pattern,
+            f'href="{vendor_info["new_link"]}"',
+            content
+        )
+    
+    return content
+
+@register_transform("fix-affiliate-links", version=2, categories=list(VENDOR_MAP), markers=[b'clickbank'],
+                    data=affiliate_registry.load_registry())
+def fix_affiliate_links_transform(content, page):
+    """Pipeline transform: normalize ClickBank hop links for the page's category"""
+    return rewrite_clickbank_links(content, page["category"])
+
 def fix_links_in_file(filepath, category):
     """Fix affiliate links in a file"""
     try:
@@ -50,33 +51,11 @@ def fix_links_in_file(filepath, category):
             print(f"  ⚠️ No vendor mapping for category: {category}")
             return False
         
-        vendor_info = VENDOR_MAP[category]
-        
-        # Count how many links we're replacing
-        old_count = content.count('href="http')
-        
-        # Replace any ClickBank links with the correct format
-        patterns = [
-            r'href="https?://[^"]*clickbank[^"]*"',
-            r'href="https?://hop\.clickbank\.net[^"]*"'
-        ]
-        
-        replaced = False
-        for pattern in patterns:
-            if re.search(pattern, content):
-                # Replace with the correct link
-                new_content = re.sub(
-                    pattern,
-                    f'href="{vendor_info["new_link"]}"',
-                    content
-                )
-                if new_content != content:
-                    content = new_content
-                    replaced = True
+        new_content = rewrite_clickbank_links(content, category)
         
-        if replaced:
+        if new_content != content:
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+                f.write(new_content)
             print(f"  ✓ Fixed links in: {os.path.basename(filepath)}")
             return True
         else:
@@ -3,26 +3,16 @@ import os
 import re
 import glob
 
-# CORRECT LINKS FROM YOUR FIXED MASTER FILE
-CORRECT_LINKS = {
-    # The Genius Wave for Business (20 pages)
-    'https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net': 'https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net',  # This one is already correct
-    
-    # TedsWoodworking for Everyday (20 pages) - THIS IS THE BROKEN ONE
-    'https://7ca54ouacpux8odjs7-cmvvj54.hop.clickbank.net': 'https://6c0e5c0dqlol4ufpg9yjr0xl50.hop.clickbank.net',
-    
-    # Java Burn for Content (10 pages)
-    'https://13f75e6ccbuz3u04ikq7xmpr5b.hop.clickbank.net': 'https://13f75e6ccbuz3u04ikq7xmpr5b.hop.clickbank.net',  # Check if correct
-    
-    # Neuro Energizer for Coding (10 pages)
-    'https://9d76fn1hemvx3t0bresjkcmiki.hop.clickbank.net': 'https://9d76fn1hemvx3t0bresjkcmiki.hop.clickbank.net',  # Check if correct
-    
-    # His Secret Obsession for Relationships (10 pages)
-    'https://fdd98gwkrduu9o55wkx6seqd2w.hop.clickbank.net': 'https://fdd98gwkrduu9o55wkx6seqd2w.hop.clickbank.net',  # Check if correct
-    
-    # SleepLean for Health (8 pages)
-    'https://454019zerqrp6s2c-9sgr8eldl.hop.clickbank.net': 'https://454019zerqrp6s2c-9sgr8eldl.hop.clickbank.net',  # Check if correct
-}
+import affiliate_registry
+from migrate_links import compile_link_map, rewrite_links
+from page_pipeline import page_key
+import link_index
+
+# Old link -> current link for every product, from affiliates.json
+CORRECT_LINKS = affiliate_registry.link_migrations()
+
+# Every mapping compiled into one pattern, so each file is scanned once
+COMPILED_LINKS = compile_link_map(CORRECT_LINKS)
 
 def fix_links_in_file(filepath):
     """Replace old broken links with new working ones"""
@@ -30,17 +20,14 @@ def fix_links_in_file(filepath):
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        original_content = content
-        changes_made = False
+        # Replace every broken link in a single scan
+        content, hits = rewrite_links(content, COMPILED_LINKS)
         
-        # Replace each broken link with the correct one
-        for old_link, new_link in CORRECT_LINKS.items():
-            if old_link in content:
-                content = content.replace(old_link, new_link)
-                changes_made = True
-                print(f"  Fixed: {old_link[:30]}... → {new_link[:30]}...")
+        for old_link, count in hits.items():
+            new_link = CORRECT_LINKS[old_link]
+            print(f"  Fixed: {old_link[:30]}... → {new_link[:30]}... ({count}x)")
         
-        if changes_made:
+        if hits:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
             return True
@@ -49,35 +36,47 @@ def fix_links_in_file(filepath):
         print(f"  Error processing {filepath}: {e}")
         return False
 
-print("FIXING ALL CLICKBANK LINKS FROM MASTER FILE")
-print("=" * 50)
-
-# Find all HTML files
-categories = ['business', 'everyday', 'content', 'coding', 'relationships', 'health']
-total_fixed = 0
-
-for category in categories:
-    pattern = f'prompts/{category}/*.html'
-    files = glob.glob(pattern)
+def main():
+    print("FIXING ALL CLICKBANK LINKS FROM MASTER FILE")
+    print("=" * 50)
     
-    # Skip index.html files
-    prompt_files = [f for f in files if not f.endswith('index.html')]
+    # Find all HTML files
+    categories = ['business', 'everyday', 'content', 'coding', 'relationships', 'health']
+    total_fixed = 0
+    fixed_files = []
     
-    if prompt_files:
-        print(f"\n{category.upper()} ({len(prompt_files)} files):")
-        category_fixed = 0
+    # Only open the pages the link index says contain a broken link
+    index = link_index.load_or_build()
+    affected = link_index.pages_linking_to(index, [old for old, new in CORRECT_LINKS.items() if old != new])
+    
+    for category in categories:
+        pattern = f'prompts/{category}/*.html'
+        files = glob.glob(pattern)
         
-        for filepath in prompt_files:
-            filename = os.path.basename(filepath)
-            if fix_links_in_file(filepath):
-                print(f"  ✓ {filename}")
-                category_fixed += 1
-            else:
-                print(f"  - {filename} (no changes needed)")
+        # Skip index.html files
+        prompt_files = [f for f in files if not f.endswith('index.html') and page_key(f) in affected]
         
-        total_fixed += category_fixed
-        print(f"  Fixed {category_fixed} files in {category}")
+        if prompt_files:
+            print(f"\n{category.upper()} ({len(prompt_files)} files):")
+            category_fixed = 0
+            
+            for filepath in prompt_files:
+                filename = os.path.basename(filepath)
+                if fix_links_in_file(filepath):
+                    print(f"  ✓ {filename}")
+                    fixed_files.append(filepath)
+                    category_fixed += 1
+                else:
+                    print(f"  - {filename} (no changes needed)")
+            
+            total_fixed += category_fixed
+            print(f"  Fixed {category_fixed} files in {category}")
+    
+    link_index.update_link_index(fixed_files)
+    
+    print(f"\n{'=' * 50}")
+    print(f"TOTAL: Fixed {total_fixed} files")
+    print("\nNow the links should match your working master file!")
 
-print(f"\n{'=' * 50}")
-print(f"TOTAL: Fixed {total_fixed} files")
-print("\nNow the links should match your working master file!")
+if __name__ == "__main__":
+    main()
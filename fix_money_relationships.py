@@ -1,7 +1,50 @@
 #!/usr/bin/env python3
 import os
 import glob
-import re
+
+from page_pipeline import register_transform
+from page_sections import scan_sections, section_text, rewrite
+
+def move_affiliates_after_breadcrumb(content):
+    """Move the affiliate section right after the breadcrumb, without the fake discount claim"""
+    elements = scan_sections(content)
+    affiliates = [e for e in elements if e["kind"] == "affiliate" and "affiliate-section" in e["classes"]]
+    
+    if not affiliates:
+        return content
+    
+    affiliate = affiliates[0]
+    
+    # Remove the fake "67% OFF TODAY" claim and replace with honest messaging
+    affiliate_section = section_text(content, affiliate).replace('⚠️ 67% OFF TODAY - ', '')
+    
+    # Insert after the breadcrumb navigation, before the main content;
+    # fall back to the top of <main> when there is no breadcrumb
+    breadcrumb = next((e for e in elements if e["kind"] == "breadcrumb"), None)
+    main = next((e for e in elements if e["kind"] == "main"), None)
+    if breadcrumb:
+        insert_pos = breadcrumb["end"]
+    elif main:
+        insert_pos = main["inner_start"]
+    else:
+        return content
+    
+    # Already in place: only drop the discount claim
+    if not content[insert_pos:affiliate["start"]].strip():
+        return rewrite(content, remove=[affiliate], insert=[(affiliate["start"], affiliate_section)])
+    
+    # Remove every copy from its current location and insert the first one at the top
+    return rewrite(
+        content,
+        remove=affiliates,
+        insert=[(insert_pos, f'\n\n{affiliate_section}\n')]
+    )
+
+@register_transform("money-affiliates-to-top", categories=["money", "relationships"],
+                    markers=[b'affiliate-section'])
+def money_affiliates_to_top_transform(content, page):
+    """Pipeline transform: move Money/Relationships affiliates to the top"""
+    return move_affiliates_after_breadcrumb(content)
 
 def move_affiliates_to_top(filepath):
     """Move affiliate sections to TOP and fix the discount claims"""
@@ -9,81 +52,50 @@ def move_affiliates_to_top(filepath):
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Find the affiliate section
-        affiliate_pattern = r'<!-- Affiliate Recommendation -->.*?</section>'
-        affiliate_match = re.search(affiliate_pattern, content, re.DOTALL)
-        
-        if not affiliate_match:
+        new_content = move_affiliates_after_breadcrumb(content)
+        if new_content == content:
             return False
-            
-        affiliate_section = affiliate_match.group()
-        
-        # Remove the fake "67% OFF TODAY" claim and replace with honest messaging
-        affiliate_section = affiliate_section.replace('⚠️ 67% OFF TODAY - ', '')
-        
-        # Remove affiliate from current location
-        content = re.sub(affiliate_pattern, '', content, flags=re.DOTALL)
-        
-        # Find where to insert (after breadcrumb, before main content)
-        # Look for the end of breadcrumb navigation
-        insertion_patterns = [
-            r'</nav>\s*\n\s*<main>',  # After nav, before main
-            r'</nav>\s*\n\s*<!-- Prompt Display -->',  # After nav, before prompt
-            r'</nav>\s*\n\s*<article',  # After nav, before article
-        ]
-        
-        inserted = False
-        for pattern in insertion_patterns:
-            if re.search(pattern, content):
-                # Insert affiliate right after the nav
-                content = re.sub(
-                    pattern,
-                    f'</nav>\n\n{affiliate_section}\n\n<main>',
-                    content
-                )
-                inserted = True
-                break
-        
-        if not inserted:
-            # Fallback: try to insert after <main> opening
-            content = content.replace('<main>', f'<main>\n{affiliate_section}\n')
         
         # Write back
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+            f.write(new_content)
         return True
     except Exception as e:
         print(f"  Error: {e}")
         return False
 
-print("FIXING MONEY & RELATIONSHIPS AFFILIATES")
-print("=" * 50)
-print("Moving to TOP and removing fake discount claims")
-print()
-
-# Fix Money pages
-money_files = glob.glob('prompts/money/*.html')
-money_prompts = [f for f in money_files if not f.endswith('index.html')]
-
-print(f"MONEY CATEGORY ({len(money_prompts)} files):")
-fixed = 0
-for filepath in money_prompts:
-    if move_affiliates_to_top(filepath):
-        print(f"  ✓ {os.path.basename(filepath)}")
-        fixed += 1
-print(f"  Fixed {fixed} money pages\n")
-
-# Fix Relationships pages
-rel_files = glob.glob('prompts/relationships/*.html')
-rel_prompts = [f for f in rel_files if not f.endswith('index.html')]
-
-print(f"RELATIONSHIPS CATEGORY ({len(rel_prompts)} files):")
-fixed = 0
-for filepath in rel_prompts:
-    if move_affiliates_to_top(filepath):
-        print(f"  ✓ {os.path.basename(filepath)}")
-        fixed += 1
-print(f"  Fixed {fixed} relationship pages\n")
+def main():
+    print("FIXING MONEY & RELATIONSHIPS AFFILIATES")
+    print("=" * 50)
+    print("Moving to TOP and removing fake discount claims")
+    print()
+    
+    # Fix Money pages
+    money_files = glob.glob('prompts/money/*.html')
+    money_prompts = [f for f in money_files if not f.endswith('index.html')]
+    
+    print(f"MONEY CATEGORY ({len(money_prompts)} files):")
+    fixed = 0
+    for filepath in money_prompts:
+        if move_affiliates_to_top(filepath):
+            print(f"  ✓ {os.path.basename(filepath)}")
+            fixed += 1
+    print(f"  Fixed {fixed} money pages\n")
+    
+    # Fix Relationships pages
+    rel_files = glob.glob('prompts/relationships/*.html')
+    rel_prompts = [f for f in rel_files if not f.endswith('index.html')]
+    
+    print(f"RELATIONSHIPS CATEGORY ({len(rel_prompts)} files):")
+    fixed = 0
+    for filepath in rel_prompts:
+        if move_affiliates_to_top(filepath):
+            print(f"  ✓ {os.path.basename(filepath)}")
+            fixed += 1
+    print(f"  Fixed {fixed} relationship pages\n")
+    
+    print("=" * 50)
+    print("DONE! Affiliates moved to TOP with honest messaging")
 
-print("=" * 50)
-print("DONE! Affiliates moved to TOP with honest messaging")
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ Script to fix placeholder '#' links in Related Prompts sections
 import os
 import re
 
+from page_pipeline import register_transform, find_pages, run_pages, print_report, CATEGORIES
+
 # Mapping of titles to actual pages
 LINK_MAPPINGS = {
     # Business related
@@ -66,37 +68,47 @@ LINK_MAPPINGS = {
     'Study Schedule': '/prompts/everyday/meal-planner.html',
 }
 
+def link_related_placeholders(content):
+    """Point placeholder related-card links at real pages; returns (content, changes)"""
+    changes = []
+    
+    # Find all related cards with href="#"
+    pattern = r'<a href="#"([^>]*?)>(.*?)</a>'
+    
+    for match in re.finditer(pattern, content, re.DOTALL):
+        full_match = match.group(0)
+        inner_content = match.group(2)
+        
+        # Extract title from h3 tag
+        h3_match = re.search(r'<h3>([^<]+)</h3>', inner_content)
+        if h3_match:
+            title = h3_match.group(1).strip()
+            
+            # Check if we have a mapping
+            if title in LINK_MAPPINGS:
+                new_link = full_match.replace('href="#"', f'href="{LINK_MAPPINGS[title]}"')
+                content = content.replace(full_match, new_link)
+                changes.append(f"    ✅ {title} -> {LINK_MAPPINGS[title]}")
+    
+    return content, changes
+
+@register_transform("fix-related-links", markers=[b'<a href="#"'], data=LINK_MAPPINGS)
+def fix_related_links_transform(content, page):
+    """Pipeline transform: replace placeholder Related Prompts links"""
+    return link_related_placeholders(content)[0]
+
 def fix_file(filepath):
     """Fix placeholder links in a single file"""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        original_content = content
-        changes = []
-        
-        # Find all related cards with href="#"
-        pattern = r'<a href="#"([^>]*?)>(.*?)</a>'
-        
-        for match in re.finditer(pattern, content, re.DOTALL):
-            full_match = match.group(0)
-            inner_content = match.group(2)
-            
-            # Extract title from h3 tag
-            h3_match = re.search(r'<h3>([^<]+)</h3>', inner_content)
-            if h3_match:
-                title = h3_match.group(1).strip()
-                
-                # Check if we have a mapping
-                if title in LINK_MAPPINGS:
-                    new_link = full_match.replace('href="#"', f'href="{LINK_MAPPINGS[title]}"')
-                    content = content.replace(full_match, new_link)
-                    changes.append(f"    ✅ {title} -> {LINK_MAPPINGS[title]}")
+        new_content, changes = link_related_placeholders(content)
         
         # Write back if changes were made
-        if content != original_content:
+        if new_content != content:
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+                f.write(new_content)
             
             if changes:
                 print(f"\n📄 {os.path.basename(filepath)}:")
@@ -112,27 +124,18 @@ def fix_file(filepath):
 
 def main():
     """Process all HTML files in prompts directory"""
-    root_dir = r'C:\Users\bigbr\OneDrive\Desktop\claude_workspace\projects\FreePromptHub\prompts'
-    
     print("Fixing Related Prompts placeholder links...")
     print("=" * 50)
     
-    fixed_count = 0
-    checked_count = 0
+    pages = find_pages(categories=CATEGORIES, include_index=True)
+    results = run_pages(pages, ["fix-related-links"])
     
-    for root, dirs, files in os.walk(root_dir):
-        for file in files:
-            if file.endswith('.html'):
-                filepath = os.path.join(root, file)
-                checked_count += 1
-                
-                if fix_file(filepath):
-                    fixed_count += 1
+    fixed_count = print_report(results, ["fix-related-links"])
     
     print("\n" + "=" * 50)
     print(f"✅ Link Fix Complete!")
-    print(f"   Files checked: {checked_count}")
+    print(f"   Files checked: {len(results)}")
     print(f"   Files fixed: {fixed_count}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -4,55 +4,70 @@ Fix missing stylesheet links in all HTML files.
 Adds style.css and dark-mode.css to all pages that need them.
 """
 
-import os
-import re
 from pathlib import Path
 
-def add_stylesheets_to_html(file_path):
-    """Add missing stylesheet links to an HTML file."""
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+from page_pipeline import register_transform
+from page_sections import page_landmarks
+
+STYLE_CSS_LINK = '<link rel="stylesheet" href="/style.css">'
+DARK_MODE_CSS_LINK = '<link rel="stylesheet" href="/css/dark-mode.css">'
+
+def insert_stylesheets(content, page=None):
+    """Insert missing style.css / dark-mode.css links after the <title> tag."""
     
     # Check if style.css is already linked
-    has_style_css = '<link rel="stylesheet" href="/style.css">' in content
-    has_dark_mode_css = '<link rel="stylesheet" href="/css/dark-mode.css">' in content
+    has_style_css = STYLE_CSS_LINK in content
+    has_dark_mode_css = DARK_MODE_CSS_LINK in content
     
-    # If both stylesheets are present, skip this file
+    # If both stylesheets are present, nothing to do
     if has_style_css and has_dark_mode_css:
-        return False
+        return content
     
     # Find the position to insert stylesheets (after the last meta tag or before </head>)
     # Look for the title tag as a reference point
-    title_match = re.search(r'<title>.*?</title>', content)
+    insert_pos = page_landmarks(content, page)["title_end"]
+    if insert_pos == -1:
+        return content
     
-    if title_match:
-        # Insert after the title tag
-        insert_pos = title_match.end()
-        
-        # Build the stylesheet links to add
-        stylesheets = []
-        if not has_style_css:
-            stylesheets.append('    <link rel="stylesheet" href="/style.css">')
-        if not has_dark_mode_css:
-            stylesheets.append('    <link rel="stylesheet" href="/css/dark-mode.css">')
+    # Build the stylesheet links to add
+    stylesheets = []
+    if not has_style_css:
+        stylesheets.append('    ' + STYLE_CSS_LINK)
+    if not has_dark_mode_css:
+        stylesheets.append('    ' + DARK_MODE_CSS_LINK)
+    
+    # Add a newline before and after for proper formatting
+    stylesheet_block = '\n' + '\n'.join(stylesheets) + '\n'
+    
+    return content[:insert_pos] + stylesheet_block + content[insert_pos:]
+
+@register_transform("fix-stylesheets", done_markers=[STYLE_CSS_LINK.encode('utf-8'),
+                                                     DARK_MODE_CSS_LINK.encode('utf-8')])
+def fix_stylesheets_transform(content, page):
+    """Pipeline transform: add missing stylesheet links."""
+    return insert_stylesheets(content, page)
+
+def add_stylesheets_to_html(file_path):
+    """Add missing stylesheet links to an HTML file."""
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    new_content = insert_stylesheets(content)
+    
+    if new_content != content:
+        # Write the updated content back to the file
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(new_content)
         
-        if stylesheets:
-            # Add a newline before and after for proper formatting
-            stylesheet_block = '\n' + '\n'.join(stylesheets) + '\n'
-            
-            # Insert the stylesheets
-            new_content = content[:insert_pos] + stylesheet_block + content[insert_pos:]
-            
-            # Write the updated content back to the file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            
-            print(f"✅ Updated: {file_path}")
-            return True
-    else:
-        print(f"⚠️  Could not find title tag in: {file_path}")
+        print(f"✅ Updated: {file_path}")
+        return True
+    
+    if STYLE_CSS_LINK in content and DARK_MODE_CSS_LINK in content:
         return False
+    
+    print(f"⚠️  Could not find title tag in: {file_path}")
+    return False
 
 def main():
     """Process all HTML files in the project."""
@@ -4,118 +4,52 @@ Install affiliate links on all prompt pages
 Adds "Works Best With" sections with contextually matched affiliate products
 """
 
-import os
-import re
 from pathlib import Path
 
-# Affiliate product data from all_affiliates_master.md
-AFFILIATES = {
-    "billionaire-brain-wave": {
-        "name": "Billionaire Brain Wave",
-        "price": "$42.32",
-        "description": "Wealth manifestation audio program using theta brainwave technology",
-        "link": "https://3811aatcrgoq3zex8i6zidmb77.hop.clickbank.net",
-        "categories": ["money", "business"]
-    },
-    "mitolyn": {
-        "name": "Mitolyn",
-        "price": "$180.63", 
-        "description": "Advanced weight loss supplement targeting metabolism",
-        "link": "https://932bfl2gkkmw0w7cympk893t13.hop.clickbank.net",
-        "categories": ["health"]
-    },
-    "his-secret-obsession": {
-        "name": "His Secret Obsession",
-        "price": "$48.85",
-        "description": "Relationship guide for women about understanding men",
-        "link": "https://fdd98gwkrduu9o55wkx6seqd2w.hop.clickbank.net", 
-        "categories": ["relationships"]
-    },
-    "teds-woodworking": {
-        "name": "TedsWoodworking",
-        "price": "$61.36",
-        "description": "16,000 woodworking plans and project database",
-        "link": "https://7ca54ouacpxk8odjs7-cmvvj54.hop.clickbank.net",
-        "categories": ["everyday"]
-    },
-    "the-genius-wave": {
-        "name": "The Genius Wave", 
-        "price": "$46.91",
-        "description": "Brain enhancement audio for focus and creativity",
-        "link": "https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net",
-        "categories": ["business", "coding"]
-    },
-    "sleeplean": {
-        "name": "SleepLean",
-        "price": "$187.11",
-        "description": "Revolutionary weight loss while sleeping formula",
-        "link": "https://454019zerqrp6s2c-9sgr8eldl.hop.clickbank.net",
-        "categories": ["health"]
-    },
-    "hepatoburn": {
-        "name": "HepatoBurn", 
-        "price": "$167.00",
-        "description": "Liver health and metabolism booster supplement",
-        "link": "https://8352ejscimwv5p74jfehq03luy.hop.clickbank.net",
-        "categories": ["health"]
-    },
-    "neuro-energizer": {
-        "name": "Neuro Energizer",
-        "price": "$51.39", 
-        "description": "Brain enhancement and manifestation program",
-        "link": "https://9d76fn1hemvx3t0bresjkcmiki.hop.clickbank.net",
-        "categories": ["business", "coding"]
-    }
-}
+import affiliate_registry
+from page_pipeline import register_transform, find_pages, run_pages, print_report
+from page_sections import page_landmarks
+
+# Affiliate product data lives in affiliates.json (see affiliate_registry.py)
+AFFILIATES = affiliate_registry.products()
 
 def get_affiliate_for_category(category):
     """Get the best affiliate product for a category"""
-    category_mapping = {
-        "money": "billionaire-brain-wave",
-        "business": "the-genius-wave", 
-        "relationships": "his-secret-obsession",
-        "health": "mitolyn",  # Highest paying health product
-        "everyday": "teds-woodworking",
-        "coding": "the-genius-wave",
-        "content": "the-genius-wave",  # For content creators
-        "ai-art": "the-genius-wave"   # For creative work
-    }
-    
-    return category_mapping.get(category)
+    return affiliate_registry.product_key_for_category(category)
 
 def create_affiliate_section(affiliate_key):
-    """Create HTML for affiliate section"""
-    if not affiliate_key or affiliate_key not in AFFILIATES:
-        return ""
+    """Create HTML for affiliate section (rendered once per product and reused)"""
+    return affiliate_registry.recommendation_section(affiliate_key)
+
+def insert_affiliate_section(content, category, page=None):
+    """Insert the category's affiliate section before the footer (or </body>)"""
+    if 'affiliate-recommendation' in content:
+        return content
+    
+    affiliate_html = create_affiliate_section(get_affiliate_for_category(category))
+    if not affiliate_html:
+        return content
     
-    affiliate = AFFILIATES[affiliate_key]
+    # Find the insertion point (before the footer)
+    landmarks = page_landmarks(content, page)
+    insert_pos = landmarks["footer_start"]
     
-    return f'''
-        <!-- Affiliate Recommendation Section -->
-        <section class="affiliate-recommendation" style="margin: 40px 0; padding: 30px; background: var(--bg-secondary); border-radius: var(--radius); border-left: 4px solid var(--primary);">
-            <h3 style="color: var(--text-primary); margin-bottom: 15px; font-size: 1.3rem;">🚀 Works 10x Better With</h3>
-            <div class="affiliate-product" style="display: flex; align-items: center; gap: 20px; flex-wrap: wrap;">
-                <div class="product-info" style="flex: 1; min-width: 300px;">
-                    <h4 style="color: var(--primary); margin-bottom: 8px; font-size: 1.1rem;">{affiliate["name"]}</h4>
-                    <p style="color: var(--text-secondary); margin-bottom: 10px; line-height: 1.5;">{affiliate["description"]}</p>
-                    <div class="social-proof" style="font-size: 0.9rem; color: var(--text-tertiary); margin-bottom: 15px;">
-                        ⭐ Used by 47,000+ people | ✅ 60-day guarantee | 🔥 Limited-time bonus
-                    </div>
-                </div>
-                <div class="cta-section" style="text-align: center;">
-                    <div class="price-tag" style="background: var(--success); color: white; padding: 5px 15px; border-radius: 20px; font-weight: bold; margin-bottom: 15px; display: inline-block;">
-                        Save 70% Today!
-                    </div>
-                    <a href="{affiliate["link"]}" class="btn-affiliate" target="_blank" rel="noopener" style="display: inline-block; background: linear-gradient(135deg, var(--primary), var(--primary-dark)); color: white; padding: 12px 25px; border-radius: 25px; text-decoration: none; font-weight: 600; transition: all 0.3s ease; box-shadow: 0 4px 15px rgba(0,102,204,0.3);">
-                        Get Instant Access →
-                    </a>
-                    <div style="font-size: 0.8rem; color: var(--text-tertiary); margin-top: 8px;">
-                        ⏰ Offer expires in 24 hours
-                    </div>
-                </div>
-            </div>
-        </section>
-'''
+    if insert_pos != -1:
+        # Insert before footer
+        return content[:insert_pos] + affiliate_html + '\n    ' + content[insert_pos:]
+    
+    # Insert before closing body tag
+    body_close = landmarks["body_close_last"]
+    if body_close != -1:
+        return content[:body_close] + affiliate_html + '\n' + content[body_close:]
+    
+    return content
+
+@register_transform("install-affiliates", version=2, done_markers=[b'affiliate-recommendation'],
+                    data=affiliate_registry.load_registry())
+def install_affiliates_transform(content, page):
+    """Pipeline transform: add the "Works Best With" section to a prompt page"""
+    return insert_affiliate_section(content, page["category"], page)
 
 def install_affiliate_on_page(file_path, category):
     """Install affiliate link on a specific prompt page"""
@@ -135,25 +69,10 @@ def install_affiliate_on_page(file_path, category):
             print(f"No affiliate found for category: {category}")
             return False
         
-        # Create the affiliate section
-        affiliate_html = create_affiliate_section(affiliate_key)
-        
-        # Find the insertion point (before the footer)
-        footer_pattern = r'<footer[^>]*>'
-        footer_match = re.search(footer_pattern, content)
-        
-        if footer_match:
-            # Insert before footer
-            insert_pos = footer_match.start()
-            new_content = content[:insert_pos] + affiliate_html + '\n    ' + content[insert_pos:]
-        else:
-            # Insert before closing body tag
-            body_close = content.rfind('</body>')
-            if body_close != -1:
-                new_content = content[:body_close] + affiliate_html + '\n' + content[body_close:]
-            else:
-                print(f"Could not find insertion point in {file_path}")
-                return False
+        new_content = insert_affiliate_section(content, category)
+        if new_content == content:
+            print(f"Could not find insertion point in {file_path}")
+            return False
         
         # Write the updated content
         with open(file_path, 'w', encoding='utf-8') as f:
@@ -180,26 +99,19 @@ def main():
     # Process each category
     categories = ["money", "business", "relationships", "health", "everyday", "coding", "content", "ai-art"]
     
-    for category in categories:
-        category_dir = project_root / "prompts" / category
-        if not category_dir.exists():
-            continue
+    results = run_pages(find_pages(project_root, categories), ["install-affiliates"])
+    print_report(results, ["install-affiliates"])
+    
+    for result in results:
+        if result["applied"]:
+            updated_count += 1
             
-        print(f"\n📁 Processing {category} category...")
-        
-        # Find all HTML files except index
-        html_files = [f for f in category_dir.glob("*.html") if f.name != "index.html"]
-        
-        for html_file in html_files:
-            if install_affiliate_on_page(html_file, category):
-                updated_count += 1
-                
-                # Add to total value calculation
-                affiliate_key = get_affiliate_for_category(category)
-                if affiliate_key and affiliate_key in AFFILIATES:
-                    price_str = AFFILIATES[affiliate_key]["price"]
-                    price_value = float(price_str.replace("$", ""))
-                    total_value += price_value
+            # Add to total value calculation
+            affiliate_key = get_affiliate_for_category(result["category"])
+            if affiliate_key and affiliate_key in AFFILIATES:
+                price_str = AFFILIATES[affiliate_key]["price"]
+                price_value = float(price_str.replace("$", ""))
+                total_value += price_value
     
     print("\n" + "=" * 50)
     print(f"✅ Installation Complete!")
@@ -4,170 +4,35 @@
 (function() {
     'use strict';
 
-    // Affiliate offers database with contextual matching
-    const affiliateOffers = {
-        // Business & Productivity
-        business: {
-            primary: {
-                title: "🧠 The Genius Wave - Unlock Your Success",
-                description: "Activate your genius potential with this breakthrough audio program. Used by entrepreneurs to enhance focus and decision-making.",
-                cta: "Get The Genius Wave →",
-                url: "https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net",
-                color: "#4CAF50"
-            },
-            secondary: {
-                title: "🧠 The Genius Wave - Unlock Your Success",
-                description: "Activate your genius potential with this breakthrough audio program. Used by entrepreneurs to enhance focus and decision-making.",
-                cta: "Get The Genius Wave →",
-                url: "https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net",
-                color: "#2196F3"
-            }
-        },
-        
-        // Money & Finance
-        money: {
-            primary: {
-                title: "💰 Billionaire Brain Wave - Attract Wealth",
-                description: "Activate the neural pathways used by billionaires. This 7-minute audio program helps attract money and success.",
-                cta: "Get Billionaire Brain Wave →",
-                url: "https://3811aatcrgoq3zex8i6zidmb77.hop.clickbank.net",
-                color: "#FFD700"
-            },
-            secondary: {
-                title: "💰 Billionaire Brain Wave - Attract Wealth",
-                description: "Activate the neural pathways used by billionaires. This 7-minute audio program helps attract money and success.",
-                cta: "Get Billionaire Brain Wave →",
-                url: "https://3811aatcrgoq3zex8i6zidmb77.hop.clickbank.net",
-                color: "#00C853"
-            }
-        },
-        
-        // Health & Fitness
-        health: {
-            primary: {
-                title: "😴 SleepLean - Lose Weight While You Sleep",
-                description: "Revolutionary weight loss breakthrough that works while you sleep. Transform your body with this simple bedtime ritual.",
-                cta: "Get SleepLean →",
-                url: "https://454019zerqrp6s2c-9sgr8eldl.hop.clickbank.net",
-                color: "#FF5722"
-            },
-            secondary: {
-                title: "😴 SleepLean - Lose Weight While You Sleep",
-                description: "Revolutionary weight loss breakthrough that works while you sleep. Transform your body with this simple bedtime ritual.",
-                cta: "Get SleepLean →",
-                url: "https://454019zerqrp6s2c-9sgr8eldl.hop.clickbank.net",
-                color: "#FF9800"
-            }
-        },
-        
-        // Relationships & Dating
-        relationships: {
-            primary: {
-                title: "💕 His Secret Obsession - Make Him Devoted",
-                description: "Discover the secret words that make any man feel a deep emotional connection and overwhelming desire for you.",
-                cta: "Get His Secret Obsession →",
-                url: "https://fdd98gwkrduu9o55wkx6seqd2w.hop.clickbank.net",
-                color: "#E91E63"
-            },
-            secondary: {
-                title: "💕 His Secret Obsession - Make Him Devoted",
-                description: "Discover the secret words that make any man feel a deep emotional connection and overwhelming desire for you.",
-                cta: "Get His Secret Obsession →",
-                url: "https://fdd98gwkrduu9o55wkx6seqd2w.hop.clickbank.net",
-                color: "#9C27B0"
-            }
-        },
-        
-        // Content & Writing
-        content: {
-            primary: {
-                title: "☕ Java Burn 2.0 - Boost Your Metabolism",
-                description: "Turn your morning coffee into a fat-burning powerhouse. Boost metabolism and energy while you create content.",
-                cta: "Get Java Burn 2.0 →",
-                url: "https://13f75e6ccbuz3u04ikq7xmpr5b.hop.clickbank.net",
-                color: "#3F51B5"
-            },
-            secondary: {
-                title: "☕ Java Burn 2.0 - Boost Your Metabolism",
-                description: "Turn your morning coffee into a fat-burning powerhouse. Boost metabolism and energy while you create content.",
-                cta: "Get Java Burn 2.0 →",
-                url: "https://13f75e6ccbuz3u04ikq7xmpr5b.hop.clickbank.net",
-                color: "#673AB7"
-            }
-        },
-        
-        // Coding & Tech
-        coding: {
-            primary: {
-                title: "🧠 Neuro Energizer - Enhanced Focus",
-                description: "Supercharge your coding sessions with enhanced mental clarity and sustained focus. Perfect for programmers.",
-                cta: "Get Neuro Energizer →",
-                url: "https://9d76fn1hemvx3t0bresjkcmiki.hop.clickbank.net",
-                color: "#00BCD4"
-            },
-            secondary: {
-                title: "🧠 Neuro Energizer - Enhanced Focus",
-                description: "Supercharge your coding sessions with enhanced mental clarity and sustained focus. Perfect for programmers.",
-                cta: "Get Neuro Energizer →",
-                url: "https://9d76fn1hemvx3t0bresjkcmiki.hop.clickbank.net",
-                color: "#009688"
-            }
-        },
-        
-        // Everyday Life
-        everyday: {
-            primary: {
-                title: "🔨 TedsWoodworking - 16,000 Plans",
-                description: "Get instant access to 16,000 woodworking plans and projects. Turn your everyday DIY ideas into reality.",
-                cta: "Get TedsWoodworking →",
-                url: "https://6c0e5c0dqlol4ufpg9yjr0xl50.hop.clickbank.net",
-                color: "#795548"
-            },
-            secondary: {
-                title: "🔨 TedsWoodworking - 16,000 Plans",
-                description: "Get instant access to 16,000 woodworking plans and projects. Turn your everyday DIY ideas into reality.",
-                cta: "Get TedsWoodworking →",
-                url: "https://6c0e5c0dqlol4ufpg9yjr0xl50.hop.clickbank.net",
-                color: "#607D8B"
-            }
-        },
-        
-        // AI Art & Creative
-        'ai-art': {
-            primary: {
-                title: "🧠 The Genius Wave - Creative Breakthrough",
-                description: "Unlock your creative potential with this 7-minute brain training audio. Perfect for artists and designers.",
-                cta: "Get The Genius Wave →",
-                url: "https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net",
-                color: "#FF4081"
-            },
-            secondary: {
-                title: "🧠 The Genius Wave - Creative Breakthrough",
-                description: "Unlock your creative potential with this 7-minute brain training audio. Perfect for artists and designers.",
-                cta: "Get The Genius Wave →",
-                url: "https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net",
-                color: "#7C4DFF"
-            }
-        },
-        
-        // Universal (fallback)
-        universal: {
-            primary: {
-                title: "🧠 The Genius Wave - Universal Success",
-                description: "Activate your genius potential with this breakthrough 7-minute audio program. Works for any goal or aspiration.",
-                cta: "Get The Genius Wave →",
-                url: "https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net",
-                color: "#4CAF50"
-            },
-            secondary: {
-                title: "💰 Billionaire Brain Wave - Universal Wealth",
-                description: "Activate the neural pathways used by billionaires. This 7-minute audio program helps attract success in any area.",
-                cta: "Get Billionaire Brain Wave →",
-                url: "https://3811aatcrgoq3zex8i6zidmb77.hop.clickbank.net",
-                color: "#2196F3"
-            }
-        }
-    };
+    // Offers come from the shared affiliate registry (affiliates.json), the same
+    // catalogue the page build scripts use, so links cannot drift between them
+    const REGISTRY_URL = '/affiliates.json';
+
+    // category -> { primary, secondary } offers, filled in once the registry loads
+    let affiliateOffers = {};
+
+    function buildOffers(registry) {
+        const offers = {};
+        Object.keys(registry.categories).forEach(category => {
+            const entry = registry.categories[category];
+            offers[category] = {};
+            Object.keys(entry.offers || {}).forEach(position => {
+                const offer = entry.offers[position];
+                const product = registry.products[offer.product || entry.product];
+                offers[category][position] = Object.assign({}, offer, { url: product.link });
+            });
+        });
+        return offers;
+    }
+
+    function loadOffers() {
+        return fetch(REGISTRY_URL)
+            .then(response => response.ok ? response.json() : Promise.reject(new Error(`HTTP ${response.status}`)))
+            .then(buildOffers);
+    }
+
+    // Start fetching right away so the registry loads while the page parses
+    const offersReady = loadOffers();
 
     class AffiliateManager {
         constructor() {
@@ -312,8 +177,8 @@
         }
 
         insertAffiliateBlocks() {
-            // Skip if already has affiliate sections
-            if (document.querySelector('.affiliate-section')) {
+            // Skip if already has affiliate sections (or slots still being filled)
+            if (document.querySelector('.affiliate-section, .affiliate-slot')) {
                 return;
             }
             
@@ -573,12 +438,19 @@
     `;
     document.head.appendChild(style);
 
-    // Initialize when DOM is ready
+    // Initialize when DOM is ready and the registry has loaded
+    function start() {
+        offersReady
+            .then(offers => {
+                affiliateOffers = offers;
+                window.affiliateManager = new AffiliateManager();
+            })
+            .catch(error => console.warn('Affiliate registry unavailable:', error));
+    }
+
     if (document.readyState === 'loading') {
-        document.addEventListener('DOMContentLoaded', () => {
-            window.affiliateManager = new AffiliateManager();
-        });
+        document.addEventListener('DOMContentLoaded', start);
     } else {
-        window.affiliateManager = new AffiliateManager();
+        start();
     }
 })();
\ No newline at end of file
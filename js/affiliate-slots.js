@@ -0,0 +1,50 @@
+// Affiliate Slots for FreePromptHub
+// Fills .affiliate-slot placeholders with the cached per-category fragments
+// built by affiliate_fragments.py
+
+(function() {
+    'use strict';
+
+    // "category/kind" -> content-hashed fragment URL; revalidated on every load
+    const FRAGMENT_INDEX_URL = '/fragments/affiliates.json';
+
+    // One request per fragment URL, however many slots share it
+    const fragmentRequests = {};
+
+    function fetchJSON(url) {
+        return fetch(url)
+            .then(response => response.ok ? response.json() : Promise.reject(new Error(`HTTP ${response.status}`)));
+    }
+
+    function loadFragment(url) {
+        if (!fragmentRequests[url]) {
+            fragmentRequests[url] = fetchJSON(url);
+        }
+        return fragmentRequests[url];
+    }
+
+    function fillSlots() {
+        const slots = document.querySelectorAll('.affiliate-slot[data-slot][data-category]');
+        if (!slots.length) {
+            return;
+        }
+
+        fetchJSON(FRAGMENT_INDEX_URL)
+            .then(index => Promise.all(Array.from(slots).map(slot => {
+                const url = index[`${slot.dataset.category}/${slot.dataset.slot}`];
+                if (!url) {
+                    return null;
+                }
+                return loadFragment(url).then(fragment => {
+                    slot.outerHTML = fragment.html;
+                });
+            })))
+            .catch(error => console.warn('Affiliate fragments unavailable:', error));
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', fillSlots);
+    } else {
+        fillSlots();
+    }
+})();
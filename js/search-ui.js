@@ -1,5 +1,14 @@
 // Enhanced Search UI for homepage and all pages
 (function() {
+    // Titles, descriptions and phrases in the index are plain text, unescaped by search_index.py
+    function escapeHtml(str) {
+        return String(str).replace(/[&<>"']/g, ch => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})[ch]);
+    }
+
+    function escapeRegex(str) {
+        return str.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+    }
+
     // Wait for search engine to load
     function initSearchUI() {
         if (typeof searchEngine === 'undefined' || !window.FPH || !window.FPH.searchEngine) {
@@ -48,16 +57,22 @@
                 return;
             }
 
-            // Search with the engine
-            const results = searchEngine.search(query, {
-                maxResults: 8,
-                sortBy: 'relevance'
-            });
+            // Search with the engine, once the shards the query needs are loaded
+            Promise.all([
+                searchEngine.searchAsync(query, {
+                    maxResults: 8,
+                    sortBy: 'relevance'
+                }),
+                searchEngine.loadSuggestions(query)
+            ]).then(([results]) => {
+                // A newer keystroke has taken over
+                if (currentQuery !== query) return;
 
-            // Get suggestions too
-            const suggestions = searchEngine.getSuggestions(query, 3);
+                // Get suggestions too
+                const suggestions = searchEngine.getSuggestions(query, 3);
 
-            displayResults(results, suggestions, query);
+                displayResults(results, suggestions, query);
+            });
         }
 
         // Display search results
@@ -67,7 +82,7 @@
             if (results.length === 0 && suggestions.length === 0) {
                 container.innerHTML = `
                     <div style="padding: 20px; text-align: center; color: #6c757d;">
-                        <p>No prompts found for "${query}"</p>
+                        <p>No prompts found for "${escapeHtml(query)}"</p>
                         <a href="/search?q=${encodeURIComponent(query)}" style="color: #0066CC;">
                             Try advanced search →
                         </a>
@@ -97,9 +112,9 @@
                     <div style="padding: 10px 15px; border-bottom: 1px solid #dee2e6;">
                         <div style="font-size: 0.85rem; color: #6c757d; margin-bottom: 8px;">Suggestions</div>
                         ${suggestions.map(s => `
-                            <a href="#" onclick="event.preventDefault(); document.getElementById('searchBar').value='${s}'; return false;" 
+                            <a href="#" class="search-suggestion" data-suggestion="${escapeHtml(s)}"
                                style="display: inline-block; margin: 2px; padding: 4px 10px; background: #f8f9fa; border-radius: 15px; color: #333; text-decoration: none; font-size: 0.9rem;">
-                                ${s}
+                                ${escapeHtml(s)}
                             </a>
                         `).join('')}
                     </div>
@@ -116,7 +131,7 @@
                     const highlightedDesc = highlightTerms(result.description, query);
                     
                     html += `
-                        <a href="${result.id}" class="search-result-item" style="
+                        <a href="${escapeHtml(result.id)}" class="search-result-item" style="
                             display: block;
                             padding: 12px 20px;
                             text-decoration: none;
@@ -134,10 +149,10 @@
                                     </div>
                                     <div style="margin-top: 6px;">
                                         <span style="display: inline-block; padding: 2px 8px; background: #e3f2fd; color: #1976d2; border-radius: 10px; font-size: 0.8rem; margin-right: 8px;">
-                                            ${result.category}
+                                            ${escapeHtml(result.category)}
                                         </span>
                                         <span style="font-size: 0.8rem; color: #9e9e9e;">
-                                            ${result.difficulty} • ${result.timeToComplete}
+                                            ${escapeHtml([result.difficulty, result.timeToComplete].filter(Boolean).join(' • '))}
                                         </span>
                                     </div>
                                 </div>
@@ -162,7 +177,7 @@
                         ${searchEngine.getPopularSearches().slice(0, 5).map(term => `
                             <a href="/search?q=${encodeURIComponent(term)}" 
                                style="display: inline-block; margin: 2px; padding: 4px 10px; background: white; border: 1px solid #dee2e6; border-radius: 15px; color: #333; text-decoration: none; font-size: 0.85rem;">
-                                ${term}
+                                ${escapeHtml(term)}
                             </a>
                         `).join('')}
                     </div>
@@ -170,22 +185,24 @@
             `;
 
             container.innerHTML = html;
+            container.querySelectorAll('.search-suggestion').forEach(link => {
+                link.addEventListener('click', event => {
+                    event.preventDefault();
+                    searchBar.value = link.dataset.suggestion;
+                });
+            });
             showResults();
         }
 
-        // Highlight search terms in text
+        // Highlight search terms in text; split on the raw text, then escape each part
         function highlightTerms(text, query) {
-            const terms = query.toLowerCase().split(' ');
-            let highlighted = text;
-            
-            terms.forEach(term => {
-                if (term.length > 2) {
-                    const regex = new RegExp(`(${term})`, 'gi');
-                    highlighted = highlighted.replace(regex, '<mark style="background: #fff59d; padding: 0 2px;">$1</mark>');
-                }
-            });
-            
-            return highlighted;
+            const terms = query.toLowerCase().split(' ').filter(term => term.length > 2);
+            if (!terms.length) return escapeHtml(text);
+
+            const regex = new RegExp(`(${terms.map(escapeRegex).join('|')})`, 'gi');
+            return text.split(regex).map((part, i) => i % 2
+                ? `<mark style="background: #fff59d; padding: 0 2px;">${escapeHtml(part)}</mark>`
+                : escapeHtml(part)).join('');
         }
 
         // Show/hide results
@@ -265,50 +282,53 @@
         // Add trending section below search on homepage
         const categoriesSection = document.querySelector('.categories');
         if (categoriesSection && !document.querySelector('.trending-prompts')) {
-            const trending = searchEngine.getTrendingPrompts(5);
+            searchEngine.ready.then(() => {
+                const trending = searchEngine.getTrendingPrompts(5);
+                if (!trending.length || document.querySelector('.trending-prompts')) return;
             
-            const trendingSection = document.createElement('section');
-            trendingSection.className = 'trending-prompts';
-            trendingSection.style.cssText = `
-                margin: 40px auto;
-                max-width: 800px;
-                text-align: center;
-            `;
+                const trendingSection = document.createElement('section');
+                trendingSection.className = 'trending-prompts';
+                trendingSection.style.cssText = `
+                    margin: 40px auto;
+                    max-width: 800px;
+                    text-align: center;
+                `;
             
-            trendingSection.innerHTML = `
-                <h3 style="margin-bottom: 20px; color: #212529; font-size: 1.8rem; font-weight: 700;">🔥 Trending Prompts</h3>
-                <div style="display: flex; gap: 10px; justify-content: center; flex-wrap: wrap;">
-                    ${trending.map(prompt => `
-                        <a href="${prompt.id}" style="
-                            display: inline-flex;
-                            align-items: center;
-                            gap: 8px;
-                            padding: 10px 20px;
-                            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                            color: white !important;
-                            border-radius: 25px;
-                            text-decoration: none;
-                            font-size: 1rem;
-                            font-weight: 600;
-                            transition: transform 0.2s, box-shadow 0.2s;
-                            box-shadow: 0 4px 12px rgba(102, 126, 234, 0.3);
-                            opacity: 1 !important;
-                        " onmouseover="this.style.transform='scale(1.05)'; this.style.boxShadow='0 6px 20px rgba(102, 126, 234, 0.4)'" onmouseout="this.style.transform='scale(1)'; this.style.boxShadow='0 4px 12px rgba(102, 126, 234, 0.3)'">
-                            <span>${prompt.title}</span>
-                            <span style="background: rgba(255,255,255,0.25); padding: 2px 8px; border-radius: 12px; font-size: 0.85rem; font-weight: 700;">
-                                ${prompt.popularity}%
-                            </span>
+                trendingSection.innerHTML = `
+                    <h3 style="margin-bottom: 20px; color: #212529; font-size: 1.8rem; font-weight: 700;">🔥 Trending Prompts</h3>
+                    <div style="display: flex; gap: 10px; justify-content: center; flex-wrap: wrap;">
+                        ${trending.map(prompt => `
+                            <a href="${escapeHtml(prompt.id)}" style="
+                                display: inline-flex;
+                                align-items: center;
+                                gap: 8px;
+                                padding: 10px 20px;
+                                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                                color: white !important;
+                                border-radius: 25px;
+                                text-decoration: none;
+                                font-size: 1rem;
+                                font-weight: 600;
+                                transition: transform 0.2s, box-shadow 0.2s;
+                                box-shadow: 0 4px 12px rgba(102, 126, 234, 0.3);
+                                opacity: 1 !important;
+                            " onmouseover="this.style.transform='scale(1.05)'; this.style.boxShadow='0 6px 20px rgba(102, 126, 234, 0.4)'" onmouseout="this.style.transform='scale(1)'; this.style.boxShadow='0 4px 12px rgba(102, 126, 234, 0.3)'">
+                                <span>${escapeHtml(prompt.title)}</span>
+                                <span style="background: rgba(255,255,255,0.25); padding: 2px 8px; border-radius: 12px; font-size: 0.85rem; font-weight: 700;">
+                                    ${prompt.popularity}%
+                                </span>
+                            </a>
+                        `).join('')}
+                    </div>
+                    <div style="margin-top: 25px;">
+                        <a href="/search" style="color: #0066CC; text-decoration: none; font-size: 1rem; font-weight: 600;">
+                            Explore all prompts with advanced search →
                         </a>
-                    `).join('')}
-                </div>
-                <div style="margin-top: 25px;">
-                    <a href="/search" style="color: #0066CC; text-decoration: none; font-size: 1rem; font-weight: 600;">
-                        Explore all prompts with advanced search →
-                    </a>
-                </div>
-            `;
+                    </div>
+                `;
             
-            categoriesSection.parentNode.insertBefore(trendingSection, categoriesSection);
+                categoriesSection.parentNode.insertBefore(trendingSection, categoriesSection);
+            });
         }
     }
 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Site-wide hyperlink index for FreePromptHub.
+Maps every href on the site to the pages (and byte offsets) that contain it,
+so link fixes only open the pages that actually use the old URL.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from page_pipeline import CACHE_DIR, PROJECT_ROOT, find_site_pages, page_key
+
+LINK_INDEX_PATH = CACHE_DIR / "link_index.json"
+
+HREF_PATTERN = re.compile(rb'href="([^"]*)"')
+
+def extract_links(data):
+    """{url: [byte offsets]} for every href in a page's raw bytes"""
+    links = {}
+    for match in HREF_PATTERN.finditer(data):
+        url = match.group(1).decode('utf-8', errors='replace')
+        links.setdefault(url, []).append(match.start(1))
+    return links
+
+def empty_index():
+    """pages: key -> size, mtime, hash, links; urls: url -> {page key: [offsets]}"""
+    return {"pages": {}, "urls": {}}
+
+def load_link_index(path=LINK_INDEX_PATH):
+    """Load the persisted index; None if it has never been built"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_link_index(index, path=LINK_INDEX_PATH):
+    """Write the index atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, path)
+
+def remove_page(index, key):
+    """Drop a page and all of its postings from the index"""
+    entry = index["pages"].pop(key, None)
+    if entry is None:
+        return
+    for url in entry["links"]:
+        postings = index["urls"].get(url, {})
+        postings.pop(key, None)
+        if not postings:
+            index["urls"].pop(url, None)
+
+def index_page(index, key, path):
+    """(Re-)index one page from disk"""
+    remove_page(index, key)
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    stat = os.stat(path)
+
+    links = extract_links(data)
+    index["pages"][key] = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "hash": hashlib.sha256(data).hexdigest(),
+        "links": sorted(links),
+    }
+    for url, offsets in links.items():
+        index["urls"].setdefault(url, {})[key] = offsets
+
+def refresh_link_index(index, pages, root=PROJECT_ROOT):
+    """Bring the index up to date with the given pages.
+
+    Pages are compared by stat only; just the new or modified ones are read.
+    Indexed pages that no longer exist on disk are dropped. Returns the number of
+    pages re-indexed.
+    """
+    seen = set()
+    reindexed = 0
+
+    for page in pages:
+        key = page_key(page["path"], root)
+        seen.add(key)
+        stat = os.stat(page["path"])
+        entry = index["pages"].get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            continue
+        index_page(index, key, page["path"])
+        reindexed += 1
+
+    for key in set(index["pages"]) - seen:
+        if not (Path(root) / key).exists():
+            remove_page(index, key)
+
+    return reindexed
+
+def load_or_build(root=PROJECT_ROOT, path=LINK_INDEX_PATH):
+    """Load the index, refresh it against the site and persist any changes"""
+    index = load_link_index(path) or empty_index()
+    if refresh_link_index(index, find_site_pages(root), root) or not Path(path).exists():
+        save_link_index(index, path)
+    return index
+
+def update_link_index(paths, root=PROJECT_ROOT, path=LINK_INDEX_PATH):
+    """Re-index pages a script just rewrote; no-op until the index exists"""
+    index = load_link_index(path)
+    if index is None or not paths:
+        return
+
+    for page_path in paths:
+        index_page(index, page_key(page_path, root), page_path)
+    save_link_index(index, path)
+
+def pages_linking_to(index, fragments):
+    """{page key: [matching urls]} for pages with an href containing any fragment"""
+    pages = {}
+    for url, postings in index["urls"].items():
+        if any(fragment in url for fragment in fragments):
+            for key in postings:
+                pages.setdefault(key, []).append(url)
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the site-wide hyperlink index")
+    parser.add_argument("urls", nargs="*", help="list the pages linking to these URLs (substring match)")
+    parser.add_argument("--rebuild", action="store_true", help="discard the index and rebuild it from scratch")
+    args = parser.parse_args()
+
+    if args.rebuild and LINK_INDEX_PATH.exists():
+        LINK_INDEX_PATH.unlink()
+
+    index = load_or_build()
+
+    if not args.urls:
+        print(f"✅ Link index: {len(index['urls'])} unique URLs across {len(index['pages'])} pages")
+        print(f"   Saved to {LINK_INDEX_PATH}")
+        return
+
+    matches = pages_linking_to(index, args.urls)
+    for key in sorted(matches):
+        for url in matches[key]:
+            offsets = ", ".join(str(offset) for offset in index["urls"][url][key])
+            print(f"  {key}  {url}  @ {offsets}")
+    print(f"\n{len(matches)} page(s) link to {', '.join(args.urls)}")
+
+if __name__ == "__main__":
+    main()
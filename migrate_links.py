@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Migrate affiliate links across all prompt pages in one scan per page.
+Compiles the whole old -> new mapping table into a single alternation regex,
+so the cost per page stays flat no matter how many vendor links change.
+"""
+
+import argparse
+import json
+import re
+from collections import Counter
+
+import affiliate_registry
+from page_pipeline import register_transform, find_pages, page_key, CATEGORIES
+import link_index
+
+# Old hop link -> replacement, applied by the migrate-links transform (from affiliates.json)
+LINK_MIGRATIONS = affiliate_registry.link_migrations()
+
+def compile_link_map(mapping):
+    """Compile an old -> new link table into (regex, table); None if nothing changes"""
+    links = {old: new for old, new in mapping.items() if old != new}
+    if not links:
+        return None
+
+    # Longest first so a link never loses to one of its own prefixes; only whole
+    # URLs match, so a longer URL that starts with an old link is left alone
+    alternation = '|'.join(re.escape(old) for old in sorted(links, key=len, reverse=True))
+    return re.compile(rf'(?<![^"\'\s(>])(?:{alternation})(?=["\'\s<)]|$)'), links
+
+def rewrite_links(content, compiled):
+    """Rewrite every mapped link in one scan; returns (content, Counter of old link hits)"""
+    hits = Counter()
+    if compiled is None:
+        return content, hits
+
+    pattern, links = compiled
+
+    def replace(match):
+        old = match.group(0)
+        hits[old] += 1
+        return links[old]
+
+    return pattern.sub(replace, content), hits
+
+_DEFAULT_MIGRATION = compile_link_map(LINK_MIGRATIONS)
+
+@register_transform("migrate-links", version=2, markers=[old.encode('utf-8') for old in LINK_MIGRATIONS],
+                    data=affiliate_registry.load_registry())
+def migrate_links_transform(content, page):
+    """Pipeline transform: apply LINK_MIGRATIONS to the page"""
+    return rewrite_links(content, _DEFAULT_MIGRATION)[0]
+
+def load_link_map(path):
+    """Read an old -> new mapping from a JSON object file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def affected_pages(pages, old_links):
+    """Narrow pages down to those the link index says contain an old link"""
+    index = link_index.load_or_build()
+    keys = link_index.pages_linking_to(index, old_links)
+    return [page for page in pages if page_key(page["path"]) in keys]
+
+def migrate_pages(pages, compiled, dry_run=False):
+    """Rewrite links across pages; returns (changed paths, Counter of link hits)"""
+    total_hits = Counter()
+    changed = []
+
+    for page in pages:
+        try:
+            with open(page["path"], 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            new_content, hits = rewrite_links(content, compiled)
+            if not hits:
+                continue
+
+            if not dry_run:
+                with open(page["path"], 'w', encoding='utf-8') as f:
+                    f.write(new_content)
+            total_hits.update(hits)
+            changed.append(page["path"])
+        except Exception as e:
+            print(f"  ✗ Error processing {page['path']}: {e}")
+
+    return changed, total_hits
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite old affiliate links to new ones across all prompt pages")
+    parser.add_argument("--map", dest="map_path", help="JSON file of old -> new links (default: LINK_MIGRATIONS)")
+    parser.add_argument("--category", action="append", dest="categories", help="limit to a category (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="report hits without writing files")
+    parser.add_argument("--no-index", action="store_true", help="scan every page instead of querying the link index")
+    args = parser.parse_args()
+
+    mapping = load_link_map(args.map_path) if args.map_path else LINK_MIGRATIONS
+    compiled = compile_link_map(mapping)
+
+    print("MIGRATING AFFILIATE LINKS")
+    print("=" * 50)
+
+    if compiled is None:
+        print("No link changes in the mapping - nothing to do")
+        return
+
+    print(f"{len(compiled[1])} link(s) to migrate\n")
+
+    pages = list(find_pages(categories=args.categories or CATEGORIES))
+    if not args.no_index:
+        pages = affected_pages(pages, list(compiled[1]))
+        print(f"Link index: {len(pages)} page(s) contain an old link\n")
+
+    changed, hits = migrate_pages(pages, compiled, args.dry_run)
+    if not args.dry_run:
+        link_index.update_link_index(changed)
+
+    for old, new in compiled[1].items():
+        print(f"  {hits[old]:>4} × {old}")
+        print(f"         → {new}")
+
+    print("\n" + "=" * 50)
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"✅ {verb} {len(changed)} files ({sum(hits.values())} links)")
+
+if __name__ == "__main__":
+    main()
@@ -3,66 +3,74 @@ import os
 import re
 import glob
 
+from page_pipeline import register_transform
+from page_sections import scan_sections, first_child, section_text, rewrite
+
+def add_urgency(affiliate_section):
+    """Prefix the affiliate headings with the urgency text, once"""
+    # Find all h2 tags in the affiliate section and add urgency
+    updated_affiliate = re.sub(
+        r'(<h2[^>]*>)(.*?)(</h2>)',
+        r'\1⚠️ 67% OFF TODAY - \2\3',
+        affiliate_section
+    )
+    
+    # Remove any existing urgency text to avoid duplication
+    return re.sub(
+        r'⚠️ 67% OFF TODAY - ⚠️ 67% OFF TODAY - ',
+        '⚠️ 67% OFF TODAY - ',
+        updated_affiliate
+    )
+
+def move_affiliate_section(content):
+    """Move the affiliate section after the breadcrumb; None if there is nowhere to put it"""
+    elements = scan_sections(content)
+    affiliates = [e for e in elements if e["kind"] == "affiliate" and "affiliate-section" in e["classes"]]
+    
+    if not affiliates:
+        return content
+    
+    affiliate = affiliates[0]
+    updated_affiliate = add_urgency(section_text(content, affiliate))
+    
+    # The top of the page is the start of main's container, right after the breadcrumb
+    main = next((e for e in elements if e["kind"] == "main"), None)
+    container = first_child(elements, main, "div") if main else None
+    if not container:
+        return None
+    
+    # Already at the top: only refresh the heading
+    if not content[container["inner_start"]:affiliate["start"]].strip():
+        return rewrite(content, remove=[affiliate], insert=[(affiliate["start"], updated_affiliate)])
+    
+    # Remove every copy from its current location and insert the first one at the top
+    return rewrite(
+        content,
+        remove=affiliates,
+        insert=[(container["inner_start"], '\n                ' + updated_affiliate + '\n')]
+    )
+
+@register_transform("move-affiliates-to-top", version=2, categories=['business', 'everyday', 'content', 'coding', 'relationships', 'health'],
+                    markers=[b'affiliate-section'])
+def move_affiliates_to_top_transform(content, page):
+    """Pipeline transform: move the affiliate section to the top of the page"""
+    new_content = move_affiliate_section(content)
+    return content if new_content is None else new_content
+
 def move_affiliate_to_top(filepath):
     """Move affiliate section to top of page after breadcrumb"""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Find and extract the affiliate section
-        affiliate_pattern = r'(<section class="affiliate-section"[^>]*>.*?</section>)'
-        affiliate_match = re.search(affiliate_pattern, content, re.DOTALL)
-        
-        if not affiliate_match:
-            print(f"  - No affiliate section in: {os.path.basename(filepath)}")
+        new_content = move_affiliate_section(content)
+        if new_content is None:
+            print(f"  ✗ Could not find insertion point in: {os.path.basename(filepath)}")
             return False
         
-        # Extract the affiliate section
-        affiliate_section = affiliate_match.group(1)
-        
-        # Remove affiliate from current location
-        content_without_affiliate = re.sub(affiliate_pattern, '', content, flags=re.DOTALL)
-        
-        # Add urgency to the heading in affiliate section
-        # Find all h2 tags in the affiliate section and add urgency
-        updated_affiliate = re.sub(
-            r'(<h2[^>]*>)(.*?)(</h2>)',
-            r'\1⚠️ 67% OFF TODAY - \2\3',
-            affiliate_section
-        )
-        
-        # Remove any existing urgency text to avoid duplication
-        updated_affiliate = re.sub(
-            r'⚠️ 67% OFF TODAY - ⚠️ 67% OFF TODAY - ',
-            '⚠️ 67% OFF TODAY - ',
-            updated_affiliate
-        )
-        
-        # Find position after breadcrumb navigation
-        # Breadcrumb ends with </nav> and main content starts
-        breadcrumb_pattern = r'(</nav>\s*<main[^>]*>\s*<div[^>]*>)'
-        
-        if re.search(breadcrumb_pattern, content_without_affiliate):
-            # Insert affiliate right after the breadcrumb navigation
-            new_content = re.sub(
-                breadcrumb_pattern,
-                r'\1\n                ' + updated_affiliate + '\n',
-                content_without_affiliate,
-                count=1
-            )
-        else:
-            # Alternative pattern if structure is different
-            main_pattern = r'(<main[^>]*>\s*<div[^>]*>)'
-            if re.search(main_pattern, content_without_affiliate):
-                new_content = re.sub(
-                    main_pattern,
-                    r'\1\n                ' + updated_affiliate + '\n',
-                    content_without_affiliate,
-                    count=1
-                )
-            else:
-                print(f"  ✗ Could not find insertion point in: {os.path.basename(filepath)}")
-                return False
+        if new_content == content:
+            print(f"  - Nothing to move in: {os.path.basename(filepath)}")
+            return False
         
         # Write the updated content
         with open(filepath, 'w', encoding='utf-8') as f:
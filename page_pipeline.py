@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Single-pass page pipeline for the FreePromptHub maintenance scripts.
+Loads each prompt page once, runs an ordered chain of registered transforms
+against the in-memory HTML and writes every file at most once.
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+import page_sections
+import render_cache
+
+PROJECT_ROOT = Path(__file__).parent
+
+# Local build state (manifest, indexes, caches); not committed
+CACHE_DIR = PROJECT_ROOT / ".pipeline-cache"
+MANIFEST_PATH = CACHE_DIR / "manifest.json"
+LANDMARKS_PATH = CACHE_DIR / "landmarks.json"
+
+CATEGORIES = ["money", "business", "relationships", "health", "everyday", "coding", "content", "ai-art"]
+
+# Scripts that register transforms when imported
+TRANSFORM_MODULES = [
+    "standardize_headers",
+    "fix_stylesheets",
+    "fix_all_affiliate_links",
+    "remove_fake_discounts",
+    "install_affiliates",
+    "move_affiliates_to_top",
+    "fix_related_links",
+    "setup_analytics",
+    "migrate_links",
+    "fix_money_relationships",
+    "remove_competitor_mentions",
+    "add_coding_affiliates",
+    "affiliate_fragments",
+]
+
+# Order used when no transforms are named on the command line
+RELEASE_CHAIN = [
+    "standardize-headers",
+    "fix-stylesheets",
+    "install-affiliates",
+    "remove-fake-discounts",
+]
+
+# Directories never treated as site pages
+SKIP_DIRS = {"site-v2", "node_modules", ".git"}
+
+# name -> {"name", "func", "categories", "version", "data_hash", "markers", "done_markers"}
+TRANSFORMS = {}
+
+def register_transform(name, categories=None, version=1, markers=None, done_markers=None, data=None):
+    """Register func(content, page) -> content as a named pipeline transform.
+
+    Bump version whenever the transform's output changes so incremental
+    runs re-apply it to pages that were processed by an older version.
+
+    data is whatever the transform reads besides the page (a link table,
+    the affiliate registry); its fingerprint is part of the transform's
+    effective version, so an edit to it re-applies the transform on
+    incremental runs and misses the render cache without a manual bump.
+
+    markers and done_markers are byte strings checked against the raw file
+    before it is decoded: a page can only change if it contains one of the
+    markers, and is already done if it contains every done marker.
+    """
+    def decorator(func):
+        TRANSFORMS[name] = {
+            "name": name,
+            "func": func,
+            "categories": categories,
+            "version": version,
+            "data_hash": render_cache.fingerprint(data)[:16] if data is not None else None,
+            "markers": tuple(markers) if markers is not None else None,
+            "done_markers": tuple(done_markers or ()),
+        }
+        return func
+    return decorator
+
+def load_transforms():
+    """Import every transform module so its transforms are registered"""
+    for module_name in TRANSFORM_MODULES:
+        importlib.import_module(module_name)
+    return TRANSFORMS
+
+def resolve_chain(names):
+    """Turn a list of transform names into registry entries, keeping order"""
+    load_transforms()
+    unknown = [name for name in names if name not in TRANSFORMS]
+    if unknown:
+        raise ValueError(f"Unknown transform(s): {', '.join(unknown)}")
+    return [TRANSFORMS[name] for name in names]
+
+def find_pages(root=PROJECT_ROOT, categories=CATEGORIES, include_index=False):
+    """Yield page dicts for every prompt page in the given categories"""
+    root = Path(root)
+    for category in categories:
+        category_dir = root / "prompts" / category
+        if not category_dir.exists():
+            continue
+        for html_file in sorted(category_dir.glob("*.html")):
+            if html_file.name == "index.html" and not include_index:
+                continue
+            yield {"path": html_file, "category": category}
+
+def find_site_pages(root=PROJECT_ROOT):
+    """Yield page dicts for every HTML file on the site"""
+    root = Path(root)
+    for html_file in sorted(root.rglob("*.html")):
+        parts = html_file.relative_to(root).parts
+        if SKIP_DIRS.intersection(parts):
+            continue
+        category = parts[1] if len(parts) > 2 and parts[0] == "prompts" else None
+        yield {"path": html_file, "category": category}
+
+def applies_to(transform, category):
+    return not transform["categories"] or category in transform["categories"]
+
+def may_change(data, transform):
+    """False when the transform's byte markers prove it would leave data untouched"""
+    if transform["done_markers"] and all(data.find(marker) != -1 for marker in transform["done_markers"]):
+        return False
+    if transform["markers"] is not None and not any(data.find(marker) != -1 for marker in transform["markers"]):
+        return False
+    return True
+
+def chain_may_change(data, category, chain):
+    """Byte-level pre-filter: True if any transform in the chain could edit this page.
+
+    Transforms only see the text earlier ones produced, so if none of them
+    can fire on the original bytes the whole chain is a no-op.
+    """
+    return any(applies_to(t, category) and may_change(data, t) for t in chain)
+
+def map_file(f):
+    """Read-only memory map of an open file (empty bytes for an empty file)"""
+    if os.fstat(f.fileno()).st_size == 0:
+        return nullcontext(b'')
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def page_may_change(path, names, category=None):
+    """Check a page's raw bytes against the named transforms' markers without decoding it"""
+    chain = resolve_chain(names)
+    with open(path, 'rb') as f, map_file(f) as data:
+        return any((category is None or applies_to(t, category)) and may_change(data, t) for t in chain)
+
+def apply_chain(content, page, chain):
+    """Run the chain over one page's HTML, returning (content, applied names)"""
+    applied = []
+    for transform in chain:
+        if not applies_to(transform, page["category"]):
+            continue
+        new_content = transform["func"](content, page)
+        if new_content != content:
+            content = new_content
+            applied.append(transform["name"])
+    return content, applied
+
+def _load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_json(data, path):
+    """Write JSON atomically so an interrupted run never corrupts it"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the incremental manifest: page key -> size, mtime, hash, transforms"""
+    return _load_json(path)
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    _save_json(manifest, path)
+
+_landmark_cache = None
+
+def landmark_cache():
+    """page key -> {"hash", "landmarks"}, loaded once per process"""
+    global _landmark_cache
+    if _landmark_cache is None:
+        _landmark_cache = _load_json(LANDMARKS_PATH)
+    return _landmark_cache
+
+def page_key(path, root=PROJECT_ROOT):
+    """Manifest key for a page: its path relative to the project root"""
+    return Path(os.path.relpath(path, root)).as_posix()
+
+def transform_version(transform):
+    """Effective version of a transform: its registered version plus the fingerprint of its data"""
+    if transform["data_hash"]:
+        return f"{transform['version']}-{transform['data_hash']}"
+    return transform["version"]
+
+def chain_versions(chain):
+    """{transform name: effective version} for the transforms in a chain"""
+    return {transform["name"]: transform_version(transform) for transform in chain}
+
+def is_current(entry, versions):
+    """True if every transform in versions already ran on this content at that version"""
+    done = entry.get("transforms", {})
+    return all(done.get(name) == version for name, version in versions.items())
+
+def _stat_matches(entry, stat):
+    return entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime_ns
+
+def process_page(page, chain, dry_run=False, entry=None):
+    """Read a page once, transform it in memory and write it back if it changed.
+
+    Returns (applied transform names, new manifest entry, skipped) where
+    skipped means the content was already current for this chain or its
+    bytes ruled out every transform, so it was never decoded.
+    """
+    versions = chain_versions(chain)
+
+    with open(page["path"], 'rb') as f, map_file(f) as data:
+        digest = hashlib.sha256(data).hexdigest()
+
+        # Touched but not edited since the last run: nothing new to apply
+        same_content = entry is not None and entry.get("hash") == digest
+        if same_content and is_current(entry, versions):
+            stat = os.stat(page["path"])
+            return [], dict(entry, size=stat.st_size, mtime=stat.st_mtime_ns), True
+
+        # No transform's markers match: the chain is a no-op, skip the decode
+        if not chain_may_change(data, page["category"], chain):
+            stat = os.stat(page["path"])
+            transforms = dict(entry.get("transforms", {}), **versions) if same_content else versions
+            return [], {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": digest, "transforms": transforms}, True
+
+        # Same page, same bytes, same transforms and data: reuse the output of an earlier run
+        render_key = render_cache.fingerprint("page", page_key(page["path"]), page["category"], digest, versions)
+        hit = render_cache.shared_cache().get(render_key)
+        reused = render_cache.shared_cache().read(hit["output"]) if hit else None
+        if reused is None:
+            original = data[:].decode('utf-8')
+
+    if reused is not None:
+        if dry_run:
+            return hit["meta"], None, False
+        with open(page["path"], 'wb') as f:
+            f.write(reused)
+        stat = os.stat(page["path"])
+        return hit["meta"], {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": hit["output"],
+                             "transforms": versions, "render": (render_key, hit["output"], hit["size"], hit["meta"]),
+                             "cached": True}, False
+
+    # Seed the splice points from the sidecar cache when this exact content was seen before
+    cached = landmark_cache().get(page_key(page["path"]))
+    landmarks = cached["landmarks"] if cached and cached["hash"] == digest else None
+    page = dict(page, source=original, landmarks=landmarks)
+
+    content, applied = apply_chain(original, page, chain)
+
+    if applied:
+        if dry_run:
+            return applied, None, False
+        data = content.encode('utf-8')
+        digest = render_cache.shared_cache().store(data)
+        with open(page["path"], 'wb') as f:
+            f.write(data)
+        transforms = versions
+    else:
+        transforms = dict(entry.get("transforms", {}), **versions) if same_content else versions
+
+    stat = os.stat(page["path"])
+    new_entry = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "hash": digest,
+        "transforms": transforms,
+    }
+    if applied:
+        new_entry["render"] = (render_key, digest, len(data), applied)
+
+    # The chain splices at landmarks: cache them for the text just written
+    # so the next run can jump straight to the splice points
+    if page["landmarks"] is not None and page["landmarks"] is not landmarks:
+        if page["source"] is not content:
+            page_sections.page_landmarks(content, page)
+        new_entry["landmarks"] = page["landmarks"]
+
+    return applied, new_entry, False
+
+def _run_task(task):
+    """Worker entry point: process one page and never raise"""
+    page, names, dry_run, entry = task
+    result = {"path": page["path"], "category": page["category"], "applied": [],
+              "skipped": False, "entry": None, "error": None}
+    try:
+        result["applied"], result["entry"], result["skipped"] = process_page(page, resolve_chain(names), dry_run, entry)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def default_jobs():
+    """One worker per available core"""
+    return os.cpu_count() or 1
+
+def run_pages(pages, names, jobs=None, dry_run=False, manifest=None, root=PROJECT_ROOT):
+    """Run the named transforms over pages across a process pool.
+
+    Results come back in page order as dicts with path, category, applied
+    transform names, skipped and any error message. When a manifest dict
+    is given the run is incremental: pages whose size and mtime match an
+    entry that already saw every transform in the chain are skipped without
+    being read, and the manifest is updated in place with the new state.
+    Pages whose exact bytes already went through this chain get the earlier
+    output from the render cache instead of being transformed again.
+    """
+    chain = resolve_chain(names)  # fail fast on unknown names before starting workers
+    versions = chain_versions(chain)
+    results = []
+    tasks = []
+
+    for page in pages:
+        entry = None
+        if manifest is not None:
+            entry = manifest.get(page_key(page["path"], root))
+            if entry and is_current(entry, versions) and _stat_matches(entry, os.stat(page["path"])):
+                results.append({"path": page["path"], "category": page["category"], "applied": [],
+                                "skipped": True, "entry": None, "error": None})
+                continue
+        results.append(None)
+        tasks.append((page, names, dry_run, entry))
+
+    jobs = min(jobs or default_jobs(), len(tasks)) or 1
+    if jobs == 1:
+        processed = [_run_task(task) for task in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            processed = list(executor.map(_run_task, tasks, chunksize=chunksize))
+
+    landmarks_changed = False
+    cache = render_cache.shared_cache()
+    processed = iter(processed)
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = result = next(processed)
+        entry = result["entry"]
+        if entry is None:
+            continue
+        if "landmarks" in entry:
+            landmark_cache()[page_key(result["path"])] = {"hash": entry["hash"], "landmarks": entry.pop("landmarks")}
+            landmarks_changed = True
+        if "render" in entry:
+            # Workers add blobs; the index is only written from this process
+            cache.put(*entry.pop("render"))
+        result["cached"] = entry.pop("cached", False)
+        if manifest is not None:
+            manifest[page_key(result["path"], root)] = entry
+
+    if landmarks_changed and not dry_run:
+        _save_json(landmark_cache(), LANDMARKS_PATH)
+    if not dry_run:
+        cache.save()
+
+    return results
+
+def run_pipeline(names, root=PROJECT_ROOT, categories=CATEGORIES, include_index=False, dry_run=False,
+                 jobs=None, incremental=False):
+    """Run the named transforms over every prompt page; returns run_pages results"""
+    manifest = load_manifest() if incremental else None
+    results = run_pages(find_pages(root, categories, include_index), names, jobs, dry_run, manifest, root)
+    if not dry_run:
+        if manifest is not None:
+            save_manifest(manifest)
+
+        # Keep the hyperlink index in step with the pages this run rewrote
+        # (imported here because link_index builds on this module)
+        import link_index
+        link_index.update_link_index([r["path"] for r in results if r["applied"] and not r["error"]], root)
+    return results
+
+def print_report(results, names):
+    """Print per-transform page counts and errors; returns the number of changed pages"""
+    counts = {name: 0 for name in names}
+    changed = 0
+    skipped = 0
+    reused = 0
+    errors = []
+    for result in results:
+        if result.get("skipped"):
+            skipped += 1
+        if result.get("cached"):
+            reused += 1
+        if result["error"]:
+            errors.append(result)
+        if result["applied"]:
+            changed += 1
+        for name in result["applied"]:
+            counts[name] += 1
+
+    for name in names:
+        print(f"  {name}: {counts[name]} pages")
+
+    if skipped:
+        print(f"  (skipped {skipped} pages with nothing to change)")
+    if reused:
+        print(f"  ({reused} pages reused from the render cache)")
+
+    if errors:
+        print(f"\n  ✗ {len(errors)} errors:")
+        for result in errors:
+            print(f"    {result['path']}: {result['error']}")
+
+    return changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Run maintenance transforms over all prompt pages in one pass")
+    parser.add_argument("transforms", nargs="*", help="transform names, applied in order (default: release chain)")
+    parser.add_argument("--category", action="append", dest="categories", help="limit to a category (repeatable)")
+    parser.add_argument("--include-index", action="store_true", help="also process category index.html pages")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing files")
+    parser.add_argument("--jobs", type=int, default=default_jobs(), help="worker processes (default: one per core)")
+    parser.add_argument("--incremental", action="store_true", help="skip pages unchanged since the last run (uses the manifest)")
+    parser.add_argument("--list", action="store_true", help="list registered transforms and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, transform in load_transforms().items():
+            scope = ", ".join(transform["categories"]) if transform["categories"] else "all categories"
+            print(f"  {name} v{transform_version(transform)} ({scope})")
+        return
+
+    names = args.transforms or RELEASE_CHAIN
+
+    print("RUNNING PAGE PIPELINE")
+    print("=" * 50)
+    print(f"Transforms: {' → '.join(names)}\n")
+
+    results = run_pipeline(
+        names,
+        categories=args.categories or CATEGORIES,
+        include_index=args.include_index,
+        dry_run=args.dry_run,
+        jobs=args.jobs,
+        incremental=args.incremental,
+    )
+
+    changed = print_report(results, names)
+
+    print("\n" + "=" * 50)
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"✅ {verb} {changed}/{len(results)} pages in a single pass")
+
+if __name__ == "__main__":
+    # Transform modules register against the importable page_pipeline module,
+    # so run from it rather than from __main__'s copy of the registry
+    import page_pipeline
+    page_pipeline.main()
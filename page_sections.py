@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Structural section locator for FreePromptHub pages.
+A small streaming tokenizer walks a page once, matches open/close tags with
+a stack (so nested sections stay intact) and returns a section map of the
+landmarks the maintenance scripts edit: header, breadcrumb nav, main,
+article, related prompts, affiliate blocks and footer. Offsets are indexes
+into the page text, ready for slicing.
+"""
+
+import re
+
+# Elements whose nesting is tracked; everything else is skipped over
+BLOCK_TAGS = {"header", "nav", "main", "article", "section", "aside", "footer", "div"}
+
+# Elements whose body is raw text and must not be scanned for tags
+RAW_TEXT_TAGS = {"script", "style"}
+
+# Section class -> kind
+SECTION_KINDS = {
+    "affiliate-section": "affiliate",
+    "affiliate-recommendation": "affiliate",
+    "related-prompts": "related-prompts",
+    "works-best-with": "works-best-with",
+    "tools-grid": "tools-grid",
+}
+
+# Comments that label the block right after them as an affiliate section
+AFFILIATE_COMMENT = "Affiliate Recommendation"
+
+TAG_PATTERN = re.compile(r'<!--|<(/?)([a-zA-Z][a-zA-Z0-9-]*)([^>]*)>')
+CLASS_PATTERN = re.compile(r'class="([^"]*)"')
+RAW_TEXT_END = {tag: re.compile(rf'</{tag}\s*>', re.IGNORECASE) for tag in RAW_TEXT_TAGS}
+
+def classify(tag, classes):
+    """Landmark kind for an element, or None for plain structure"""
+    if tag in ("header", "main", "article", "footer"):
+        return tag
+    if tag == "nav" and "breadcrumb" in classes:
+        return "breadcrumb"
+    if tag == "section":
+        for name in classes:
+            if name in SECTION_KINDS:
+                return SECTION_KINDS[name]
+    return None
+
+def scan_sections(content):
+    """Tokenize content in one linear pass; returns every tracked element in document order.
+
+    Each element is a dict with kind, tag, classes, start/end (outer range)
+    and inner_start/inner_end (between the open and close tags). Affiliate
+    sections start at their "<!-- Affiliate Recommendation -->" comment when
+    it directly precedes them.
+    """
+    elements = []
+    stack = []
+    pos = 0
+    last_comment = None  # (start, end, text) of a comment not yet followed by a tag
+
+    while True:
+        match = TAG_PATTERN.search(content, pos)
+        if not match:
+            break
+
+        if match.group(0) == '<!--':
+            close = content.find('-->', match.end())
+            end = len(content) if close == -1 else close + 3
+            last_comment = (match.start(), end, content[match.end():close])
+            pos = end
+            continue
+
+        closing, tag, attrs = match.group(1), match.group(2).lower(), match.group(3)
+        pos = match.end()
+
+        if not closing and tag in RAW_TEXT_TAGS:
+            raw_end = RAW_TEXT_END[tag].search(content, pos)
+            pos = raw_end.end() if raw_end else len(content)
+            last_comment = None
+            continue
+
+        if tag not in BLOCK_TAGS:
+            continue
+
+        if closing:
+            # Pop back to the matching open tag, closing anything left unclosed
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i]["tag"] == tag:
+                    for element in stack[i + 1:]:
+                        element["inner_end"] = element["end"] = match.start()
+                    stack[i]["inner_end"] = match.start()
+                    stack[i]["end"] = match.end()
+                    del stack[i:]
+                    break
+        elif not attrs.rstrip().endswith('/'):
+            class_match = CLASS_PATTERN.search(attrs)
+            classes = class_match.group(1).split() if class_match else []
+            element = {
+                "kind": classify(tag, classes),
+                "tag": tag,
+                "classes": classes,
+                "start": match.start(),
+                "end": None,
+                "inner_start": match.end(),
+                "inner_end": None,
+            }
+            if (element["kind"] == "affiliate" and last_comment
+                    and AFFILIATE_COMMENT in last_comment[2]
+                    and not content[last_comment[1]:match.start()].strip()):
+                element["start"] = last_comment[0]
+            elements.append(element)
+            stack.append(element)
+
+        last_comment = None
+
+    for element in stack:
+        element["inner_end"] = element["end"] = len(content)
+
+    return elements
+
+def compute_landmarks(content):
+    """Offsets of the splice points the maintenance scripts insert at (-1 when missing)"""
+    title_match = re.search(r'<title>.*?</title>', content)
+    footer_match = re.search(r'<footer[^>]*>', content)
+    landmarks = {
+        "title_end": title_match.end() if title_match else -1,
+        "head_close": content.find('</head>'),
+        "body_close": content.find('</body>'),
+        "body_close_last": content.rfind('</body>'),
+        "footer_start": footer_match.start() if footer_match else -1,
+        "breadcrumb_end": -1,
+        "main_inner_start": -1,
+    }
+
+    for element in scan_sections(content):
+        if element["kind"] == "breadcrumb" and landmarks["breadcrumb_end"] == -1:
+            landmarks["breadcrumb_end"] = element["end"]
+        elif element["kind"] == "main" and landmarks["main_inner_start"] == -1:
+            landmarks["main_inner_start"] = element["inner_start"]
+
+    return landmarks
+
+def page_landmarks(content, page=None):
+    """Landmark offsets for content, reusing the page's cached copy for this exact text.
+
+    The pipeline seeds page["landmarks"] from its sidecar cache when the file's
+    hash matches; once a transform changes the text they are recomputed.
+    """
+    if page is not None and page.get("landmarks") is not None and content is page.get("source"):
+        return page["landmarks"]
+
+    landmarks = compute_landmarks(content)
+    if page is not None:
+        page["source"], page["landmarks"] = content, landmarks
+    return landmarks
+
+def section_map(content):
+    """{kind: [sections]} for the landmark sections of a page"""
+    sections = {}
+    for element in scan_sections(content):
+        if element["kind"]:
+            sections.setdefault(element["kind"], []).append(element)
+    return sections
+
+def first_child(elements, parent, tag=None):
+    """First tracked element directly inside parent (optionally with the given tag)"""
+    for element in elements:
+        if element["start"] < parent["inner_start"]:
+            continue
+        if element["start"] >= parent["inner_end"]:
+            break
+        if tag is None or element["tag"] == tag:
+            return element
+        return None
+    return None
+
+def section_text(content, section):
+    return content[section["start"]:section["end"]]
+
+def insert_at(content, pos, text):
+    """Splice text into content at pos"""
+    return content[:pos] + text + content[pos:]
+
+def rewrite(content, remove=(), insert=()):
+    """Apply removals and insertions in a single pass over content.
+
+    remove is a list of sections to cut out; insert is a list of
+    (offset, text) pairs, with offsets into the original content. An
+    insertion that falls inside a removed section lands where it started.
+    """
+    cuts = []
+    for section in sorted(remove, key=lambda s: s["start"]):
+        if cuts and section["start"] < cuts[-1][1]:
+            continue  # nested inside a section that is already being removed
+        cuts.append((section["start"], section["end"]))
+
+    edits = [(start, end, '') for start, end in cuts]
+    for pos, text in insert:
+        for start, end in cuts:
+            if start < pos < end:
+                pos = start
+        edits.append((pos, pos, text))
+    edits.sort(key=lambda edit: (edit[0], edit[1] - edit[0]))
+
+    pieces = []
+    pos = 0
+    for start, end, text in edits:
+        pieces.append(content[pos:start])
+        pieces.append(text)
+        pos = max(pos, end)
+    pieces.append(content[pos:])
+    return ''.join(pieces)
+
+def remove_sections(content, sections):
+    """Cut the given sections out of content"""
+    return rewrite(content, remove=sections)
+
+def move_section(content, section, pos, text=None):
+    """Move a section to pos (an offset in the original content).
+
+    text replaces the section's own markup at its new location, letting
+    callers rewrite the block while moving it.
+    """
+    if text is None:
+        text = section_text(content, section)
+    return rewrite(content, remove=[section], insert=[(pos, text)])
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Prompt content store for FreePromptHub.
+Each prompt lives in its own Markdown file under prompt-content/<category>/
+with a small front matter block (title, description, keywords) and the
+prompt text as the body. prompt-content/index.json lists every entry, so
+callers can enumerate the catalogue without opening a single prompt file;
+an entry's file is read only when that prompt is rendered.
+"""
+
+import argparse
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+STORE_DIR = Path(__file__).parent / "prompt-content"
+INDEX_PATH = STORE_DIR / "index.json"
+
+FRONT_MATTER_FIELDS = ("title", "description", "keywords")
+FRONT_MATTER_FENCE = "---"
+
+def parse_prompt_file(text):
+    """{title, description, keywords, prompt} from a front-matter Markdown document"""
+    lines = text.split('\n')
+    if not lines or lines[0].strip() != FRONT_MATTER_FENCE:
+        raise ValueError("missing front matter")
+
+    entry = {}
+    for i, line in enumerate(lines[1:], start=1):
+        if line.strip() == FRONT_MATTER_FENCE:
+            body = lines[i + 1:]
+            break
+        key, sep, value = line.partition(':')
+        if sep:
+            entry[key.strip()] = value.strip()
+    else:
+        raise ValueError("unterminated front matter")
+
+    missing = [field for field in FRONT_MATTER_FIELDS if field not in entry]
+    if missing:
+        raise ValueError(f"front matter lacks {', '.join(missing)}")
+    entry["prompt"] = '\n'.join(body).strip('\n')
+    return entry
+
+def format_prompt_file(entry):
+    """Front-matter Markdown document for a {title, description, keywords, prompt} entry"""
+    header = [f"{field}: {entry[field]}" for field in FRONT_MATTER_FIELDS]
+    return '\n'.join([FRONT_MATTER_FENCE, *header, FRONT_MATTER_FENCE, '', entry["prompt"], ''])
+
+def prompt_path(category, filename, store_dir=STORE_DIR):
+    return Path(store_dir) / category / f"{filename}.md"
+
+@lru_cache(maxsize=None)
+def load_index(path=INDEX_PATH):
+    """{"category/filename": {"title", "path"}} - read once per process"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)["prompts"]
+
+def entries(categories=None):
+    """(category, filename) for every prompt in the index, in index order"""
+    for key in load_index():
+        category, filename = key.split('/', 1)
+        if categories is None or category in categories:
+            yield category, filename
+
+def load_prompt(category, filename, store_dir=STORE_DIR):
+    """Read and parse one prompt's file"""
+    with open(prompt_path(category, filename, store_dir), 'r', encoding='utf-8') as f:
+        return parse_prompt_file(f.read())
+
+def save_prompt(category, filename, entry, store_dir=STORE_DIR):
+    path = prompt_path(category, filename, store_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(format_prompt_file(entry))
+    return path
+
+def build_index(store_dir=STORE_DIR, path=INDEX_PATH):
+    """Rescan the store and rewrite index.json; returns the number of entries"""
+    store_dir = Path(store_dir)
+    prompts = {}
+    for file_path in sorted(store_dir.glob("*/*.md")):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            entry = parse_prompt_file(f.read())
+        category, filename = file_path.parent.name, file_path.stem
+        prompts[f"{category}/{filename}"] = {
+            "title": entry["title"],
+            "path": file_path.relative_to(store_dir).as_posix(),
+        }
+
+    tmp_path = Path(path).with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"prompts": prompts}, f, indent=1, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    load_index.cache_clear()
+    return len(prompts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or list the prompt content index")
+    parser.add_argument("--list", action="store_true", help="list indexed prompts instead of rebuilding")
+    args = parser.parse_args()
+
+    if args.list:
+        for key, entry in load_index().items():
+            print(f"  {key:<48} {entry['title']}")
+        return
+
+    print("INDEXING PROMPT CONTENT")
+    print("=" * 50)
+    count = build_index()
+    print(f"✅ Indexed {count} prompts in {INDEX_PATH.relative_to(STORE_DIR.parent)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,36 @@
 #!/usr/bin/env python3
 import os
-import re
 import glob
 
+from page_pipeline import register_transform
+from page_sections import section_map, remove_sections
+
+def strip_competitor_sections(content):
+    """Remove the 'Works Best With' section (and any tools grid alongside it)"""
+    sections = section_map(content)
+    
+    # Only pages with a Works Best With section carry competitor mentions
+    if 'works-best-with' not in sections:
+        return content
+    
+    # Also remove any "Related Prompts" tool grids that might exist
+    return remove_sections(content, sections['works-best-with'] + sections.get('tools-grid', []))
+
+@register_transform("remove-competitor-mentions", markers=[b'works-best-with'])
+def remove_competitor_mentions_transform(content, page):
+    """Pipeline transform: drop sections that send traffic to competitors"""
+    return strip_competitor_sections(content)
+
 def remove_works_best_section(filepath):
     """Remove the 'Works Best With' section from HTML files"""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Pattern to match the Works Best With section
-        # It typically starts with <section class="works-best-with"> and ends with </section>
-        pattern = r'<section class="works-best-with">.*?</section>'
+        new_content = strip_competitor_sections(content)
         
-        # Check if the section exists
-        if re.search(pattern, content, re.DOTALL):
-            # Remove the section
-            new_content = re.sub(pattern, '', content, flags=re.DOTALL)
-            
-            # Also remove any "Related Prompts" sections that might exist
-            pattern2 = r'<section class="tools-grid">.*?</section>'
-            new_content = re.sub(pattern2, '', new_content, flags=re.DOTALL)
-            
+        # Check if the section existed
+        if new_content != content:
             # Write back
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(new_content)
@@ -3,27 +3,40 @@ import os
 import glob
 import re
 
+from page_pipeline import register_transform, page_may_change
+
+# Fake discount claims and their honest replacements
+REPLACEMENTS = [
+    ('⚠️ 67% OFF TODAY - ', ''),
+    ('67% OFF TODAY - ', ''),
+    ('⚠️ 67% OFF - ', ''),
+    ('67% OFF - ', ''),
+    ('Get 67% Off Today Only →', 'Learn More →'),
+    ('67% off today only!', 'Special offer available'),
+]
+
+@register_transform("remove-fake-discounts", markers=[b'67% '], data=REPLACEMENTS)
+def remove_fake_discounts(content, page=None):
+    """Replace every fake discount claim in content with honest messaging"""
+    for old, new in REPLACEMENTS:
+        content = content.replace(old, new)
+    return content
+
 def fix_affiliate_messaging(filepath):
     """Remove fake discount claims and use honest messaging"""
     try:
+        # Most pages carry no claim at all: check the raw bytes before decoding
+        if not page_may_change(filepath, ["remove-fake-discounts"]):
+            return False
+
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
-        
+
         original = content
-        
+
         # Remove all variations of fake discount claims
-        replacements = [
-            ('⚠️ 67% OFF TODAY - ', ''),
-            ('67% OFF TODAY - ', ''),
-            ('⚠️ 67% OFF - ', ''),
-            ('67% OFF - ', ''),
-            ('Get 67% Off Today Only →', 'Learn More →'),
-            ('67% off today only!', 'Special offer available'),
-        ]
-        
-        for old, new in replacements:
-            content = content.replace(old, new)
-        
+        content = remove_fake_discounts(content)
+
         # If changes were made, write back
         if content != original:
             with open(filepath, 'w', encoding='utf-8') as f:
@@ -34,33 +47,37 @@ def fix_affiliate_messaging(filepath):
         print(f"  Error in {filepath}: {e}")
         return False
 
-print("REMOVING ILLEGAL DISCOUNT CLAIMS FROM ALL PAGES")
-print("=" * 50)
-print("Replacing fake '67% OFF' with honest messaging\n")
+def main():
+    print("REMOVING ILLEGAL DISCOUNT CLAIMS FROM ALL PAGES")
+    print("=" * 50)
+    print("Replacing fake '67% OFF' with honest messaging\n")
+
+    categories = ['business', 'everyday', 'content', 'coding', 'relationships', 'health', 'money']
+    total_fixed = 0
+
+    for category in categories:
+        files = glob.glob(f'prompts/{category}/*.html')
+        prompts = [f for f in files if not f.endswith('index.html')]
+
+        if prompts:
+            print(f"{category.upper()} ({len(prompts)} files):")
+            fixed = 0
+            for filepath in prompts:
+                if fix_affiliate_messaging(filepath):
+                    print(f"  Fixed: {os.path.basename(filepath)}")
+                    fixed += 1
 
-categories = ['business', 'everyday', 'content', 'coding', 'relationships', 'health', 'money']
-total_fixed = 0
+            if fixed > 0:
+                print(f"  Removed fake discounts from {fixed} files")
+                total_fixed += fixed
+            else:
+                print(f"  No fake discounts found")
+            print()
 
-for category in categories:
-    files = glob.glob(f'prompts/{category}/*.html')
-    prompts = [f for f in files if not f.endswith('index.html')]
-    
-    if prompts:
-        print(f"{category.upper()} ({len(prompts)} files):")
-        fixed = 0
-        for filepath in prompts:
-            if fix_affiliate_messaging(filepath):
-                print(f"  Fixed: {os.path.basename(filepath)}")
-                fixed += 1
-        
-        if fixed > 0:
-            print(f"  Removed fake discounts from {fixed} files")
-            total_fixed += fixed
-        else:
-            print(f"  No fake discounts found")
-        print()
+    print("=" * 50)
+    print(f"TOTAL: Fixed {total_fixed} pages")
+    print("\nAll affiliate sections now use honest messaging!")
+    print("No more illegal discount claims that could get you in trouble.")
 
-print("=" * 50)
-print(f"TOTAL: Fixed {total_fixed} pages")
-print("\nAll affiliate sections now use honest messaging!")
-print("No more illegal discount claims that could get you in trouble.")
+if __name__ == "__main__":
+    main()
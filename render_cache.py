@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Content-addressed render cache for the FreePromptHub build.
+Maps a render key (a hash of the template, the data and the transform
+versions that produced a page) to the hash of the bytes that came out, and
+keeps those bytes as content-addressed blobs. A hit skips rendering; the
+output hash alone tells whether the file on disk is already current, so
+unchanged pages are never rewritten and keep their mtime. The index is
+bounded by blob bytes and evicts least recently used entries.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+RENDER_CACHE_DIR = Path(__file__).parent / ".pipeline-cache" / "render"
+INDEX_NAME = "index.json"
+OBJECTS_NAME = "objects"
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+def fingerprint(*parts):
+    """Stable hash of JSON-serializable key parts"""
+    data = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+def write_if_changed(path, data):
+    """Write bytes only if the file does not already hold them; returns True if written"""
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+class RenderCache:
+    """key -> {"output", "size", "used", "meta"} index over a content-addressed blob store"""
+
+    def __init__(self, directory=RENDER_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self.tick = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, directory=RENDER_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        cache = cls(directory, max_bytes)
+        try:
+            with open(cache.directory / INDEX_NAME, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            cache.entries = data["entries"]
+            cache.tick = data["tick"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return cache
+
+    def blob_path(self, output):
+        return self.directory / OBJECTS_NAME / output[:2] / output
+
+    def get(self, key):
+        """Cached entry for a key whose blob is still present, else None"""
+        entry = self.entries.get(key)
+        if entry is None or not self.blob_path(entry["output"]).exists():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def read(self, output):
+        """Blob bytes for an output hash, or None if evicted meanwhile"""
+        try:
+            with open(self.blob_path(output), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, data):
+        """Add bytes to the blob store (atomically, safe across workers); returns their hash"""
+        output = content_hash(data)
+        path = self.blob_path(output)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{output}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return output
+
+    def put(self, key, output, size, meta=None):
+        """Record (or refresh) a key as most recently used"""
+        self.tick += 1
+        self.entries[key] = {"output": output, "size": size, "used": self.tick, "meta": meta}
+
+    def total_bytes(self):
+        return sum({entry["output"]: entry["size"] for entry in self.entries.values()}.values())
+
+    def evict(self):
+        """Drop least recently used entries until the blobs fit in max_bytes; returns entries dropped"""
+        refs = {}
+        for entry in self.entries.values():
+            refs[entry["output"]] = refs.get(entry["output"], 0) + 1
+        total = self.total_bytes()
+
+        dropped = 0
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            del self.entries[key]
+            dropped += 1
+            refs[entry["output"]] -= 1
+            if refs[entry["output"]] == 0:
+                total -= entry["size"]
+                try:
+                    self.blob_path(entry["output"]).unlink()
+                except FileNotFoundError:
+                    pass
+        return dropped
+
+    def save(self):
+        """Evict down to the size bound, then write the index atomically"""
+        self.evict()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{INDEX_NAME}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"tick": self.tick, "entries": self.entries}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.directory / INDEX_NAME)
+
+    def clear(self):
+        for path in (self.directory / OBJECTS_NAME).glob("*/*"):
+            path.unlink()
+        self.entries = {}
+        self.save()
+
+_shared_cache = None
+
+def shared_cache():
+    """The render cache, loaded once per process"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = RenderCache.load()
+    return _shared_cache
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the render cache")
+    parser.add_argument("--max-mb", type=int, help="evict down to this many MB")
+    parser.add_argument("--clear", action="store_true", help="drop every entry and blob")
+    args = parser.parse_args()
+
+    cache = RenderCache.load()
+    if args.clear:
+        cache.clear()
+    elif args.max_mb is not None:
+        cache.max_bytes = args.max_mb * 1024 * 1024
+        print(f"Evicted {cache.evict()} entries")
+        cache.save()
+
+    print(f"  {len(cache.entries)} entries, {cache.total_bytes() / (1024 * 1024):.1f} MB in {cache.directory}")
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,10 @@ import os
 import re
 import glob
 
-# RESTORE THE CORRECT LINKS FROM YOUR ORIGINAL LIST
-CORRECT_LINKS = {
-    'business': 'https://0e8c9e1jnhrmcvc5tkmt63yr1r.hop.clickbank.net',  # The Genius Wave
-    'everyday': 'https://7ca54ouacpux8odjs7-cmvvj54.hop.clickbank.net',  # TedsWoodworking  
-    'content': 'https://13f75e6ccbuz3u04ikq7xmpr5b.hop.clickbank.net',  # Java Burn 2.0
-    'coding': 'https://9d76fn1hemvx3t0bresjkcmiki.hop.clickbank.net',  # Neuro Energizer
-    'relationships': 'https://fdd98gwkrduu9o55wkx6seqd2w.hop.clickbank.net',  # His Secret Obsession
-    'health': 'https://454019zerqrp6s2c-9sgr8eldl.hop.clickbank.net'  # SleepLean
-}
+import affiliate_registry
+
+# The correct links per category, from affiliates.json
+CORRECT_LINKS = affiliate_registry.category_links()
 
 def restore_link_in_file(filepath, category):
     """Restore the correct affiliate link"""
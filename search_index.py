@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Search index builder for FreePromptHub.
+Reads every prompt page (title, description, keywords and the prompt text
+itself, cached by size and mtime), merges in the hand-curated fields from
+search-curation.json, difficulty badges from the category index cards and
+page views from the analytics rollup, and builds an inverted index of
+term -> [doc, weight, ...] posting lists. Weights are field-weighted BM25
+scores computed here and quantized to small integers, so ranking a query
+on the client is just adding up posting weights.
+
+The index is sharded so the client only downloads what a query touches:
+per category, one file of documents and one file of postings per term
+prefix, prefixes growing a character wherever a shard would be too big.
+Shard names carry a content hash and are served immutable; the small
+search-index.json manifest maps categories and prefixes to them, and
+sw.js precaches the manifest and a few of the hottest shards.
+
+Autocomplete gets shards of its own: an edge n-gram table mapping prefixes
+of every word-start suffix of prompt titles, tags, use cases and
+categories to the most popular phrases they begin, so a suggestion costs
+a few table lookups however large the catalogue.
+
+Alongside it goes search-manifest.json, the flat prompt list the site-wide
+search bar (search.js) filters: url, title, category, a short description
+and popularity per prompt, stored column by column so it gzips well.
+"""
+
+import argparse
+import gzip
+import hashlib
+import html
+import json
+import math
+import re
+from pathlib import Path
+
+from category_index import TAG_PATTERN, category_title, page_metadata
+from page_pipeline import CACHE_DIR, CATEGORIES, PROJECT_ROOT, _load_json, _save_json, find_pages, page_key
+from render_cache import fingerprint, write_if_changed
+
+INDEX_NAME = "search-index.json"
+SHARDS_NAME = "search-index"
+CURATION_NAME = "search-curation.json"
+MANIFEST_NAME = "search-manifest.json"
+DOCS_CACHE_PATH = CACHE_DIR / "search_docs.json"
+
+# Bumped when page_document() or tokenize() change what cached entries hold
+DOCS_FORMAT = 2
+
+SW_PATH = PROJECT_ROOT / "sw.js"
+SW_SHARDS_PATTERN = re.compile(r'(// search-shards:start).*?(\n[ \t]*// search-shards:end)', re.DOTALL)
+
+# A prefix shard above this size is split by the next character of its terms
+MAX_SHARD_BYTES = 16 * 1024
+
+# Postings shards precached by sw.js besides the manifest: at most this many, in this many bytes;
+# everything else is fetched when a query needs it
+HOT_SHARDS = 8
+HOT_BYTES = 32 * 1024
+
+# Trending prompts and filter tags carried in the manifest itself
+TRENDING_COUNT = 20
+TAG_COUNT = 50
+
+# Autocomplete answers queries of at least this many characters
+MIN_SUGGESTION_PREFIX = 2
+SUGGESTIONS_PER_PREFIX = 10
+
+# Descriptions in search-manifest.json are cut at a word boundary near this length
+SHORT_DESCRIPTION_CHARS = 100
+
+# Field-weighted BM25: each field is scored on its own (saturation K1, length
+# normalization FIELD_B) and the scores are summed by field weight, so a
+# title hit is not drowned out by a long prompt repeating the word
+FIELD_WEIGHTS = {"title": 10, "category": 8, "tags": 7, "description": 5, "content": 3}
+FIELD_B = {"title": 0.5, "category": 0.0, "tags": 0.5, "description": 0.75, "content": 0.75}
+K1 = 1.2
+
+# Weights are quantized to integers 1..WEIGHT_LEVELS on one scale for the whole index
+WEIGHT_LEVELS = 255
+
+# Popularity for pages with neither page views nor a curated value
+DEFAULT_POPULARITY = 50
+
+DOC_FIELDS = ["id", "title", "category", "description", "tags", "difficulty", "timeToComplete", "useCases",
+              "popularity"]
+
+DIFFICULTIES = {"beginner": "beginner", "intermediate": "intermediate", "advanced": "advanced",
+                "all levels": "beginner"}
+
+# Must match tokenize() in js/search-engine.js
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have", "how", "i", "if", "in",
+    "into", "is", "it", "its", "me", "my", "of", "on", "or", "our", "so", "that", "the", "their", "them", "then",
+    "there", "these", "this", "to", "was", "we", "what", "when", "which", "who", "will", "with", "you", "your",
+}
+
+KEYWORDS_PATTERN = re.compile(r'<meta name="keywords" content="([^"]*)"', re.IGNORECASE)
+PROMPT_TEXT_PATTERNS = [
+    re.compile(r'<textarea[^>]*(?:id|class)="prompt-text"[^>]*>(.*?)</textarea>', re.DOTALL),
+    re.compile(r'<div class="prompt-content" id="promptContent">(.*?)</div>', re.DOTALL),
+]
+CARD_PATTERN = re.compile(r'<a href="([^"]+)" class="prompt-card">(.*?)</a>', re.DOTALL)
+CARD_DIFFICULTY_PATTERN = re.compile(r'<span class="difficulty">([^<]*)</span>')
+
+# Boilerplate keywords every page of a kind carries; they say nothing about the prompt
+GENERIC_KEYWORD_PATTERN = re.compile(r'(?:^|\s)prompts$|^(?:strategy|professional guide|professional advice)$')
+
+def singular(token):
+    """Fold simple English plurals ("budgets", "strategies") onto their singular"""
+    if len(token) > 3 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+def tokenize(text):
+    """Lowercase word tokens of text, without stopwords and single characters, plurals folded"""
+    return [singular(token) for token in TOKEN_PATTERN.findall(text.lower())
+            if len(token) > 1 and token not in STOPWORDS]
+
+def normalize_phrase(text):
+    """Lowercase words joined by single spaces; must match normalize() in js/search-engine.js"""
+    return ' '.join(TOKEN_PATTERN.findall(text.lower()))
+
+def page_document(path, category):
+    """Searchable fields read from a prompt page"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    keywords_match = KEYWORDS_PATTERN.search(content)
+    keywords = []
+    for keyword in (keywords_match.group(1).split(',') if keywords_match else []):
+        keyword = html.unescape(keyword).strip().lower()
+        if keyword and keyword not in keywords and keyword not in CATEGORIES \
+                and not GENERIC_KEYWORD_PATTERN.search(keyword):
+            keywords.append(keyword)
+
+    prompt = ""
+    for pattern in PROMPT_TEXT_PATTERNS:
+        match = pattern.search(content)
+        if match:
+            prompt = html.unescape(TAG_PATTERN.sub(' ', match.group(1)))
+            break
+
+    metadata = page_metadata(path, category)
+    return {
+        "title": html.unescape(metadata["title"]),
+        "description": html.unescape(metadata["description"]),
+        "keywords": keywords,
+        "content": ' '.join(tokenize(prompt)),
+    }
+
+def update_docs_cache(cache, root=PROJECT_ROOT):
+    """Bring the cached page documents up to date; returns [(key, category, document)].
+
+    Only pages whose size or mtime changed are read.
+    """
+    pages = []
+    for page in find_pages(root):
+        key = page_key(page["path"], root)
+        stat = page["path"].stat()
+        entry = cache.get(key)
+        if (entry is None or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime_ns
+                or entry.get("format") != DOCS_FORMAT):
+            entry = dict(page_document(page["path"], page["category"]), size=stat.st_size, mtime=stat.st_mtime_ns,
+                         format=DOCS_FORMAT)
+            cache[key] = entry
+        pages.append((key, page["category"], entry))
+
+    seen = {key for key, _, _ in pages}
+    for key in [key for key in cache if key not in seen]:
+        del cache[key]
+    return sorted(pages, key=lambda page: page[0])
+
+def card_difficulties(root=PROJECT_ROOT):
+    """{url: difficulty} from the badges on the category index cards"""
+    difficulties = {}
+    for category in CATEGORIES:
+        index_path = Path(root) / "prompts" / category / "index.html"
+        if not index_path.exists():
+            continue
+        for url, card in CARD_PATTERN.findall(index_path.read_text(encoding='utf-8')):
+            badge = CARD_DIFFICULTY_PATTERN.search(card)
+            if badge and badge.group(1).strip().lower() in DIFFICULTIES:
+                difficulties.setdefault(url, DIFFICULTIES[badge.group(1).strip().lower()])
+    return difficulties
+
+def page_views():
+    """{url: page views} from the analytics rollup; empty when nothing has been collected"""
+    from analytics_rollup import Rollup
+
+    views = {}
+    for _, _, page, _, metric, count, _ in Rollup.load().rows():
+        if metric == "page_view" and page:
+            url = page.split('?')[0].split('#')[0]
+            views[url] = views.get(url, 0) + count
+    return views
+
+def popularity_scores(urls, curation, views):
+    """0-100 popularity per URL: log-scaled page views, else the curated value, else the default"""
+    most = max((views.get(url, 0) for url in urls), default=0)
+    scores = {}
+    for url in urls:
+        if views.get(url):
+            scores[url] = max(1, round(100 * math.log1p(views[url]) / math.log1p(most)))
+        else:
+            scores[url] = curation.get(url, {}).get("popularity", DEFAULT_POPULARITY)
+    return scores
+
+def document_fields(document):
+    """{field: tokens} for the fields a document is scored on"""
+    return {
+        "title": tokenize(document["title"]),
+        "category": tokenize(document["category"]),
+        "tags": tokenize(' '.join(document["tags"])),
+        "description": tokenize(document["description"]),
+        "content": document["content"].split(),
+    }
+
+def bm25_weights(documents):
+    """[{term: score}] per document: field-weighted BM25 over the fields of document_fields()"""
+    count = len(documents)
+    average = {field: sum(len(fields[field]) for fields in documents) / max(count, 1) or 1
+               for field in FIELD_WEIGHTS}
+    document_counts = {}
+    for fields in documents:
+        for term in {term for tokens in fields.values() for term in tokens}:
+            document_counts[term] = document_counts.get(term, 0) + 1
+
+    weights = []
+    for fields in documents:
+        scores = {}
+        for field, tokens in fields.items():
+            frequency = {}
+            for term in tokens:
+                frequency[term] = frequency.get(term, 0) + 1
+            norm = K1 * (1 - FIELD_B[field] + FIELD_B[field] * len(tokens) / average[field])
+            for term, tf in frequency.items():
+                scores[term] = scores.get(term, 0) + FIELD_WEIGHTS[field] * tf * (K1 + 1) / (tf + norm)
+        weights.append({term: score * math.log(1 + (count - document_counts[term] + 0.5) / (document_counts[term] + 0.5))
+                        for term, score in scores.items()})
+    return weights
+
+def quantize(weights):
+    """Scale every score onto integers 1..WEIGHT_LEVELS, in place"""
+    top = max((score for scores in weights for score in scores.values()), default=0) or 1
+    for scores in weights:
+        for term, score in scores.items():
+            scores[term] = max(1, round(score / top * WEIGHT_LEVELS))
+    return weights
+
+def build_index(root=PROJECT_ROOT):
+    """(index, curated URLs with no page behind them).
+
+    The index is {"fields", "docs": [(category, values)], "postings": {term: [doc, weight, ...]}}.
+    """
+    cache = _load_json(DOCS_CACHE_PATH)
+    pages = update_docs_cache(cache, root)
+    _save_json(cache, DOCS_CACHE_PATH)
+
+    curation = _load_json(Path(root) / CURATION_NAME).get("prompts", {})
+    difficulties = card_difficulties(root)
+    urls = [f"/{key}" for key, _, _ in pages]
+    popularity = popularity_scores(urls, curation, page_views())
+
+    documents = []
+    fields = []
+    postings = {}
+    for url, (_, category, entry) in zip(urls, pages):
+        curated = curation.get(url, {})
+        tags = list(dict.fromkeys(curated.get("tags", []) + entry["keywords"]))
+        document = {
+            "id": url,
+            "title": entry["title"],
+            "category": category_title(category),
+            "description": entry["description"],
+            "tags": tags,
+            "difficulty": curated.get("difficulty") or difficulties.get(url, ""),
+            "timeToComplete": curated.get("timeToComplete", ""),
+            "useCases": curated.get("useCases", []),
+            "popularity": popularity[url],
+            "content": ' '.join(filter(None, [entry["content"], ' '.join(tokenize(curated.get("keywords", "")))])),
+        }
+        documents.append((category, [document[field] for field in DOC_FIELDS]))
+        fields.append(document_fields(document))
+
+    # Scoring is done here; the client only adds up a document's posting weights
+    for doc_id, weights in enumerate(quantize(bm25_weights(fields))):
+        for term, weight in weights.items():
+            postings.setdefault(term, []).extend((doc_id, weight))
+
+    index = {"fields": DOC_FIELDS, "docs": documents, "postings": postings}
+    return index, sorted(set(curation) - set(urls))
+
+def _dumps(data):
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def shard_key(prefix):
+    """Filename-safe spelling of a term prefix"""
+    return prefix if re.fullmatch(r'[a-z0-9]+', prefix) else 'x' + prefix.encode('utf-8').hex()
+
+def prefix_groups(keys, size_of, prefix="", max_length=None):
+    """{prefix: sorted keys}, splitting any group whose size_of() total exceeds MAX_SHARD_BYTES.
+
+    Groups split a character at a time, to prefixes of at most max_length characters.
+    """
+    groups = {}
+    for key in keys:
+        groups.setdefault(key[:len(prefix) + 1], []).append(key)
+
+    result = {}
+    for group_prefix, group in groups.items():
+        size = sum(size_of(key) for key in group)
+        longer = [key for key in group if len(key) > len(group_prefix)]
+        if size > MAX_SHARD_BYTES and longer and (max_length is None or len(group_prefix) < max_length):
+            # The key equal to the prefix, if any, keeps a shard of its own
+            if len(longer) < len(group):
+                result[group_prefix] = [group_prefix]
+            result.update(prefix_groups(longer, size_of, group_prefix, max_length))
+        else:
+            result[group_prefix] = group
+    return result
+
+def suggestion_table(index):
+    """(phrases, {prefix: [phrase ids]}) for autocomplete.
+
+    Phrases are titles, tags, use cases and categories, each ranked by the
+    popularity of its most popular prompt. Every prefix of every suffix that
+    starts a word lists the best SUGGESTIONS_PER_PREFIX phrases it begins;
+    a prefix whose list is the same as its parent's is left out, since
+    filtering the parent's list gives the same answer.
+    """
+    fields = index["fields"]
+    title, category, tags, use_cases, popularity = (fields.index(field) for field in
+                                                    ("title", "category", "tags", "useCases", "popularity"))
+    best = {}
+    for _, values in index["docs"]:
+        for phrase in [values[title], values[category]] + values[tags] + values[use_cases]:
+            key = normalize_phrase(phrase)
+            if len(key) >= MIN_SUGGESTION_PREFIX and (key not in best or best[key][0] < values[popularity]):
+                best[key] = (values[popularity], phrase)
+
+    ranked = sorted(best.items(), key=lambda item: (-item[1][0], len(item[0]), item[0]))
+    prefixes = {}
+    for phrase_id, (key, _) in enumerate(ranked):
+        words = key.split(' ')
+        seen = set()
+        for start in range(len(words)):
+            suffix = ' '.join(words[start:])
+            for end in range(MIN_SUGGESTION_PREFIX, len(suffix) + 1):
+                prefix = suffix[:end]
+                if prefix in seen or prefix.endswith(' '):
+                    continue
+                seen.add(prefix)
+                ids = prefixes.setdefault(prefix, [])
+                if len(ids) < SUGGESTIONS_PER_PREFIX:
+                    ids.append(phrase_id)
+
+    prefixes = {prefix: ids for prefix, ids in prefixes.items()
+                if len(prefix) == MIN_SUGGESTION_PREFIX or prefixes.get(prefix[:-1]) != ids}
+    return [phrase for _, (_, phrase) in ranked], prefixes
+
+def shard_index(index):
+    """(manifest, {shard filename: bytes}) for an index built by build_index()"""
+    files = {}
+
+    def add_file(name, data):
+        data = _dumps(data).encode('utf-8')
+        filename = f"{name}.{hashlib.sha256(data).hexdigest()[:10]}.json"
+        files[filename] = data
+        return f"/{SHARDS_NAME}/{filename}"
+
+    # Documents are numbered within their category's shards
+    local_ids = []
+    by_category = {}
+    for category, values in index["docs"]:
+        local_ids.append(len(by_category.setdefault(category, [])))
+        by_category[category].append(values)
+
+    category_postings = {}
+    for term, postings in index["postings"].items():
+        for i in range(0, len(postings), 2):
+            category = index["docs"][postings[i]][0]
+            category_postings.setdefault(category, {}).setdefault(term, []).extend(
+                (local_ids[postings[i]], postings[i + 1]))
+
+    categories = {}
+    sizes = {}
+    for category, documents in by_category.items():
+        postings = category_postings.get(category, {})
+        shards = {}
+        size_of = lambda term: len(_dumps(postings[term])) + len(term)
+        for prefix, terms in sorted(prefix_groups(sorted(postings), size_of).items()):
+            url = add_file(f"{category}-{shard_key(prefix)}",
+                           {"terms": terms, "postings": [postings[term] for term in terms]})
+            shards[prefix] = url
+            sizes[url] = sum(len(postings[term]) for term in terms)
+        categories[category] = {
+            "title": category_title(category),
+            "count": len(documents),
+            "docs": add_file(f"{category}-docs", documents),
+            "shards": shards,
+        }
+
+    # Suggestion shards are split no further than the shortest query, so one shard answers each query
+    phrases, table = suggestion_table(index)
+    suggestions = {}
+    size_of = lambda prefix: len(prefix) + sum(len(phrases[i]) + 2 for i in table[prefix])
+    for prefix, keys in sorted(prefix_groups(sorted(table), size_of, max_length=MIN_SUGGESTION_PREFIX).items()):
+        used = sorted({i for key in keys for i in table[key]})
+        local = {i: n for n, i in enumerate(used)}
+        suggestions[prefix] = add_file(f"suggest-{shard_key(prefix)}", {
+            "phrases": [phrases[i] for i in used],
+            "prefixes": {key: [local[i] for i in table[key]] for key in keys},
+        })
+
+    fields = index["fields"]
+    popularity, tags = fields.index("popularity"), fields.index("tags")
+    ranked = sorted((values for _, values in index["docs"]), key=lambda values: -values[popularity])
+    tag_counts = {}
+    for _, values in index["docs"]:
+        for tag in values[tags]:
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+
+    # Shards with the most postings are the likeliest to be needed
+    hot = []
+    hot_bytes = 0
+    for url in sorted(sizes, key=lambda url: (-sizes[url], url)):
+        size = len(files[url.rsplit('/', 1)[1]])
+        if len(hot) < HOT_SHARDS and hot_bytes + size <= HOT_BYTES:
+            hot.append(url)
+            hot_bytes += size
+
+    manifest = {
+        "fields": fields,
+        "categories": categories,
+        "suggestions": suggestions,
+        "trending": ranked[:TRENDING_COUNT],
+        "tags": sorted(tag_counts, key=lambda tag: (-tag_counts[tag], tag))[:TAG_COUNT],
+        "hot": hot,
+    }
+    return {"version": fingerprint(manifest)[:12], **manifest}, files
+
+def short_description(description, limit=SHORT_DESCRIPTION_CHARS):
+    if len(description) <= limit:
+        return description
+    return description[:limit].rsplit(' ', 1)[0].rstrip(' ,;:.-') + '…'
+
+def search_manifest(index):
+    """Columnar prompt list for search.js, most popular first"""
+    fields = index["fields"]
+    columns = {field: fields.index(field) for field in ("id", "title", "category", "description", "popularity")}
+    ranked = sorted((values for _, values in index["docs"]),
+                    key=lambda values: (-values[columns["popularity"]], values[columns["title"]]))
+
+    categories = sorted({values[columns["category"]] for values in ranked})
+    return {
+        "categories": categories,
+        "urls": [values[columns["id"]] for values in ranked],
+        "titles": [values[columns["title"]] for values in ranked],
+        "category": [categories.index(values[columns["category"]]) for values in ranked],
+        "descriptions": [short_description(values[columns["description"]]) for values in ranked],
+        "popularity": [values[columns["popularity"]] for values in ranked],
+    }
+
+def precache_urls(manifest):
+    """Manifest and hot postings shards, for sw.js"""
+    return [f"/{INDEX_NAME}"] + sorted(manifest["hot"])
+
+def update_service_worker(manifest, path=SW_PATH):
+    """Rewrite the precached search shard list in sw.js; True if it changed"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    listing = ''.join(f"\n  '{url}'," for url in precache_urls(manifest))
+    new_content, count = SW_SHARDS_PATTERN.subn(lambda m: m.group(1) + listing + m.group(2), content)
+    if not count:
+        raise ValueError(f"No search-shards markers in {path}")
+    return write_if_changed(path, new_content.encode('utf-8'))
+
+def write_index(index, root=PROJECT_ROOT):
+    """Write shards, the shard manifest, search-manifest.json and the sw.js precache list, removing stale shards.
+
+    Returns (manifest, whether anything changed).
+    """
+    manifest, files = shard_index(index)
+    shards_dir = Path(root) / SHARDS_NAME
+    changed = False
+    for filename, data in files.items():
+        changed |= write_if_changed(shards_dir / filename, data)
+
+    # The manifest goes after the shards it names and before the old ones go
+    changed |= write_if_changed(Path(root) / INDEX_NAME, (_dumps(manifest) + '\n').encode('utf-8'))
+    changed |= write_if_changed(Path(root) / MANIFEST_NAME, (_dumps(search_manifest(index)) + '\n').encode('utf-8'))
+    changed |= update_service_worker(manifest, Path(root) / SW_PATH.name)
+    for path in shards_dir.glob("*.json"):
+        if path.name not in files:
+            path.unlink()
+            changed = True
+    return manifest, changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the sharded client-side search index from the prompt pages")
+    parser.add_argument("--dry-run", action="store_true", help="report shard counts and sizes without writing them")
+    args = parser.parse_args()
+
+    print("BUILDING SEARCH INDEX")
+    print("=" * 50)
+
+    index, stale = build_index()
+    manifest, files = shard_index(index)
+    for category, entry in manifest["categories"].items():
+        urls = [entry["docs"]] + list(entry["shards"].values())
+        size = sum(len(files[url.rsplit('/', 1)[1]]) for url in urls)
+        print(f"  {category:<14} {entry['count']:>4} prompts, {len(entry['shards']):>3} shards, {size / 1024:.1f} KB")
+    largest = max(len(data) for data in files.values())
+    suggestions = [files[url.rsplit('/', 1)[1]] for url in manifest["suggestions"].values()]
+    print(f"  suggestions: {len(suggestions)} shards, {sum(map(len, suggestions)) / 1024:.1f} KB")
+    listing = (_dumps(search_manifest(index)) + '\n').encode('utf-8')
+    print(f"  {MANIFEST_NAME}: {len(listing) / 1024:.1f} KB, {len(gzip.compress(listing)) / 1024:.1f} KB gzipped")
+    print(f"  {len(index['postings'])} terms in {len(files)} shards (largest {largest / 1024:.1f} KB)")
+    for url in stale:
+        print(f"  ⚠️  {CURATION_NAME} lists {url}, which has no page")
+
+    print("\n" + "=" * 50)
+    if args.dry_run:
+        print(f"✅ Would write {INDEX_NAME} (version {manifest['version']}), {len(files)} shards and {MANIFEST_NAME}")
+        return
+    manifest, changed = write_index(index)
+    if changed:
+        print(f"✅ Wrote {INDEX_NAME} (version {manifest['version']}), {len(files)} shards to {SHARDS_NAME}/ and {MANIFEST_NAME}")
+    else:
+        print(f"✅ {INDEX_NAME} already current")
+
+if __name__ == "__main__":
+    main()
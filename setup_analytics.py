@@ -4,14 +4,44 @@ Set up comprehensive analytics and tracking for FreePromptHub
 Includes Google Analytics 4, ClickBank tracking, conversion goals, and heat mapping
 """
 
+import argparse
+import hashlib
+import json
 import os
 import re
 from pathlib import Path
 
+from page_pipeline import register_transform, find_site_pages, run_pages, print_report, PROJECT_ROOT
+from page_sections import page_landmarks
+
 # Analytics configuration
 GOOGLE_ANALYTICS_ID = "G-XXXXXXXXXX"  # User needs to provide their GA4 ID
 GOOGLE_TAG_MANAGER_ID = "GTM-XXXXXXX"  # Optional GTM container ID
 
+# ConversionTracker dispatch defaults; a page can override them with window.conversionTrackingConfig
+#   batch      queue events and flush them with sendBeacon when the page is hidden
+#   sampleRate fraction of sessions that report at all
+#   maxQueue   flush early once this many events are queued
+#   endpoint   collector that receives batched events ("" to only forward to gtag)
+CONVERSION_TRACKING_DEFAULTS = {
+    "batch": False,
+    "sampleRate": 1.0,
+    "maxQueue": 20,
+    "endpoint": "/api/analytics",
+}
+
+# Bundle mode: the inline tracking code ships as one fingerprinted, cacheable file.
+# Not named "analytics.*" so sw.js's network-first "/analytics" rule skips it.
+BUNDLE_DIR = PROJECT_ROOT / "js"
+BUNDLE_PREFIX = "site-analytics"
+BUNDLE_SRC_PATTERN = re.compile(rf'/js/{BUNDLE_PREFIX}\.[0-9a-f]+\.js')
+INLINE_SCRIPT_PATTERN = re.compile(r'<script>\n(.*?)</script>', re.DOTALL)
+EXTERNAL_SCRIPT_PATTERN = re.compile(r'<script [^>]*src="[^"]+"[^>]*></script>')
+
+# Inlined ConversionTracker scripts from any version of create_conversion_tracking_script
+INLINE_TRACKER_PATTERN = re.compile(
+    r'\n<script>\n// Enhanced conversion tracking for FreePromptHub\n.*?</script>\n(?:\\n)?', re.DOTALL)
+
 def create_analytics_code():
     """Create the analytics tracking code"""
     return f'''
@@ -121,8 +151,14 @@ def create_conversion_tracking_script():
 <script>
 // Enhanced conversion tracking for FreePromptHub
 
+// Dispatch settings (setup_analytics.CONVERSION_TRACKING_DEFAULTS)
+const TRACKING_DEFAULTS = __TRACKING_DEFAULTS__;
+
 class ConversionTracker {
-    constructor() {
+    constructor(config = {}) {
+        this.config = Object.assign({}, TRACKING_DEFAULTS, config);
+        this.sampled = Math.random() < this.config.sampleRate;
+        this.queue = [];
         this.sessionStart = Date.now();
         this.pageViews = 0;
         this.promptCopies = 0;
@@ -133,6 +169,7 @@ class ConversionTracker {
     }
     
     init() {
+        this.setupBatchFlush();
         this.trackPageView();
         this.setupScrollTracking();
         this.setupTimeOnPage();
@@ -146,57 +183,142 @@ class ConversionTracker {
         return matches ? matches[1] : 'homepage';
     }
     
-    trackPageView() {
-        this.pageViews++;
+    // Send an event to Google Analytics now, or queue it in batch mode
+    sendEvent(name, params) {
+        if (!this.sampled) {
+            return;
+        }
+        
+        if (this.config.batch) {
+            this.queue.push({ name: name, params: params, time: Date.now() });
+            if (this.queue.length >= this.config.maxQueue) {
+                this.flush();
+            }
+        } else if (typeof gtag !== 'undefined') {
+            gtag('event', name, params);
+        }
+    }
+    
+    // Hand queued events to gtag and the collector in one beacon
+    flush() {
+        if (this.queue.length === 0) {
+            return;
+        }
+        
+        const events = this.queue.splice(0, this.queue.length);
         
-        // Send to Google Analytics
         if (typeof gtag !== 'undefined') {
-            gtag('event', 'page_view', {
-                'page_title': document.title,
-                'page_location': window.location.href,
-                'page_category': this.category
+            events.forEach(event => {
+                gtag('event', event.name, Object.assign({ 'transport_type': 'beacon' }, event.params));
+            });
+        }
+        
+        if (this.config.endpoint) {
+            const body = JSON.stringify({
+                category: this.category,
+                path: window.location.pathname,
+                events: events
             });
+            const sent = navigator.sendBeacon &&
+                navigator.sendBeacon(this.config.endpoint, new Blob([body], { type: 'application/json' }));
+            if (!sent) {
+                fetch(this.config.endpoint, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: body,
+                    keepalive: true
+                }).catch(() => {});
+            }
+        }
+    }
+    
+    setupBatchFlush() {
+        if (!this.config.batch) {
+            return;
         }
+        
+        // Hidden is the last reliable moment on mobile; pagehide covers bfcache navigations
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') {
+                this.flush();
+            }
+        });
+        window.addEventListener('pagehide', () => this.flush());
+    }
+    
+    trackPageView() {
+        this.pageViews++;
+        
+        // Send to Google Analytics
+        this.sendEvent('page_view', {
+            'page_title': document.title,
+            'page_location': window.location.href,
+            'page_category': this.category
+        });
     }
     
     setupScrollTracking() {
-        let scrollPercents = [25, 50, 75, 100];
-        let tracked = [];
+        const scrollPercents = [25, 50, 75, 100];
+        let next = 0;
+        let pending = false;
         
-        window.addEventListener('scroll', () => {
-            const scrolled = Math.round((window.scrollY / (document.documentElement.scrollHeight - window.innerHeight)) * 100);
+        // Measure at most once per frame, never inside the scroll event itself
+        const check = () => {
+            pending = false;
+            const scrollable = document.documentElement.scrollHeight - window.innerHeight;
+            if (scrollable <= 0) {
+                return;
+            }
+            const scrolled = Math.round((window.scrollY / scrollable) * 100);
             
-            scrollPercents.forEach(percent => {
-                if (scrolled >= percent && !tracked.includes(percent)) {
-                    tracked.push(percent);
-                    
-                    if (typeof gtag !== 'undefined') {
-                        gtag('event', 'scroll', {
-                            'event_category': 'Engagement',
-                            'event_label': `${percent}%`,
-                            'value': percent
-                        });
-                    }
-                }
-            });
-        });
+            while (next < scrollPercents.length && scrolled >= scrollPercents[next]) {
+                const percent = scrollPercents[next++];
+                this.sendEvent('scroll', {
+                    'event_category': 'Engagement',
+                    'event_label': `${percent}%`,
+                    'value': percent
+                });
+            }
+            
+            if (next === scrollPercents.length) {
+                window.removeEventListener('scroll', onScroll);
+            }
+        };
+        
+        const onScroll = () => {
+            if (!pending) {
+                pending = true;
+                requestAnimationFrame(check);
+            }
+        };
+        
+        window.addEventListener('scroll', onScroll, { passive: true });
     }
     
     setupTimeOnPage() {
-        // Track meaningful time milestones
+        // Track meaningful time milestones, one timer at a time
         const milestones = [30, 60, 120, 300]; // seconds
+        let index = 0;
         
-        milestones.forEach(seconds => {
+        const schedule = () => {
+            if (index >= milestones.length) {
+                return;
+            }
+            const seconds = milestones[index];
+            const previous = index > 0 ? milestones[index - 1] : 0;
+            
             setTimeout(() => {
-                if (typeof gtag !== 'undefined') {
-                    gtag('event', 'time_on_page', {
-                        'event_category': 'Engagement',
-                        'event_label': `${seconds}s`,
-                        'value': seconds
-                    });
-                }
-            }, seconds * 1000);
-        });
+                this.sendEvent('time_on_page', {
+                    'event_category': 'Engagement',
+                    'event_label': `${seconds}s`,
+                    'value': seconds
+                });
+                index++;
+                schedule();
+            }, (seconds - previous) * 1000);
+        };
+        
+        schedule();
     }
     
     setupAffiliateTracking() {
@@ -210,14 +332,12 @@ class ConversionTracker {
                 const revenue = this.getRevenueFromProduct(productName);
                 
                 // Track in GA4
-                if (typeof gtag !== 'undefined') {
-                    gtag('event', 'affiliate_click', {
-                        'event_category': 'Affiliate',
-                        'event_label': productName,
-                        'value': revenue,
-                        'currency': 'USD'
-                    });
-                }
+                this.sendEvent('affiliate_click', {
+                    'event_category': 'Affiliate',
+                    'event_label': productName,
+                    'value': revenue,
+                    'currency': 'USD'
+                });
                 
                 // Track in Facebook
                 if (typeof fbq !== 'undefined') {
@@ -240,13 +360,11 @@ class ConversionTracker {
             if (e.target.matches('.copy-button, .copy-button-top, #copy-button, #copy-button-top')) {
                 this.promptCopies++;
                 
-                if (typeof gtag !== 'undefined') {
-                    gtag('event', 'prompt_copy', {
-                        'event_category': 'Engagement',
-                        'event_label': this.category,
-                        'value': 1
-                    });
-                }
+                this.sendEvent('prompt_copy', {
+                    'event_category': 'Engagement',
+                    'event_label': this.category,
+                    'value': 1
+                });
                 
                 // This is a key conversion signal
                 this.trackConversionStep('prompt_copy', this.category);
@@ -281,15 +399,13 @@ class ConversionTracker {
     }
     
     trackConversionStep(step, detail) {
-        if (typeof gtag !== 'undefined') {
-            gtag('event', 'conversion_step', {
-                'event_category': 'Conversion Funnel',
-                'event_label': step,
-                'custom_parameter_1': this.category,
-                'custom_parameter_2': detail,
-                'value': this.getStepValue(step)
-            });
-        }
+        this.sendEvent('conversion_step', {
+            'event_category': 'Conversion Funnel',
+            'event_label': step,
+            'custom_parameter_1': this.category,
+            'custom_parameter_2': detail,
+            'value': this.getStepValue(step)
+        });
     }
     
     getStepValue(step) {
@@ -317,7 +433,7 @@ class ConversionTracker {
 
 // Initialize tracking when DOM is ready
 document.addEventListener('DOMContentLoaded', function() {
-    window.conversionTracker = new ConversionTracker();
+    window.conversionTracker = new ConversionTracker(window.conversionTrackingConfig);
     
     // Global functions for manual tracking
     window.trackCopyEvent = function() {
@@ -336,9 +452,9 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // Track page unload for session analysis
 window.addEventListener('beforeunload', function() {
-    if (window.conversionTracker && typeof gtag !== 'undefined') {
+    if (window.conversionTracker) {
         const sessionData = window.conversionTracker.getSessionData();
-        gtag('event', 'session_end', {
+        window.conversionTracker.sendEvent('session_end', {
             'event_category': 'Session',
             'event_label': sessionData.category,
             'value': Math.round(sessionData.timeOnSite / 1000) // seconds
@@ -346,8 +462,115 @@ window.addEventListener('beforeunload', function() {
     }
 });
 </script>
+'''.replace('__TRACKING_DEFAULTS__', json.dumps(CONVERSION_TRACKING_DEFAULTS))
+
+# Each former <script> keeps its own try block so one failing snippet (e.g. an
+# unconfigured pixel ID) does not stop the rest, as with separate tags
+BUNDLE_CHUNK = '''try {{
+{script}
+}} catch (error) {{
+  console.warn('Analytics snippet failed:', error);
+}}
 '''
 
+def create_analytics_bundle():
+    """JavaScript for the bundle: every inline script of the analytics and conversion tracking code"""
+    scripts = INLINE_SCRIPT_PATTERN.findall(create_analytics_code() + create_conversion_tracking_script())
+    chunks = [BUNDLE_CHUNK.format(script=script.rstrip()) for script in scripts]
+    return "// FreePromptHub analytics bundle - generated by setup_analytics.py --bundle\n\n" + "\n".join(chunks)
+
+def bundle_fingerprint(bundle):
+    return hashlib.sha256(bundle.encode('utf-8')).hexdigest()[:10]
+
+BUNDLE_FINGERPRINT = bundle_fingerprint(create_analytics_bundle())
+BUNDLE_SRC = f"/js/{BUNDLE_PREFIX}.{BUNDLE_FINGERPRINT}.js"
+
+def create_analytics_stub():
+    """What bundle mode puts in <head>: external tags, a gtag queue stub and the deferred bundle"""
+    external = '\n'.join(EXTERNAL_SCRIPT_PATTERN.findall(create_analytics_code()))
+    return f'''
+<!-- Analytics (bundle built by setup_analytics.py --bundle) -->
+{external}
+<script>window.dataLayer = window.dataLayer || []; function gtag(){{dataLayer.push(arguments);}}</script>
+<script src="{BUNDLE_SRC}" defer></script>
+'''
+
+def write_analytics_bundle(bundle_dir=BUNDLE_DIR):
+    """Write the current bundle and remove superseded ones; returns its path"""
+    bundle = create_analytics_bundle()
+    path = bundle_dir / f"{BUNDLE_PREFIX}.{bundle_fingerprint(bundle)}.js"
+    if not path.exists():
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(bundle)
+    for old in bundle_dir.glob(f"{BUNDLE_PREFIX}.*.js"):
+        if old != path:
+            old.unlink()
+    return path
+
+def strip_inline_analytics(content):
+    """Remove inlined copies of the analytics and conversion tracking code"""
+    code = create_analytics_code()
+    content = content.replace(code + '\\n', '').replace(code, '')
+    return INLINE_TRACKER_PATTERN.sub('', content)
+
+def insert_analytics_bundle(content, page=None):
+    """Bundle mode: strip inlined tracking code, then reference the current bundle from <head>"""
+    stripped = strip_inline_analytics(content)
+
+    if BUNDLE_SRC_PATTERN.search(stripped):
+        # Already on a bundle; point it at the current fingerprint
+        return BUNDLE_SRC_PATTERN.sub(BUNDLE_SRC, stripped)
+
+    # Pages with their own hand-written tracking stay as they are
+    if stripped == content and 'gtag(' in content and 'ConversionTracker' in content:
+        return content
+
+    head_close = page_landmarks(stripped, page)["head_close"]
+    if head_close == -1:
+        return content
+
+    return stripped[:head_close] + create_analytics_stub() + stripped[head_close:]
+
+def insert_analytics(content, page=None):
+    """Insert the analytics code into <head> and conversion tracking before </body>"""
+    # Check if analytics already exists
+    if 'gtag(' in content and 'ConversionTracker' in content:
+        return content
+    if BUNDLE_SRC_PATTERN.search(content):
+        return content
+    
+    # Find insertion points
+    landmarks = page_landmarks(content, page)
+    head_close = landmarks["head_close"]
+    body_close = landmarks["body_close"]
+    
+    if head_close == -1 or body_close == -1:
+        return content
+    
+    # Insert analytics code in head
+    analytics_code = create_analytics_code() + '\\n'
+    content = content[:head_close] + analytics_code + content[head_close:]
+    
+    # Insert conversion tracking before closing body (shifted by the head insertion)
+    if body_close >= head_close:
+        body_close += len(analytics_code)
+    tracking_script = create_conversion_tracking_script()
+    content = content[:body_close] + tracking_script + '\\n' + content[body_close:]
+    
+    return content
+
+@register_transform("add-analytics", version=2, done_markers=[b'gtag(', b'ConversionTracker'])
+def add_analytics_transform(content, page):
+    """Pipeline transform: install analytics and conversion tracking"""
+    return insert_analytics(content, page)
+
+# Versioned by fingerprint so incremental runs revisit pages when the bundle changes
+@register_transform("add-analytics-bundle", version=f"1-{BUNDLE_FINGERPRINT}",
+                    done_markers=[BUNDLE_SRC.encode('utf-8')])
+def add_analytics_bundle_transform(content, page):
+    """Pipeline transform: move analytics onto the shared bundle"""
+    return insert_analytics_bundle(content, page)
+
 def add_analytics_to_page(file_path):
     """Add analytics code to an HTML page"""
     try:
@@ -359,26 +582,14 @@ def add_analytics_to_page(file_path):
             print(f"Skipping {file_path} - analytics already installed")
             return False
         
-        # Find insertion points
-        head_close = content.find('</head>')
-        body_close = content.find('</body>')
-        
-        if head_close == -1 or body_close == -1:
+        new_content = insert_analytics(content)
+        if new_content == content:
             print(f"Could not find insertion points in {file_path}")
             return False
         
-        # Insert analytics code in head
-        analytics_code = create_analytics_code()
-        content = content[:head_close] + analytics_code + '\\n' + content[head_close:]
-        
-        # Insert conversion tracking before closing body
-        body_close = content.find('</body>')  # Find again after head insertion
-        tracking_script = create_conversion_tracking_script()
-        content = content[:body_close] + tracking_script + '\\n' + content[body_close:]
-        
         # Write updated content
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            f.write(new_content)
         
         print(f"✅ Added analytics to {file_path}")
         return True
@@ -482,17 +693,63 @@ def create_analytics_dashboard():
     </main>
     
     <script>
-        // Simple dashboard functionality
-        // In production, this would connect to your analytics API
-        document.addEventListener('DOMContentLoaded', function() {
-            // Placeholder data - replace with real analytics API calls
-            document.getElementById('pageViews').textContent = '1,234';
-            document.getElementById('promptCopies').textContent = '456';
-            document.getElementById('affiliateClicks').textContent = '23';
-            document.getElementById('conversionRate').textContent = '5.1%';
+        // Numbers come pre-aggregated from analytics-rollup.json (analytics_rollup.py),
+        // so loading the dashboard costs the same however many events were logged
+        const ROLLUP_URL = '/analytics-rollup.json';
+        
+        function formatNumber(value) {
+            return Number(value || 0).toLocaleString();
+        }
+        
+        function renderRows(containerId, rows, columns) {
+            const table = document.createElement('table');
+            const head = table.insertRow();
+            columns.forEach(column => {
+                const cell = document.createElement('th');
+                cell.textContent = column.label;
+                head.appendChild(cell);
+            });
+            rows.forEach(row => {
+                const tr = table.insertRow();
+                columns.forEach(column => {
+                    tr.insertCell().textContent = column.format ? column.format(row[column.key]) : row[column.key];
+                });
+            });
+            const container = document.getElementById(containerId);
+            container.replaceChildren(rows.length ? table : document.createTextNode('No data yet'));
+        }
+        
+        function renderDashboard(rollup) {
+            const totals = rollup.totals || {};
+            document.getElementById('pageViews').textContent = formatNumber((rollup.today || {}).page_view);
+            document.getElementById('promptCopies').textContent = formatNumber(totals.prompt_copy);
+            document.getElementById('affiliateClicks').textContent = formatNumber(totals.affiliate_click);
+            document.getElementById('conversionRate').textContent = `${rollup.conversion_rate || 0}%`;
+            
+            renderRows('funnelChart', rollup.funnel || [], [
+                { key: 'step', label: 'Step' },
+                { key: 'count', label: 'Events', format: formatNumber }
+            ]);
             
-            // You would integrate with Google Analytics API here
-            // Example: gapi.analytics.ready(function() { ... });
+            const categories = Object.keys(rollup.categories || {}).map(name => Object.assign({ category: name }, rollup.categories[name]));
+            categories.sort((a, b) => (b.page_view || 0) - (a.page_view || 0));
+            renderRows('categoryChart', categories, [
+                { key: 'category', label: 'Category' },
+                { key: 'page_view', label: 'Views', format: formatNumber },
+                { key: 'prompt_copy', label: 'Copies', format: formatNumber },
+                { key: 'affiliate_click', label: 'Affiliate Clicks', format: formatNumber }
+            ]);
+        }
+        
+        document.addEventListener('DOMContentLoaded', function() {
+            fetch(ROLLUP_URL, { cache: 'no-cache' })
+                .then(response => response.ok ? response.json() : Promise.reject(new Error(`HTTP ${response.status}`)))
+                .then(renderDashboard)
+                .catch(error => {
+                    console.warn('Analytics rollup unavailable:', error);
+                    document.getElementById('funnelChart').textContent = 'No rollup yet - run analytics_rollup.py';
+                    document.getElementById('categoryChart').textContent = '';
+                });
         });
     </script>
 </body>
@@ -502,6 +759,10 @@ def create_analytics_dashboard():
 
 def main():
     """Set up analytics on all pages"""
+    parser = argparse.ArgumentParser(description="Install analytics and conversion tracking on every page")
+    parser.add_argument("--bundle", action="store_true",
+                        help="ship tracking as one cached js/ bundle and strip inlined copies from pages")
+    args = parser.parse_args()
     
     project_root = Path(__file__).parent
     
@@ -516,17 +777,14 @@ def main():
     print("   • Scroll depth and time on page tracking")
     print("=" * 50)
     
-    # Find all HTML files
-    html_files = list(project_root.rglob('*.html'))
-    updated_count = 0
+    if args.bundle:
+        bundle_path = write_analytics_bundle()
+        print(f"📦 Analytics bundle: {bundle_path.relative_to(project_root)}")
     
-    for html_file in html_files:
-        # Skip certain files
-        if any(skip in str(html_file) for skip in ['site-v2', 'node_modules', '.git']):
-            continue
-            
-        if add_analytics_to_page(html_file):
-            updated_count += 1
+    # Process every HTML file across a worker pool
+    names = ["add-analytics-bundle"] if args.bundle else ["add-analytics"]
+    results = run_pages(find_site_pages(project_root), names)
+    updated_count = print_report(results, names)
     
     # Create analytics dashboard
     dashboard_path = project_root / 'analytics-dashboard.html'
@@ -7,6 +7,8 @@ Replaces old header structure with new mobile-friendly navigation header.
 import os
 import re
 
+from page_pipeline import register_transform
+
 # New standardized header HTML
 NEW_HEADER = '''    <!-- Standardized Header with Mobile Navigation -->
     <header class="site-header">
@@ -33,6 +35,37 @@ NEW_HEADER = '''    <!-- Standardized Header with Mobile Navigation -->
 # Pattern to match old header structure
 OLD_HEADER_PATTERN = r'<header>.*?</header>'
 
+def standardize_header(content):
+    """Return content with the old header replaced and script.js included"""
+    # Already has new header
+    if 'site-header' in content and 'mobile-menu-toggle' in content:
+        return content
+    
+    # Replace old header with new one
+    updated_content = re.sub(
+        OLD_HEADER_PATTERN,
+        NEW_HEADER,
+        content,
+        flags=re.DOTALL
+    )
+    
+    # Make sure script.js is included if not already
+    if '/script.js' not in updated_content:
+        # Add script.js before closing </head>
+        updated_content = updated_content.replace(
+            '</head>',
+            '    <script src="/script.js" defer></script>\n</head>'
+        )
+    
+    return updated_content
+
+@register_transform("standardize-headers", done_markers=[b'site-header', b'mobile-menu-toggle'])
+def standardize_headers_transform(content, page):
+    """Pipeline transform: swap in the standardized mobile header"""
+    if page["path"].name == 'index.html' and 'site-header' in content:
+        return content
+    return standardize_header(content)
+
 def update_file(filepath):
     """Update a single HTML file with standardized header"""
     try:
@@ -49,21 +82,7 @@ def update_file(filepath):
             print(f"  ✓ Skipping index.html (already has new header)")
             return False
         
-        # Replace old header with new one
-        updated_content = re.sub(
-            OLD_HEADER_PATTERN,
-            NEW_HEADER,
-            content,
-            flags=re.DOTALL
-        )
-        
-        # Make sure script.js is included if not already
-        if '/script.js' not in updated_content:
-            # Add script.js before closing </head>
-            updated_content = updated_content.replace(
-                '</head>',
-                '    <script src="/script.js" defer></script>\n</head>'
-            )
+        updated_content = standardize_header(content)
         
         # Write updated content back
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -28,20 +28,62 @@ const STATIC_ASSETS = [
   '/prompts/health/',
   '/prompts/relationships/',
   '/prompts/everyday/',
-  '/prompts/ai-art/'
+  '/prompts/ai-art/',
+  // Affiliate fragments (generated by affiliate_fragments.py)
+  // affiliate-fragments:start
+  '/fragments/affiliates.json',
+  '/fragments/affiliates/ai-art-affiliate-recommendation.4bf9d1ef80.json',
+  '/fragments/affiliates/business-affiliate-recommendation.f280a53217.json',
+  '/fragments/affiliates/business-affiliate-section.973662e62c.json',
+  '/fragments/affiliates/coding-affiliate-recommendation.707dbbd690.json',
+  '/fragments/affiliates/coding-affiliate-section.4f42d371f6.json',
+  '/fragments/affiliates/content-affiliate-recommendation.c5aba5b5a3.json',
+  '/fragments/affiliates/content-affiliate-section.dcc61b927e.json',
+  '/fragments/affiliates/everyday-affiliate-recommendation.7bf5017cbc.json',
+  '/fragments/affiliates/everyday-affiliate-section.fe47d143e4.json',
+  '/fragments/affiliates/health-affiliate-recommendation.57719186ae.json',
+  '/fragments/affiliates/health-affiliate-section.577b449bc8.json',
+  '/fragments/affiliates/money-affiliate-recommendation.3797867d20.json',
+  '/fragments/affiliates/money-affiliate-section.46b31c17a0.json',
+  '/fragments/affiliates/relationships-affiliate-recommendation.7d1b9a1abd.json',
+  '/fragments/affiliates/relationships-affiliate-section.875ac9c044.json',
+  // affiliate-fragments:end
+  // Search manifest and hot shards (generated by search_index.py)
+  // search-shards:start
+  '/search-index.json',
+  '/search-index/business-c.48631f65eb.json',
+  '/search-index/business-p.07bd3062e6.json',
+  '/search-index/business-s.3ce8844a37.json',
+  '/search-index/business-u.17e33fcbed.json',
+  '/search-index/everyday-c.b4612fb7f9.json',
+  '/search-index/everyday-p.e77d65bf42.json',
+  '/search-index/everyday-s.3a958ee186.json',
+  '/search-index/health-s.5dab2984e7.json',
+  // search-shards:end
 ];
 
+// Fingerprinted search shards never change under a URL; checked before
+// NETWORK_FIRST, whose '/search' would otherwise match them
+const SEARCH_SHARDS = '/search-index/';
+
+// Directories of fingerprinted files: entries no longer in STATIC_ASSETS are
+// pruned from the static cache when a new worker activates
+const FINGERPRINTED = [SEARCH_SHARDS, '/fragments/affiliates/'];
+
 // Network-first strategy for dynamic content
 const NETWORK_FIRST = [
   '/api/',
   '/search',
-  '/analytics'
+  '/analytics',
+  // The fragment index names the current fragments; a stale copy can point at deleted ones
+  '/fragments/affiliates.json'
 ];
 
 // Cache-first strategy for static assets
 const CACHE_FIRST = [
   '/css/',
   '/js/',
+  '/fragments/affiliates/',
   '/images/',
   '.png',
   '.jpg',
@@ -90,6 +132,7 @@ self.addEventListener('activate', event => {
             })
         );
       })
+      .then(() => pruneFingerprinted())
       .then(() => {
         // Take control immediately
         return self.clients.claim();
@@ -112,7 +155,9 @@ self.addEventListener('fetch', event => {
   }
   
   // Handle different caching strategies
-  if (shouldUseNetworkFirst(request.url)) {
+  if (url.pathname.startsWith(SEARCH_SHARDS)) {
+    event.respondWith(cacheFirst(request));
+  } else if (shouldUseNetworkFirst(request.url)) {
     event.respondWith(networkFirst(request));
   } else if (shouldUseCacheFirst(request.url)) {
     event.respondWith(cacheFirst(request));
@@ -198,6 +243,17 @@ async function staleWhileRevalidate(request) {
   return cachedResponse || await fetchPromise || caches.match(OFFLINE_PAGE);
 }
 
+// Drop fingerprinted files a previous worker cached that the current lists no longer name
+async function pruneFingerprinted() {
+  const cache = await caches.open(STATIC_CACHE);
+  const current = new Set(STATIC_ASSETS);
+  const requests = await cache.keys();
+  await Promise.all(requests
+    .map(request => new URL(request.url).pathname)
+    .filter(path => FINGERPRINTED.some(prefix => path.startsWith(prefix)) && !current.has(path))
+    .map(path => cache.delete(path)));
+}
+
 // Helper functions
 function shouldUseNetworkFirst(url) {
   return NETWORK_FIRST.some(pattern => url.includes(pattern));
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the FreePromptHub build.
+Polls prompts/, the prompt content store, the affiliate registry and the
+template scripts, waits for a burst of edits to settle, then rebuilds only
+what the burst touched: regenerated prompt pages, the release chain over
+changed pages, a dependency-graph rebuild when shared fragments change,
+and the category indexes, search index, sitemaps and feeds whenever a
+page changed.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import add_missing_prompts
+import category_index
+import link_index
+import prompt_store
+import search_index
+from page_pipeline import (CATEGORIES, PROJECT_ROOT, RELEASE_CHAIN, default_jobs, load_manifest, page_key,
+                           run_pages, save_manifest)
+
+# Directories whose files are watched, with the suffixes that matter in each
+WATCHED_DIRS = {
+    "prompts": (".html",),
+    "prompt-content": (".md",),
+}
+
+# Inputs that feed code or module-level constants: a change means rebuilding
+# in a fresh interpreter and restarting the watcher on the new code
+CONFIG_FILES = [
+    "affiliates.json",
+    "affiliate_registry.py",
+    "add_missing_prompts.py",
+    "standardize_headers.py",
+    "fix_stylesheets.py",
+    "install_affiliates.py",
+    "setup_analytics.py",
+]
+
+# Data read by the search index builder alone
+SEARCH_DATA_FILES = ["search-curation.json"]
+
+# Node generators for the indexes that list pages
+FEED_SCRIPTS = ["generate-sitemap.js", "generate-rss.js"]
+
+# Below this many pages a worker pool costs more than it saves
+POOL_THRESHOLD = 32
+
+def snapshot(root=PROJECT_ROOT):
+    """{relative path: (mtime_ns, size)} for every watched file"""
+    root = Path(root)
+    files = {}
+    for name in CONFIG_FILES + SEARCH_DATA_FILES:
+        try:
+            stat = os.stat(root / name)
+        except FileNotFoundError:
+            continue
+        files[name] = (stat.st_mtime_ns, stat.st_size)
+
+    for directory, suffixes in WATCHED_DIRS.items():
+        pending = [root / directory]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith(suffixes):
+                        stat = entry.stat()
+                        files[Path(entry.path).relative_to(root).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def diff(before, after):
+    """Paths added, removed or modified between two snapshots"""
+    changed = {path for path, state in after.items() if before.get(path) != state}
+    return changed | (before.keys() - after.keys())
+
+def wait_for_changes(state, interval, debounce, root=PROJECT_ROOT):
+    """Block until files change, then until they stop changing for debounce seconds.
+
+    Returns (changed paths, new snapshot).
+    """
+    changed = set()
+    quiet_since = None
+    while True:
+        time.sleep(interval)
+        current = snapshot(root)
+        burst = diff(state, current)
+        state = current
+        if burst:
+            changed |= burst
+            quiet_since = time.monotonic()
+        elif changed and time.monotonic() - quiet_since >= debounce:
+            return changed, state
+
+def run_script(*command, root=PROJECT_ROOT):
+    """Run a build script; returns the watched paths that changed while it ran"""
+    before = snapshot(root)
+    result = subprocess.run(command, cwd=root, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"  ❌ {' '.join(command)} failed:\n{result.stderr.strip()}")
+    return diff(before, snapshot(root))
+
+def regenerate_prompts(paths, root=PROJECT_ROOT):
+    """Re-render the prompt pages whose content files changed; returns written page paths"""
+    store_dir = Path(root) / "prompt-content"
+    entries = []
+    for path in paths:
+        file_path = Path(root) / path
+        category, filename = file_path.parent.name, file_path.stem
+        if file_path.exists():
+            entries.append((category, filename, None))
+
+    if set(paths) - {page_key(store_dir / category / f"{filename}.md", root) for category, filename, _ in entries}:
+        print("  ℹ️  Prompt files were removed; their pages are left in place")
+    if not entries:
+        return []
+
+    # New files need an index entry before the generator can see them
+    prompt_store.build_index(store_dir, store_dir / "index.json")
+
+    manifest = load_manifest(add_missing_prompts.GENERATED_MANIFEST_PATH)
+    written = []
+    for result in add_missing_prompts.generate_pages(entries, manifest, jobs=1, root=root):
+        if result["error"]:
+            print(f"  ❌ {page_key(result['path'], root)}: {result['error']}")
+            continue
+        if result["status"] == "kept":
+            print(f"  ⏭️  Kept {page_key(result['path'], root)} (edited since generated)")
+        if result["status"] in ("created", "updated"):
+            written.append(result["path"])
+        if result["hash"]:
+            manifest[page_key(result["path"], root)] = result["hash"]
+    add_missing_prompts.save_manifest(manifest, add_missing_prompts.GENERATED_MANIFEST_PATH)
+    return written
+
+def rebuild_pages(paths, root=PROJECT_ROOT):
+    """Run the release chain incrementally over changed prompt pages; returns rewritten paths"""
+    pages = []
+    for path in sorted(set(paths)):
+        parts = Path(path).parts
+        if len(parts) == 3 and parts[1] in CATEGORIES and parts[2] != "index.html" and (Path(root) / path).exists():
+            pages.append({"path": Path(root) / path, "category": parts[1]})
+    if not pages:
+        return []
+
+    manifest = load_manifest()
+    jobs = default_jobs() if len(pages) >= POOL_THRESHOLD else 1
+    results = run_pages(pages, RELEASE_CHAIN, jobs=jobs, manifest=manifest, root=root)
+    save_manifest(manifest)
+
+    for result in results:
+        if result["error"]:
+            print(f"  ❌ {page_key(result['path'], root)}: {result['error']}")
+    rewritten = [result["path"] for result in results if result["applied"] and not result["error"]]
+    link_index.update_link_index(rewritten, root)
+    return rewritten
+
+def update_feeds(root=PROJECT_ROOT):
+    """Regenerate sitemaps and feeds, running the generators side by side"""
+    node = shutil.which("node")
+    if not node:
+        print("  ⚠️  node not found; sitemaps and feeds not updated")
+        return False
+    processes = [subprocess.Popen([node, script], cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+                 for script in FEED_SCRIPTS]
+    ok = True
+    for script, process in zip(FEED_SCRIPTS, processes):
+        _, stderr = process.communicate()
+        if process.returncode != 0:
+            print(f"  ❌ {script} failed:\n{stderr.strip()}")
+            ok = False
+    return ok
+
+def rebuild(changed, feeds=True, root=PROJECT_ROOT):
+    """One incremental rebuild for a settled set of changed paths.
+
+    Returns (restart, written): restart is True when build code or the
+    registry changed and the watcher should restart to pick it up; written
+    holds the watched paths the rebuild itself wrote.
+    """
+    config = sorted(path for path in changed if path in CONFIG_FILES)
+    prompts = [path for path in changed if path.startswith("prompt-content/")]
+    pages = {path for path in changed if path.startswith("prompts/")}
+
+    written = set()
+    if prompts:
+        regenerated = {page_key(path, root) for path in regenerate_prompts(prompts, root)}
+        pages |= regenerated
+        written |= regenerated
+    rewritten = rebuild_pages(pages, root)
+    written.update(page_key(path, root) for path in rewritten)
+
+    # Build code runs last and in a fresh interpreter, so pages this process
+    # just wrote with the old code or registry are brought up to date too
+    if config:
+        print(f"  🔧 {', '.join(config)} changed")
+        if "add_missing_prompts.py" in config:
+            written |= run_script(sys.executable, "add_missing_prompts.py", root=root)
+        written |= run_script(sys.executable, "build_graph.py", root=root)
+
+    if pages or config:
+        print(f"  📄 {len(pages)} changed pages, {len(rewritten)} rebuilt")
+
+        # Listings change with any page in their category, or with the index shell itself
+        categories = [category for category in CATEGORIES
+                      if config or any(Path(path).parts[1] == category for path in pages)]
+        indexes = category_index.build_indexes(categories, root=root)
+        updated = [path for result in indexes.values() for path in result[0]]
+        removed = [path for result in indexes.values() for path in result[2]]
+        written.update(page_key(path, root) for path in updated + removed)
+        if updated:
+            print(f"  🗂️  {len(updated)} category index pages updated")
+    if pages or config or any(path in SEARCH_DATA_FILES for path in changed):
+        index, _ = search_index.build_index(root)
+        if search_index.write_index(index, root)[1]:
+            print("  🔍 Search index updated")
+    if pages or config:
+        if feeds:
+            update_feeds(root)
+    return bool(config), written
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch prompts, content and templates and rebuild what changes")
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between polls (default: 0.2)")
+    parser.add_argument("--debounce", type=float, default=0.3,
+                        help="seconds of quiet before a burst of edits is rebuilt (default: 0.3)")
+    parser.add_argument("--no-feeds", action="store_true", help="skip sitemap and feed regeneration")
+    args = parser.parse_args()
+
+    print("WATCHING FOR CHANGES")
+    print("=" * 50)
+    print(f"{', '.join(list(WATCHED_DIRS) + CONFIG_FILES + SEARCH_DATA_FILES)}\n")
+
+    state = snapshot()
+    try:
+        while True:
+            changed, state = wait_for_changes(state, args.interval, args.debounce)
+            start = time.perf_counter()
+            print(f"🔄 {len(changed)} files changed")
+            restart, written = rebuild(changed, feeds=not args.no_feeds)
+
+            # Our own writes are not new edits; anything else saved during the
+            # rebuild still differs from state and is picked up next round
+            current = snapshot()
+            for path in written:
+                if path in current:
+                    state[path] = current[path]
+                else:
+                    state.pop(path, None)
+            print(f"✅ Rebuilt in {time.perf_counter() - start:.2f}s\n")
+            if restart:
+                print("♻️  Restarting on the updated build code\n")
+                sys.stdout.flush()
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+    except KeyboardInterrupt:
+        print("\n" + "=" * 50)
+        print("✅ Stopped watching")
+
+if __name__ == "__main__":
+    main()